@@ -0,0 +1,67 @@
+"""
+Compare per-vault analysis throughput against the vectorized batch engine.
+
+Usage:
+    python benchmarks/batch_analysis.py --vaults 5000 --days 365
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from yield_analysis_sdk import (
+    SharePriceHistory,
+    analyze_yield_batch,
+    analyze_yield_with_daily_share_price,
+)
+
+
+def make_histories(vaults: int, days: int, seed: int = 42) -> List[SharePriceHistory]:
+    rng = random.Random(seed)
+    histories = []
+    for index in range(vaults):
+        price = 1.0
+        price_history = []
+        for day in range(days):
+            price *= 1 + rng.gauss(0.0002, 0.002)
+            price_history.append((1640995200 + day * 86400, price))
+        histories.append(
+            SharePriceHistory(
+                name=f"Vault {index}",
+                address=f"0x{index:040x}",
+                price_history=price_history,
+            )
+        )
+    return histories
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vaults", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    histories = make_histories(args.vaults, args.days)
+
+    start = time.perf_counter()
+    for history in histories:
+        analyze_yield_with_daily_share_price(history)
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analyze_yield_batch(histories)
+    batch_seconds = time.perf_counter() - start
+
+    print(f"{args.vaults} vaults x {args.days} days")
+    print(
+        f"per-vault loop: {loop_seconds:8.3f}s ({args.vaults / loop_seconds:10.0f} vaults/s)"
+    )
+    print(
+        f"batch engine:   {batch_seconds:8.3f}s ({args.vaults / batch_seconds:10.0f} vaults/s)"
+    )
+    print(f"speedup:        {loop_seconds / batch_seconds:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,9 +19,11 @@ from yield_analysis_sdk import (
     AnalysisResponse,
     AnalysisResult,
     Chain,
+    QueryCache,
+    SubgraphClient,
     VaultInfo,
     analyze_yield_with_daily_share_price,
-    get_daily_share_price_history_from_subgraph,
+    get_share_price_histories_for_request,
 )
 
 
@@ -40,19 +42,12 @@ USDC_VAULT_ADDRESSES = {
     ]
 }
 
-ID_TO_CHAIN = {
-    1: Chain.ETHEREUM,
-    8453: Chain.BASE,
-    42161: Chain.ARBITRUM,
-    10: Chain.OPTIMISM,
-    137: Chain.POLYGON,
-    56: Chain.BSC,
-    33139: Chain.GNOS,
-}
-
 
 def seller():
     env = CustomEnvSettings()
+    # keep-alive connections shared by every job; repeated daily queries are
+    # answered from memory until the next UTC day
+    subgraph_client = SubgraphClient(cache=QueryCache())
 
     def on_new_task(job: ACPJob):
         # Convert job.phase to ACPJobPhase enum if it's an integer
@@ -76,26 +71,22 @@ def seller():
                         job.service_requirement
                     )
 
-                    # for test purpose, only support strategies with same chainId
-                    # fetch price history
-                    price_histories = get_daily_share_price_history_from_subgraph(
-                        ID_TO_CHAIN[analysis_request.strategies[0].chainId],
-                        [
-                            strategy.address.lower()
-                            for strategy in analysis_request.strategies
-                        ],
+                    # fetch price history, one batched query per chain in parallel
+                    price_histories = get_share_price_histories_for_request(
+                        analysis_request,
                         6,
                         90,
                         env.SUBGRAPH_API_KEY,
+                        client=subgraph_client,
                     )
 
                     # analyze yield
                     result = AnalysisResponse(analyses=[])
-                    for price_history in price_histories:
+                    for chain, price_history in price_histories:
                         result.analyses.append(
                             AnalysisResult(
                                 vault_info=VaultInfo(
-                                    chain=analysis_request.chain,
+                                    chain=chain,
                                     address=price_history.address,
                                     name=price_history.name,
                                     protocol="Morpho Meta Vault",
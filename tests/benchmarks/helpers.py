@@ -0,0 +1,29 @@
+"""
+Synthetic subgraph responses for the benchmarks.
+"""
+
+from typing import Any, Dict, List
+
+from tests.helpers import START_TIMESTAMP
+
+
+def make_subgraph_payload(rows: int, vaults: int = 100) -> Dict[str, Any]:
+    """Build a vaultStats_collection response with `rows` entries spread over vaults."""
+    entries: List[Dict[str, Any]] = []
+    for row in range(rows):
+        vault = row % vaults
+        day = row // vaults
+        entries.append(
+            {
+                "timestamp": str((START_TIMESTAMP + day * 86400) * 1000000),
+                "pricePerShare": str(1.0 + day * 0.0001),
+                "vault": {
+                    "address": f"0x{vault:040x}",
+                    "name": f"Vault {vault}",
+                    "decimals": "6",
+                },
+            }
+        )
+    # The subgraph returns the newest entries first
+    entries.reverse()
+    return {"data": {"vaultStats_collection": entries}}
@@ -0,0 +1,37 @@
+"""
+Benchmarks for the alignment module.
+"""
+
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from tests.helpers import HistoryFactory, PricesFactory
+from yield_analysis_sdk.alignment import align_share_price_histories
+
+VAULT_COUNT = 500
+DAYS = 730
+
+
+class TestAlignmentBenchmarks:
+    """Benchmarks of calendar alignment."""
+
+    def test_align_share_price_histories(
+        self,
+        benchmark: BenchmarkFixture,
+        make_history: HistoryFactory,
+        random_prices: PricesFactory,
+    ) -> None:
+        """Benchmark aligning two years of daily prices for 500 vaults."""
+        histories = [
+            make_history(random_prices(DAYS, index, 0.01), index)
+            for index in range(VAULT_COUNT)
+        ]
+        # Drop every seventh day of odd vaults so there are gaps to fill
+        for history in histories[1::2]:
+            history.price_history = [
+                point for day, point in enumerate(history.price_history) if day % 7 != 3
+            ]
+
+        result = benchmark(align_share_price_histories, histories)
+
+        assert result.prices.shape == (VAULT_COUNT, DAYS)
+        assert not result.observed[1].all()
@@ -0,0 +1,54 @@
+"""
+Benchmarks for the analysis module.
+"""
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from tests.helpers import HistoryFactory, PricesFactory
+from yield_analysis_sdk.analysis import (
+    _price_metrics,
+    analyze_yield_with_daily_share_price,
+)
+
+
+class TestAnalysisBenchmarks:
+    """Benchmarks of the per-vault analysis."""
+
+    @pytest.mark.parametrize("length", [30, 365, 3650])
+    def test_analyze_yield_with_daily_share_price(
+        self,
+        benchmark: BenchmarkFixture,
+        length: int,
+        make_history: HistoryFactory,
+        random_prices: PricesFactory,
+    ) -> None:
+        """Benchmark analyzing a single history of daily prices."""
+        history = make_history(random_prices(length, scale=0.01))
+
+        result = benchmark(analyze_yield_with_daily_share_price, history)
+
+        assert result.analysis_period_days == length
+
+    def test_price_metrics_ten_years(
+        self, benchmark: BenchmarkFixture, random_prices: PricesFactory
+    ) -> None:
+        """Benchmark the fused metric kernel on ten years of daily prices."""
+        prices = random_prices(3650, scale=0.01)
+
+        result = benchmark(_price_metrics, prices, 0.05)
+
+        assert len(result) == 6
+
+    def test_analyze_yield_with_tail_risk_ten_years(
+        self,
+        benchmark: BenchmarkFixture,
+        make_history: HistoryFactory,
+        random_prices: PricesFactory,
+    ) -> None:
+        """Benchmark the analysis with the optional tail risk metrics."""
+        history = make_history(random_prices(3650, scale=0.01))
+
+        result = benchmark(analyze_yield_with_daily_share_price, history, 0.05, True)
+
+        assert result.var_99 is not None
@@ -0,0 +1,37 @@
+"""
+Benchmarks for the correlation module.
+"""
+
+import numpy as np
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from yield_analysis_sdk.correlation import covariance_from_returns
+
+VAULT_COUNT = 2000
+DAYS = 365
+
+
+class TestCorrelationBenchmarks:
+    """Benchmarks of the cross-vault covariance engine."""
+
+    @pytest.mark.parametrize("gaps", [False, True])
+    def test_covariance_from_returns(
+        self, benchmark: BenchmarkFixture, gaps: bool
+    ) -> None:
+        """Benchmark a shrunk, exponentially weighted matrix for 2000 vaults."""
+        rng = np.random.default_rng(0)
+        returns = rng.normal(0.0003, 0.002, (VAULT_COUNT, DAYS))
+        if gaps:
+            returns[rng.random(returns.shape) < 0.05] = np.nan
+        addresses = [f"0x{index:040x}" for index in range(VAULT_COUNT)]
+
+        result = benchmark(
+            covariance_from_returns,
+            returns,
+            addresses,
+            halflife_days=30,
+            shrinkage="ledoit-wolf",
+        )
+
+        assert result.correlation.shape == (VAULT_COUNT, VAULT_COUNT)
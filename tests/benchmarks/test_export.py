@@ -0,0 +1,29 @@
+"""
+Benchmarks for the columnar export.
+"""
+
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+pytest.importorskip("pyarrow")
+
+from tests.benchmarks.test_types import RESULT_COUNT, _make_results
+from yield_analysis_sdk.export import write_analysis_parquet
+
+
+class TestExportBenchmarks:
+    """Benchmarks of the Parquet export."""
+
+    def test_write_analysis_parquet(
+        self, benchmark: BenchmarkFixture, tmp_path: Path
+    ) -> None:
+        """Benchmark writing a daily snapshot of 5k results to Parquet."""
+        results = _make_results()
+        path = tmp_path / "analysis.parquet"
+
+        benchmark(write_analysis_parquet, results, path)
+
+        assert path.stat().st_size > 0
+        assert len(results) == RESULT_COUNT
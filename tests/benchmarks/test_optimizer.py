@@ -0,0 +1,72 @@
+"""
+Benchmarks for the optimizer module.
+"""
+
+import numpy as np
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from yield_analysis_sdk.optimizer import optimize_allocation
+from yield_analysis_sdk.type import (
+    AnalysisResult,
+    Chain,
+    PerformanceAnalysis,
+    VaultInfo,
+)
+
+VAULT_COUNT = 1000
+
+
+def _universe(rng: np.random.Generator) -> list:
+    return [
+        AnalysisResult.construct_trusted(
+            vault_info=VaultInfo.construct_trusted(
+                chain=Chain.BASE,
+                address=f"0x{index:040x}",
+                name=f"Vault {index}",
+                protocol="Benchmark",
+                current_share_price=1.0,
+                last_updated_timestamp=1640995200,
+                entry_cost_bps=int(rng.integers(0, 30)),
+                exit_cost_bps=int(rng.integers(0, 30)),
+                max_deposit_amount=float(rng.uniform(1e5, 5e6)),
+            ),
+            performance=PerformanceAnalysis.construct_trusted(
+                apy_7d=0.0,
+                apy_30d=float(rng.uniform(2, 12)),
+                apy_90d=0.0,
+                volatility_30d=0.0,
+                max_drawdown=0.0,
+                sharpe_ratio=0.0,
+                analysis_period_days=90,
+            ),
+        )
+        for index in range(VAULT_COUNT)
+    ]
+
+
+class TestOptimizerBenchmarks:
+    """Benchmarks of the allocation optimizer."""
+
+    def test_warm_started_reoptimization(self, benchmark: BenchmarkFixture) -> None:
+        """Benchmark re-optimizing 1000 vaults from the previous day's allocation."""
+        rng = np.random.default_rng(0)
+        results = _universe(rng)
+        factors = rng.normal(0, 0.002, (VAULT_COUNT, 3))
+        covariance = factors @ factors.T + np.diag(rng.uniform(1e-6, 2e-5, VAULT_COUNT))
+        previous = optimize_allocation(
+            results, covariance, risk_aversion=100.0, total_amount=5e8
+        )
+        # A day later risk moved slightly
+        covariance = covariance * 1.01
+
+        result = benchmark(
+            optimize_allocation,
+            results,
+            covariance,
+            risk_aversion=100.0,
+            total_amount=5e8,
+            current_weights=previous.to_dict(),
+            warm_start=previous,
+        )
+
+        assert result.converged
@@ -0,0 +1,32 @@
+"""
+Benchmarks for the rolling analytics module.
+"""
+
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from tests.helpers import HistoryFactory, PricesFactory
+from yield_analysis_sdk.rolling import analyze_rolling_performance_batch
+
+VAULT_COUNT = 200
+DAYS = 730
+
+
+class TestRollingBenchmarks:
+    """Benchmarks of rolling performance series."""
+
+    def test_rolling_two_years(
+        self,
+        benchmark: BenchmarkFixture,
+        make_history: HistoryFactory,
+        random_prices: PricesFactory,
+    ) -> None:
+        """Benchmark daily rolling series over two years for 200 vaults."""
+        histories = [
+            make_history(random_prices(DAYS, index, 0.01), index)
+            for index in range(VAULT_COUNT)
+        ]
+
+        result = benchmark(analyze_rolling_performance_batch, histories)
+
+        assert len(result) == VAULT_COUNT
+        assert len(result[0].apy_30d) == DAYS
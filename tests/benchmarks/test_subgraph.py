@@ -0,0 +1,55 @@
+"""
+Benchmarks for parsing subgraph responses.
+"""
+
+import io
+import json
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from tests.benchmarks.helpers import make_subgraph_payload
+from yield_analysis_sdk.subgraph import _format_price_history_response
+
+try:
+    from yield_analysis_sdk.streaming import parse_vault_stats_response
+except ImportError:  # pragma: no cover
+    parse_vault_stats_response = None
+
+
+class TestSubgraphBenchmarks:
+    """Benchmarks of the subgraph response parser."""
+
+    @pytest.mark.parametrize("rows", [10_000, 100_000])
+    def test_format_price_history_response(
+        self, benchmark: BenchmarkFixture, rows: int
+    ) -> None:
+        """Benchmark turning a vaultStats_collection payload into histories."""
+        payload = make_subgraph_payload(rows)
+
+        result = benchmark(_format_price_history_response, payload, 6)
+
+        assert sum(len(history.price_history) for history in result) == rows
+
+    @pytest.mark.parametrize("rows", [10_000, 100_000])
+    def test_decode_and_format_response(
+        self, benchmark: BenchmarkFixture, rows: int
+    ) -> None:
+        """Benchmark decoding a response body and formatting it into histories."""
+        body = json.dumps(make_subgraph_payload(rows)).encode()
+
+        result = benchmark(lambda: _format_price_history_response(json.loads(body), 6))
+
+        assert sum(len(history.price_history) for history in result) == rows
+
+    @pytest.mark.parametrize("rows", [10_000, 100_000])
+    def test_parse_vault_stats_response(
+        self, benchmark: BenchmarkFixture, rows: int
+    ) -> None:
+        """Benchmark streaming a response body into compact histories."""
+        pytest.importorskip("ijson")
+        body = json.dumps(make_subgraph_payload(rows)).encode()
+
+        result = benchmark(lambda: parse_vault_stats_response(io.BytesIO(body), 6))
+
+        assert sum(len(history.timestamps) for history in result) == rows
@@ -0,0 +1,118 @@
+"""
+Benchmarks for constructing and serializing the SDK models.
+"""
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from tests.helpers import START_TIMESTAMP, HistoryFactory, PricesFactory
+from yield_analysis_sdk.type import (
+    AnalysisResponse,
+    AnalysisResult,
+    Chain,
+    PerformanceAnalysis,
+    SharePriceHistory,
+    VaultInfo,
+)
+
+RESULT_COUNT = 5_000
+
+
+def _make_trusted_results() -> list:
+    return [
+        AnalysisResult.construct_trusted(
+            vault_info=VaultInfo.construct_trusted(
+                chain=Chain.BASE,
+                address=f"0x{index:040x}",
+                name=f"Vault {index}",
+                protocol="Benchmark",
+                current_share_price=1.05,
+                last_updated_timestamp=START_TIMESTAMP,
+            ),
+            performance=PerformanceAnalysis.construct_trusted(
+                apy_7d=5.1,
+                apy_30d=5.2,
+                apy_90d=5.3,
+                volatility_30d=1.2,
+                max_drawdown=0.4,
+                sharpe_ratio=1.7,
+                analysis_period_days=90,
+            ),
+        )
+        for index in range(RESULT_COUNT)
+    ]
+
+
+def _make_results() -> list:
+    return [
+        AnalysisResult(
+            vault_info=VaultInfo(
+                chain=Chain.BASE,
+                address=f"0x{index:040x}",
+                name=f"Vault {index}",
+                protocol="Benchmark",
+                current_share_price=1.05,
+                last_updated_timestamp=START_TIMESTAMP,
+            ),
+            performance=PerformanceAnalysis(
+                apy_7d=5.1,
+                apy_30d=5.2,
+                apy_90d=5.3,
+                volatility_30d=1.2,
+                max_drawdown=0.4,
+                sharpe_ratio=1.7,
+                analysis_period_days=90,
+            ),
+        )
+        for index in range(RESULT_COUNT)
+    ]
+
+
+class TestTypeBenchmarks:
+    """Benchmarks of model construction and JSON serialization."""
+
+    @pytest.mark.parametrize("length", [365, 3650])
+    def test_share_price_history_construction(
+        self,
+        benchmark: BenchmarkFixture,
+        length: int,
+        make_history: HistoryFactory,
+        random_prices: PricesFactory,
+    ) -> None:
+        """Benchmark validating a SharePriceHistory from raw points."""
+        price_history = make_history(random_prices(length, scale=0.01)).price_history
+
+        result = benchmark(
+            SharePriceHistory,
+            name="Vault",
+            address="0x1234567890abcdef1234567890abcdef12345678",
+            price_history=price_history,
+        )
+
+        assert len(result.price_history) == length
+
+    def test_analysis_response_construction(self, benchmark: BenchmarkFixture) -> None:
+        """Benchmark building an AnalysisResponse of 5k results from scratch."""
+        response = benchmark(lambda: AnalysisResponse(analyses=_make_results()))
+
+        assert len(response.analyses) == RESULT_COUNT
+
+    def test_analysis_response_trusted_construction(
+        self, benchmark: BenchmarkFixture
+    ) -> None:
+        """Benchmark building the same response through the trusted factories."""
+        response = benchmark(
+            lambda: AnalysisResponse.model_construct(analyses=_make_trusted_results())
+        )
+
+        assert response == AnalysisResponse(analyses=_make_results())
+
+    def test_analysis_response_model_dump_json(
+        self, benchmark: BenchmarkFixture
+    ) -> None:
+        """Benchmark serializing an AnalysisResponse of 5k results."""
+        response = AnalysisResponse(analyses=_make_results())
+
+        result = benchmark(response.model_dump_json)
+
+        assert result.startswith('{"analyses":[')
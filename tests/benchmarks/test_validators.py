@@ -0,0 +1,37 @@
+"""
+Benchmarks for the validators module.
+"""
+
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from yield_analysis_sdk.validators import normalize_address, normalize_addresses
+
+ADDRESS_COUNT = 1_000_000
+REGISTRY_SIZE = 50_000
+
+
+class TestValidatorBenchmarks:
+    """Benchmarks of address normalization."""
+
+    def test_normalize_address(self, benchmark: BenchmarkFixture) -> None:
+        """Benchmark normalizing a million mixed-case addresses."""
+        addresses = [f" 0x{index:040X} " for index in range(ADDRESS_COUNT)]
+
+        result = benchmark.pedantic(
+            lambda: [normalize_address(address) for address in addresses],
+            rounds=3,
+        )
+
+        assert result[-1] == f"0x{ADDRESS_COUNT - 1:040x}"
+
+    def test_normalize_addresses_registry(self, benchmark: BenchmarkFixture) -> None:
+        """Benchmark bulk normalization of a million rows over a 50k vault registry."""
+        addresses = [
+            f"0x{index % REGISTRY_SIZE:040X}" for index in range(ADDRESS_COUNT)
+        ]
+
+        result = benchmark.pedantic(
+            normalize_addresses, args=(addresses,), rounds=3, warmup_rounds=1
+        )
+
+        assert result[-1] == f"0x{(ADDRESS_COUNT - 1) % REGISTRY_SIZE:040x}"
@@ -0,0 +1,24 @@
+"""
+Fixtures shared by the test modules.
+"""
+
+import pytest
+
+from tests.helpers import (
+    HistoryFactory,
+    PricesFactory,
+    make_share_price_history,
+    random_walk_prices,
+)
+
+
+@pytest.fixture
+def make_history() -> HistoryFactory:
+    """Factory of SharePriceHistory objects with daily timestamps."""
+    return make_share_price_history
+
+
+@pytest.fixture
+def random_prices() -> PricesFactory:
+    """Factory of seeded random walk prices."""
+    return random_walk_prices
@@ -0,0 +1,58 @@
+"""
+Synthetic share price histories shared by the tests and benchmarks.
+"""
+
+import random
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+from yield_analysis_sdk.type import SharePriceHistory
+
+# 2022-01-01T00:00:00Z, the first day of every generated history
+START_TIMESTAMP = 1640995200
+
+HistoryFactory = Callable[..., SharePriceHistory]
+PricesFactory = Callable[..., List[float]]
+
+
+def make_share_price_history(
+    prices: Sequence[float] = (),
+    index: int = 0,
+    points: Optional[Sequence[Tuple[int, float]]] = None,
+    address: Optional[str] = None,
+) -> SharePriceHistory:
+    """
+    Build a history of one price per day starting on START_TIMESTAMP.
+
+    Args:
+        prices: Daily prices, oldest first.
+        index: Number of the vault, used for its name and default address.
+        points: Explicit (timestamp, price) points used instead of prices.
+        address: Vault address. Defaults to one derived from index.
+    """
+    if points is None:
+        points = [
+            (START_TIMESTAMP + day * 86400, price) for day, price in enumerate(prices)
+        ]
+    return SharePriceHistory(
+        name=f"Vault {index}",
+        address=address or f"0x{index + 1:040x}",
+        price_history=list(points),
+    )
+
+
+def random_walk_prices(
+    length: int, seed: Union[int, random.Random] = 0, scale: float = 0.02
+) -> List[float]:
+    """
+    Build `length` prices starting at 1.0 that follow a seeded random walk.
+
+    Args:
+        length: Number of prices.
+        seed: Seed, or a generator shared by several calls.
+        scale: Largest daily loss. Daily gains go up to 105% of it.
+    """
+    rng = seed if isinstance(seed, random.Random) else random.Random(seed)
+    prices = [1.0]
+    for _ in range(length - 1):
+        prices.append(prices[-1] * (1 + rng.uniform(-scale, 1.05 * scale)))
+    return prices
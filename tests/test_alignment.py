@@ -0,0 +1,170 @@
+"""
+Tests for the alignment module.
+"""
+
+import numpy as np
+import pytest
+
+from tests.helpers import START_TIMESTAMP, HistoryFactory
+from yield_analysis_sdk.alignment import (
+    SECONDS_PER_DAY,
+    align_share_price_histories,
+    calendar_apy,
+    to_utc_day,
+)
+from yield_analysis_sdk.analysis import analyze_yield_with_daily_share_price
+from yield_analysis_sdk.batch import analyze_yield_batch, compute_performance_batch
+from yield_analysis_sdk.exceptions import ConfigurationError, DataError
+from yield_analysis_sdk.type import CompactSharePriceHistory
+
+DAY0 = START_TIMESTAMP
+VAULT_A = "0x1234567890abcdef1234567890abcdef12345678"
+VAULT_B = "0xabcdef1234567890abcdef1234567890abcdef12"
+
+
+class TestAlignment:
+    """Test cases for calendar alignment of price series."""
+
+    def test_to_utc_day(self) -> None:
+        """Test bucketing timestamps to the start of their UTC day."""
+        assert to_utc_day([DAY0, DAY0 + 86399, DAY0 + 86400]).tolist() == [
+            DAY0,
+            DAY0,
+            DAY0 + SECONDS_PER_DAY,
+        ]
+
+    def test_align_buckets_and_forward_fills(
+        self, make_history: HistoryFactory
+    ) -> None:
+        """Test that the last price per day wins and gaps are forward-filled."""
+        a = make_history(
+            address=VAULT_A,
+            points=[
+                (DAY0 + 3600, 1.0),
+                (DAY0 + 7200, 1.01),  # later in the same day wins
+                (DAY0 + 3 * 86400 + 60, 1.03),
+            ],
+        )
+        b = make_history(
+            address=VAULT_B, points=[(DAY0 + 2 * 86400 + 5, 2.0), (DAY0 + 86400, 1.9)]
+        )
+
+        aligned = align_share_price_histories([a, b])
+
+        assert aligned.addresses == [VAULT_A, VAULT_B]
+        assert aligned.days.tolist() == [DAY0 + i * SECONDS_PER_DAY for i in range(4)]
+        np.testing.assert_array_equal(
+            aligned.prices,
+            [[1.01, 1.01, 1.01, 1.03], [np.nan, 1.9, 2.0, 2.0]],
+        )
+        assert aligned.observed.tolist() == [
+            [True, False, False, True],
+            [False, True, True, False],
+        ]
+
+    def test_gap_handling_options(self, make_history: HistoryFactory) -> None:
+        """Test disabling forward fill and limiting the filled gap length."""
+        a = make_history(
+            address=VAULT_A, points=[(DAY0, 1.0), (DAY0 + 4 * 86400, 1.04)]
+        )
+
+        unfilled = align_share_price_histories([a], forward_fill=False)
+        limited = align_share_price_histories([a], max_gap_days=2)
+
+        np.testing.assert_array_equal(
+            unfilled.prices, [[1.0, np.nan, np.nan, np.nan, 1.04]]
+        )
+        np.testing.assert_array_equal(limited.prices, [[1.0, 1.0, 1.0, np.nan, 1.04]])
+
+    def test_explicit_window(self, make_history: HistoryFactory) -> None:
+        """Test that start and end clip the grid and drop prices outside it."""
+        a = make_history(
+            address=VAULT_A, points=[(DAY0 + i * 86400, 1.0 + i) for i in range(10)]
+        )
+
+        aligned = align_share_price_histories(
+            [a], start=DAY0 + 2 * 86400 + 10, end=DAY0 + 4 * 86400
+        )
+
+        assert aligned.days.tolist() == [DAY0 + i * 86400 for i in (2, 3, 4)]
+        assert aligned.prices.tolist() == [[3.0, 4.0, 5.0]]
+
+    def test_aligned_matrix_feeds_batch_kernel(
+        self, make_history: HistoryFactory
+    ) -> None:
+        """Test that aligned rows analyze like their daily histories."""
+        a = make_history(
+            address=VAULT_A,
+            points=[(DAY0 + i * 86400, 1.0 + 0.001 * i) for i in range(40)],
+        )
+        # Missing every third day
+        b = make_history(
+            address=VAULT_B,
+            points=[(DAY0 + i * 86400, 2.0 + 0.002 * i) for i in range(40) if i % 3],
+        )
+
+        aligned = align_share_price_histories([a, b])
+        batch = compute_performance_batch(aligned.prices)
+        histories = aligned.to_histories()
+
+        assert isinstance(histories[1], CompactSharePriceHistory)
+        assert len(histories[1].timestamps) == 39
+        expected = analyze_yield_with_daily_share_price(histories[1])
+        assert batch.apy_30d[1] == pytest.approx(expected.apy_30d)
+        assert batch.analysis_period_days.tolist() == [40, 39]
+
+    def test_gapped_matrix_is_rejected_by_batch_kernel(
+        self, make_history: HistoryFactory
+    ) -> None:
+        """Test that unfilled gaps raise instead of yielding NaN metrics."""
+        a = make_history(
+            address=VAULT_A,
+            points=[(DAY0 + i * 86400, 1.0 + 0.001 * i) for i in range(40)],
+        )
+        # A week without reports in the middle
+        b = make_history(
+            address=VAULT_B,
+            points=[
+                (DAY0 + i * 86400, 2.0 + 0.002 * i)
+                for i in range(40)
+                if not 15 <= i < 22
+            ],
+        )
+
+        aligned = align_share_price_histories([a, b], max_gap_days=3)
+
+        with pytest.raises(DataError, match="row 1"):
+            compute_performance_batch(aligned.prices)
+        histories = aligned.to_histories()
+        results = analyze_yield_batch(histories)
+        expected = analyze_yield_with_daily_share_price(histories[1])
+        assert results[1].apy_30d == pytest.approx(expected.apy_30d)
+        # Three filled days, four left out
+        assert results[1].analysis_period_days == 36
+
+    def test_calendar_apy(self, make_history: HistoryFactory) -> None:
+        """Test that calendar APYs use elapsed days rather than point counts."""
+        # Three sparse reports 10 days apart
+        a = make_history(
+            address=VAULT_A,
+            points=[(DAY0, 1.0), (DAY0 + 10 * 86400, 1.01), (DAY0 + 20 * 86400, 1.02)],
+        )
+
+        aligned = align_share_price_histories([a])
+
+        assert calendar_apy(aligned, 10)[0] == pytest.approx(
+            ((1.02 / 1.01) ** (365 / 10) - 1) * 100
+        )
+        assert calendar_apy(aligned, 30)[0] == 0.0
+        with pytest.raises(ConfigurationError, match="days"):
+            calendar_apy(aligned, 0)
+
+    def test_invalid_input(self, make_history: HistoryFactory) -> None:
+        """Test that empty input and inverted windows are rejected."""
+        with pytest.raises(DataError, match="without any prices"):
+            align_share_price_histories([])
+        a = make_history(address=VAULT_A, points=[(DAY0, 1.0)])
+        with pytest.raises(ConfigurationError, match="end must not be before start"):
+            align_share_price_histories([a], start=DAY0 + 86400, end=DAY0)
+        with pytest.raises(ConfigurationError, match="max_gap_days"):
+            align_share_price_histories([a], max_gap_days=-1)
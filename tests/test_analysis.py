@@ -2,11 +2,23 @@
 Tests for the analysis module.
 """
 
+import random
+
+import numpy as np
 import pytest
 
-from yield_analysis_sdk.analysis import analyze_yield_with_daily_share_price
+from yield_analysis_sdk.analysis import (
+    _calculate_tail_risk,
+    _price_metrics,
+    analyze_yield_with_daily_share_price,
+)
+from yield_analysis_sdk.batch import analyze_yield_batch
 from yield_analysis_sdk.exceptions import DataError
-from yield_analysis_sdk.type import PerformanceAnalysis, SharePriceHistory
+from yield_analysis_sdk.type import (
+    CompactSharePriceHistory,
+    PerformanceAnalysis,
+    SharePriceHistory,
+)
 
 
 class TestAnalysis:
@@ -144,3 +156,144 @@ class TestAnalysis:
 
         assert result.apy_90d > 0
         assert result.analysis_period_days == 100
+
+    def test_analyze_yield_with_compact_history(self) -> None:
+        """Test that compact histories give the same metrics without being modified."""
+        prices = [1.0 + i * 0.001 + (i % 3) * 0.0005 for i in range(100)]
+        timestamps = [1640995200 + i * 86400 for i in range(100)]
+        history = SharePriceHistory(
+            name="Test Vault",
+            address="0x1234567890abcdef1234567890abcdef12345678",
+            price_history=list(zip(timestamps, prices)),
+        )
+        compact = CompactSharePriceHistory(
+            name="Test Vault",
+            address="0x1234567890abcdef1234567890abcdef12345678",
+            timestamps=timestamps[::-1],
+            prices=prices[::-1],
+        )
+
+        result = analyze_yield_with_daily_share_price(compact)
+
+        assert result == analyze_yield_with_daily_share_price(history)
+        assert compact.timestamps[0] == timestamps[-1]
+        # Sorted buffers are analyzed in place, tail metrics included
+        assert analyze_yield_with_daily_share_price(
+            history.to_compact(), include_tail_risk=True
+        ) == analyze_yield_with_daily_share_price(history, include_tail_risk=True)
+
+    @pytest.mark.parametrize("zero_at", [None, 50, 3640])
+    def test_price_metrics_matches_reference(self, zero_at: int) -> None:
+        """Test the single-pass kernel against a direct NumPy computation."""
+        rng = random.Random(3)
+        prices = [1.0]
+        for _ in range(3649):
+            prices.append(prices[-1] * (1 + rng.uniform(-0.01, 0.0105)))
+        if zero_at is not None:
+            prices[zero_at] = 0.0
+
+        series = np.array(prices)
+        previous = series[:-1]
+        returns = ((series[1:] - previous) / np.where(previous > 0, previous, 1))[
+            previous > 0
+        ]
+        peaks = np.maximum.accumulate(series)
+        expected = [
+            ((series[-1] / series[-days]) ** (365 / days) - 1) * 100
+            for days in (7, 30, 90)
+        ] + [
+            np.std(returns[-30:], ddof=1) * np.sqrt(365) * 100,
+            np.max((peaks - series) / peaks) * 100,
+            (np.mean(returns) * 365 - 0.05) / (np.std(returns, ddof=1) * np.sqrt(365)),
+        ]
+
+        actual = _price_metrics(prices, 0.05)
+
+        assert actual == pytest.approx(expected, rel=1e-9)
+
+    def test_price_metrics_constant_prices(self) -> None:
+        """Test that flat prices give zero volatility, drawdown and Sharpe ratio."""
+        assert _price_metrics([1.0] * 40, 0.05) == (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+    def test_negative_end_price_is_a_total_loss(self) -> None:
+        """Test that a price falling below zero gives a -100% APY, not a complex one."""
+        history = SharePriceHistory(
+            name="Test Vault",
+            address="0x1234567890abcdef1234567890abcdef12345678",
+            price_history=[
+                (1640995200 + day * 86400, 1.0 if day < 20 else -0.5)
+                for day in range(40)
+            ],
+        )
+
+        result = analyze_yield_with_daily_share_price(history)
+        batch = analyze_yield_batch([history])[0]
+
+        assert isinstance(result.apy_30d, float)
+        assert result.apy_30d == -100.0
+        assert batch.apy_30d == -100.0
+        assert PerformanceAnalysis.model_validate_json(result.model_dump_json())
+
+    def test_analysis_does_not_modify_input(self) -> None:
+        """Test that unsorted histories are analyzed without being reordered."""
+        prices = [1.0 + i * 0.001 + (i % 3) * 0.0005 for i in range(40)]
+        timestamps = [1640995200 + i * 86400 for i in range(40)]
+        points = list(zip(timestamps, prices))
+        unsorted = SharePriceHistory(
+            name="Test Vault",
+            address="0x1234567890abcdef1234567890abcdef12345678",
+            price_history=points[::-1],
+        )
+        trusted = SharePriceHistory.from_sorted(
+            "Test Vault", "0x1234567890abcdef1234567890abcdef12345678", points
+        )
+
+        result = analyze_yield_with_daily_share_price(unsorted)
+
+        assert unsorted.price_history == points[::-1]
+        assert result == analyze_yield_with_daily_share_price(trusted)
+
+    @pytest.mark.parametrize("count", [1, 19, 20, 21, 99, 100, 365])
+    def test_calculate_tail_risk_matches_sorted_reference(self, count: int) -> None:
+        """Test that selection-based VaR and CVaR match a full sort."""
+        rng = np.random.default_rng(count)
+        returns = rng.normal(0.0002, 0.003, count)
+        original = returns.copy()
+
+        var_95, cvar_95, var_99, cvar_99 = _calculate_tail_risk(returns, [0.95, 0.99])
+
+        ordered = np.sort(returns)
+        for level, var, cvar in ((0.95, var_95, cvar_95), (0.99, var_99, cvar_99)):
+            index = int((1 - level) * count)
+            assert var == pytest.approx(ordered[index] * 100)
+            assert cvar == pytest.approx(ordered[: index + 1].mean() * 100)
+            assert cvar <= var
+        np.testing.assert_array_equal(returns, original)
+
+    def test_calculate_tail_risk_without_returns(self) -> None:
+        """Test that tail risk of an empty return series is zero."""
+        assert _calculate_tail_risk(np.empty(0), [0.95, 0.99]) == [0.0] * 4
+
+    def test_analyze_yield_with_tail_risk(self) -> None:
+        """Test the optional VaR, CVaR and APY trend metrics."""
+        # 30 days of slow growth followed by 30 days of faster growth
+        prices = [1.0 + i * 0.0001 for i in range(30)]
+        prices += [prices[-1] * (1.001 ** (i + 1)) for i in range(30)]
+        prices[45] *= 0.98  # One bad day
+        history = SharePriceHistory(
+            name="Test Vault",
+            address="0x1234567890abcdef1234567890abcdef12345678",
+            price_history=[(1640995200 + i * 86400, p) for i, p in enumerate(prices)],
+        )
+
+        default = analyze_yield_with_daily_share_price(history)
+        result = analyze_yield_with_daily_share_price(history, include_tail_risk=True)
+
+        assert default.var_95 is None and default.apy_trend_30d is None
+        assert result.apy_7d == default.apy_7d
+        assert result.var_99 is not None and result.var_99 < 0
+        assert result.cvar_99 is not None and result.cvar_99 <= result.var_99
+        assert result.var_95 is not None and result.cvar_95 is not None
+        assert result.cvar_99 <= result.cvar_95
+        assert result.apy_trend_30d is not None and result.apy_trend_30d > 0
+        assert result.model_fields_set >= {"var_95", "cvar_99", "apy_trend_30d"}
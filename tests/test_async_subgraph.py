@@ -0,0 +1,171 @@
+"""
+Tests for the async subgraph module.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from yield_analysis_sdk.async_subgraph import (
+    AsyncSubgraphClient,
+    get_daily_share_price_history_from_subgraph_async,
+    iter_daily_share_price_histories_by_chain,
+)
+from yield_analysis_sdk.exceptions import ConnectionError, RateLimitError
+from yield_analysis_sdk.subgraph import SUBGRAPH_QUERY_URLS, RequestScheduler
+from yield_analysis_sdk.type import Chain
+
+VAULTS = [f"0x{index:040x}" for index in range(1, 7)]
+
+
+class FakeGateway:
+    """Async handler serving two days of stats per vault and tracking concurrency."""
+
+    def __init__(self, delay: float = 0.01) -> None:
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.urls: List[str] = []
+
+    async def __call__(self, request: "httpx.Request") -> "httpx.Response":
+        self.urls.append(str(request.url))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+
+        variables: Dict[str, Any] = json.loads(request.content)["variables"]
+        data = {
+            alias: [
+                {
+                    "timestamp": str((1640995200 + day * 86400) * 1000000),
+                    "pricePerShare": "1.0",
+                    "vault": {"address": address, "name": address, "decimals": "6"},
+                }
+                for day in (1, 0)
+            ]
+            for alias, address in variables.items()
+            if alias.startswith("v")
+        }
+        return httpx.Response(200, json={"data": data})
+
+
+class TestAsyncSubgraph:
+    """Test cases for async subgraph functionality."""
+
+    def test_get_history_async_preserves_order(self) -> None:
+        """Test that chunked async fetches return histories in input order."""
+        gateway = FakeGateway()
+
+        async def run() -> List[Any]:
+            async with AsyncSubgraphClient(
+                transport=httpx.MockTransport(gateway)
+            ) as client:
+                return await get_daily_share_price_history_from_subgraph_async(
+                    Chain.BASE,
+                    VAULTS,
+                    6,
+                    2,
+                    "test_api_key",
+                    vaults_per_query=2,
+                    client=client,
+                )
+
+        result = asyncio.run(run())
+
+        assert [history.address for history in result] == VAULTS
+        assert all(len(history.price_history) == 2 for history in result)
+        assert len(gateway.urls) == 3
+
+    def test_iter_by_chain_respects_concurrency(self) -> None:
+        """Test fan-out across chains bounded by the client semaphore."""
+        gateway = FakeGateway(delay=0.02)
+
+        async def run() -> List[Any]:
+            async with AsyncSubgraphClient(
+                max_concurrency=2, transport=httpx.MockTransport(gateway)
+            ) as client:
+                return [
+                    item
+                    async for item in iter_daily_share_price_histories_by_chain(
+                        {Chain.BASE: VAULTS[:3], Chain.ARBITRUM: VAULTS[3:]},
+                        6,
+                        2,
+                        "test_api_key",
+                        vaults_per_query=1,
+                        client=client,
+                    )
+                ]
+
+        results = asyncio.run(run())
+
+        assert len(results) == 6
+        assert {chain for chain, _ in results} == {Chain.BASE, Chain.ARBITRUM}
+        assert gateway.max_in_flight == 2
+        assert set(gateway.urls) == {
+            SUBGRAPH_QUERY_URLS[Chain.BASE],
+            SUBGRAPH_QUERY_URLS[Chain.ARBITRUM],
+        }
+
+    def test_query_http_error(self) -> None:
+        """Test that HTTP errors raise ConnectionError once retries are exhausted."""
+
+        async def run() -> None:
+            async with AsyncSubgraphClient(
+                transport=httpx.MockTransport(
+                    lambda request: httpx.Response(429, text="slow down")
+                ),
+                scheduler=RequestScheduler(max_retries=0),
+            ) as client:
+                await client.query(Chain.BASE, "query {}", {}, "test_api_key")
+
+        with pytest.raises(RateLimitError, match="HTTP Error 429"):
+            asyncio.run(run())
+
+    def test_query_retries_rate_limited_request(self) -> None:
+        """Test that a 429 is retried after the requested Retry-After pause."""
+        responses = [
+            httpx.Response(429, text="slow down", headers={"Retry-After": "0"}),
+            httpx.Response(200, json={"data": {}}),
+        ]
+
+        async def run() -> Any:
+            async with AsyncSubgraphClient(
+                transport=httpx.MockTransport(lambda request: responses.pop(0))
+            ) as client:
+                return await client.query(Chain.BASE, "query {}", {}, "test_api_key")
+
+        assert asyncio.run(run()) == {"data": {}}
+        assert responses == []
+
+    def test_cancelled_probe_is_released(self) -> None:
+        """Test that cancelling the probe request leaves the circuit usable."""
+        release = asyncio.Event()
+
+        async def handler(request: "httpx.Request") -> "httpx.Response":
+            if not release.is_set():
+                await asyncio.sleep(3600)
+            return httpx.Response(200, json={"data": {}})
+
+        async def run() -> Any:
+            scheduler = RequestScheduler(failure_threshold=1, reset_timeout=0.0)
+            scheduler.record_failure("test_api_key", SUBGRAPH_QUERY_URLS[Chain.BASE], 0)
+            async with AsyncSubgraphClient(
+                transport=httpx.MockTransport(handler), scheduler=scheduler
+            ) as client:
+                probe = asyncio.create_task(
+                    client.query(Chain.BASE, "query {}", {}, "test_api_key")
+                )
+                await asyncio.sleep(0.01)
+                probe.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await probe
+
+                release.set()
+                return await client.query(Chain.BASE, "query {}", {}, "test_api_key")
+
+        assert asyncio.run(run()) == {"data": {}}
@@ -0,0 +1,185 @@
+"""
+Tests for the batch analysis module.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from tests.helpers import HistoryFactory, PricesFactory
+from yield_analysis_sdk.analysis import analyze_yield_with_daily_share_price
+from yield_analysis_sdk.batch import (
+    analyze_yield_batch,
+    compute_performance_batch,
+    pack_share_price_histories,
+)
+from yield_analysis_sdk.exceptions import DataError
+from yield_analysis_sdk.type import PerformanceAnalysis, SharePriceHistory
+
+
+class TestBatch:
+    """Test cases for batch analysis functionality."""
+
+    def test_pack_share_price_histories(self, make_history: HistoryFactory) -> None:
+        """Test packing histories into a right-aligned price matrix."""
+        histories = [
+            make_history([1.0, 1.1, 1.2], 0),
+            make_history([2.0, 2.1], 1),
+        ]
+
+        prices, lengths = pack_share_price_histories(histories)
+
+        assert prices.shape == (2, 3)
+        assert lengths.tolist() == [3, 2]
+        assert prices[0].tolist() == [1.0, 1.1, 1.2]
+        assert np.isnan(prices[1, 0])
+        assert prices[1, 1:].tolist() == [2.0, 2.1]
+
+    def test_pack_sorts_without_mutating_input(self) -> None:
+        """Test that packing sorts by timestamp but leaves the input untouched."""
+        history = SharePriceHistory(
+            name="Test Vault",
+            address="0x1234567890abcdef1234567890abcdef12345678",
+            price_history=[(1640995200 + 86400, 1.1), (1640995200, 1.0)],
+        )
+        original = list(history.price_history)
+
+        prices, _ = pack_share_price_histories([history])
+
+        assert prices[0].tolist() == [1.0, 1.1]
+        assert history.price_history == original
+
+    def test_pack_compact_histories(self, make_history: HistoryFactory) -> None:
+        """Test that compact and list-backed histories pack identically."""
+        histories = [
+            make_history([1.0, 1.1, 1.2], 0),
+            make_history([2.0, 2.1], 1),
+        ]
+
+        expected, _ = pack_share_price_histories(histories)
+        actual, _ = pack_share_price_histories(
+            [history.to_compact() for history in histories]
+        )
+
+        np.testing.assert_array_equal(actual, expected)
+
+    def test_pack_insufficient_data(self, make_history: HistoryFactory) -> None:
+        """Test that histories with fewer than 2 prices are rejected."""
+        with pytest.raises(
+            DataError, match="At least 2 daily share prices are required"
+        ):
+            pack_share_price_histories([make_history([1.0])])
+
+    def test_analyze_yield_batch_matches_scalar(
+        self, make_history: HistoryFactory, random_prices: PricesFactory
+    ) -> None:
+        """Test that batch results match the per-vault analysis."""
+        rng = random.Random(42)
+        lengths = [2, 3, 7, 8, 30, 31, 45, 90, 91, 365]
+        histories = [
+            make_history(random_prices(length, rng), index)
+            for index, length in enumerate(lengths)
+        ]
+        # Flat prices exercise the zero standard deviation branch
+        histories.append(make_history([1.0] * 40, len(histories)))
+
+        results = analyze_yield_batch(histories, risk_free_rate=0.03)
+
+        assert len(results) == len(histories)
+        for history, result in zip(histories, results):
+            expected = analyze_yield_with_daily_share_price(
+                history, risk_free_rate=0.03
+            )
+            assert isinstance(result, PerformanceAnalysis)
+            for field, value in expected.model_dump().items():
+                assert getattr(result, field) == pytest.approx(
+                    value, rel=1e-9, abs=1e-12
+                ), field
+
+    def test_analyze_yield_batch_non_positive_prices(
+        self, make_history: HistoryFactory, random_prices: PricesFactory
+    ) -> None:
+        """Test that rows with non-positive prices fall back to the scalar path."""
+        rng = random.Random(7)
+        prices = random_prices(60, rng)
+        prices[20] = 0.0
+        history = make_history(prices)
+
+        result = analyze_yield_batch([history])[0]
+        expected = analyze_yield_with_daily_share_price(history)
+
+        assert result.volatility_30d == pytest.approx(expected.volatility_30d)
+        assert result.sharpe_ratio == pytest.approx(expected.sharpe_ratio)
+        assert result.max_drawdown == pytest.approx(expected.max_drawdown)
+
+    def test_compute_performance_batch_chunking(
+        self, make_history: HistoryFactory, random_prices: PricesFactory
+    ) -> None:
+        """Test that the chunk size does not change the results."""
+        rng = random.Random(1)
+        histories = [
+            make_history(random_prices(rng.randint(2, 120), rng), index)
+            for index in range(25)
+        ]
+        prices, lengths = pack_share_price_histories(histories)
+
+        whole = compute_performance_batch(
+            prices, chunk_size=len(histories), include_tail_risk=True
+        )
+        chunked = compute_performance_batch(
+            prices, chunk_size=4, include_tail_risk=True
+        )
+
+        assert whole.analysis_period_days.tolist() == lengths.tolist()
+        for expected, actual in zip(whole, chunked):
+            np.testing.assert_allclose(actual, expected)
+
+    def test_compute_performance_batch_rejects_gaps(self) -> None:
+        """Test that NaN other than left padding is rejected."""
+        prices = np.array([[np.nan, 1.0, 1.1], [1.0, np.nan, 1.1]])
+
+        with pytest.raises(DataError, match="row 1 has a gap"):
+            compute_performance_batch(prices)
+        with pytest.raises(DataError, match="row 0"):
+            compute_performance_batch(np.array([[1.0, 1.1, np.nan]]))
+
+    def test_analyze_yield_batch_tail_risk_matches_scalar(
+        self, make_history: HistoryFactory, random_prices: PricesFactory
+    ) -> None:
+        """Test that batch tail risk metrics match the per-vault analysis."""
+        rng = random.Random(2)
+        histories = [
+            make_history(random_prices(length, rng), index)
+            for index, length in enumerate([2, 5, 21, 59, 60, 61, 150, 150])
+        ]
+        zero_prices = random_prices(90, rng)
+        zero_prices[40] = 0.0
+        histories.append(make_history(zero_prices, len(histories)))
+
+        results = analyze_yield_batch(histories, chunk_size=3, include_tail_risk=True)
+
+        for history, result in zip(histories, results):
+            expected = analyze_yield_with_daily_share_price(
+                history, include_tail_risk=True
+            )
+            for field in ("var_95", "cvar_95", "var_99", "cvar_99", "apy_trend_30d"):
+                assert getattr(result, field) == pytest.approx(getattr(expected, field))
+
+    def test_analyze_yield_batch_tail_risk_off_by_default(
+        self, make_history: HistoryFactory, random_prices: PricesFactory
+    ) -> None:
+        """Test that the optional metrics stay unset unless requested."""
+        rng = random.Random(3)
+        history = make_history(random_prices(60, rng))
+
+        batch = compute_performance_batch(pack_share_price_histories([history])[0])
+        result = analyze_yield_batch([history])[0]
+
+        assert batch.var_95 is None
+        assert result.var_95 is None
+        assert result.apy_trend_30d is None
+
+    def test_analyze_yield_batch_empty(self) -> None:
+        """Test that an empty batch returns no results."""
+        assert analyze_yield_batch([]) == []
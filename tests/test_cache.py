@@ -0,0 +1,103 @@
+"""
+Tests for the cache module.
+"""
+
+from unittest.mock import Mock, patch
+
+from yield_analysis_sdk.cache import QueryCache
+from yield_analysis_sdk.subgraph import SubgraphClient
+from yield_analysis_sdk.type import Chain
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestQueryCache:
+    """Test cases for the query cache."""
+
+    def test_make_key_normalizes(self) -> None:
+        """Test that whitespace and variable order do not change the key."""
+        key = QueryCache.make_key(Chain.BASE, "query {\n  a\n}", {"x": 1, "y": [2]})
+
+        assert key == QueryCache.make_key(Chain.BASE, "query { a }", {"y": [2], "x": 1})
+        assert key != QueryCache.make_key(
+            Chain.ARBITRUM, "query { a }", {"x": 1, "y": [2]}
+        )
+
+    def test_hit_and_miss_counters(self) -> None:
+        """Test hits and misses are counted."""
+        cache = QueryCache()
+
+        assert cache.get("key") is None
+        cache.put("key", {"data": {}})
+
+        assert cache.get("key") == {"data": {}}
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+    def test_expires_at_daily_boundary(self) -> None:
+        """Test that entries expire when the next UTC day starts."""
+        clock = FakeClock(86400 * 100 + 86000)
+        cache = QueryCache(clock=clock)
+        cache.put("key", {"data": {}})
+
+        clock.now = 86400 * 101 - 1
+        assert cache.get("key") is not None
+        clock.now = 86400 * 101
+        assert cache.get("key") is None
+        assert cache.stats().entries == 0
+
+    def test_ttl_shorter_than_interval(self) -> None:
+        """Test that an explicit TTL expires entries before the boundary."""
+        clock = FakeClock(86400 * 100)
+        cache = QueryCache(ttl=60, clock=clock)
+        cache.put("key", {"data": {}})
+
+        clock.now += 61
+        assert cache.get("key") is None
+
+    def test_lru_eviction_by_size(self) -> None:
+        """Test that least recently used entries are evicted over the byte budget."""
+        value = {"data": "x" * 20}
+        size = len('{"data":"' + "x" * 20 + '"}')
+        cache = QueryCache(max_bytes=size * 2)
+
+        cache.put("a", value)
+        cache.put("b", value)
+        cache.get("a")
+        cache.put("c", value)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == value
+        assert cache.get("c") == value
+        stats = cache.stats()
+        assert stats.evictions == 1
+        assert stats.size_bytes == size * 2
+
+    def test_oversized_values_are_not_cached(self) -> None:
+        """Test that a response larger than the budget is skipped."""
+        cache = QueryCache(max_bytes=4)
+        cache.put("key", {"data": "too large"})
+
+        assert cache.stats().entries == 0
+
+    def test_client_serves_repeated_queries_from_cache(self) -> None:
+        """Test that a cached client sends duplicate queries only once."""
+        cache = QueryCache()
+        client = SubgraphClient(cache=cache)
+        response = Mock(status_code=200)
+        response.json.return_value = {"data": {"v0": []}}
+
+        with patch.object(client.session, "post", return_value=response) as post:
+            first = client.query(Chain.BASE, "query { a }", {"v0": "0x1"}, "key")
+            second = client.query(Chain.BASE, "query {  a }", {"v0": "0x1"}, "key")
+            client.query(Chain.ARBITRUM, "query { a }", {"v0": "0x1"}, "key")
+
+        assert first == second
+        assert post.call_count == 2
+        assert cache.stats().hits == 1
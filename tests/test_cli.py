@@ -0,0 +1,211 @@
+"""
+Tests for the command line interface.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from tests.test_subgraph import VAULT_A, VAULT_B, FakeSubgraph
+from yield_analysis_sdk.analysis import analyze_yield_with_daily_share_price
+from yield_analysis_sdk.cli import main, read_share_price_histories
+from yield_analysis_sdk.exceptions import ConfigurationError, DataError
+from yield_analysis_sdk.type import AnalysisResponse, AnalysisResult, SharePriceHistory
+
+
+def _write_csv(path: Path) -> None:
+    rows = ["address,timestamp,price,name"]
+    for day in range(40):
+        # Mixed case addresses are normalized before grouping
+        rows.append(
+            f"0x{VAULT_A[2:].upper()},{1640995200 + day * 86400},{1 + day * 0.001},Vault A"
+        )
+        rows.append(f"{VAULT_B},{1640995200 + day * 86400},{2 + day * 0.002},Vault B")
+    path.write_text("\n".join(rows) + "\n")
+
+
+class TestCli:
+    """Test cases for the yield-analyzer command."""
+
+    def test_read_csv(self, tmp_path: Path) -> None:
+        """Test that long-format CSV rows are grouped into one history per vault."""
+        path = tmp_path / "prices.csv"
+        _write_csv(path)
+
+        histories = read_share_price_histories(path)
+
+        assert [history.address for history in histories] == [VAULT_A, VAULT_B]
+        assert histories[0].name == "Vault A"
+        assert histories[1].price_history[0] == (1640995200, 2.0)
+        assert len(histories[1].price_history) == 40
+
+    def test_read_parquet_matches_csv(self, tmp_path: Path) -> None:
+        """Test that Parquet input is read like the equivalent CSV."""
+        pa_csv = pytest.importorskip("pyarrow.csv")
+        pq = pytest.importorskip("pyarrow.parquet")
+        csv_path = tmp_path / "prices.csv"
+        _write_csv(csv_path)
+        parquet_path = tmp_path / "prices.parquet"
+        pq.write_table(pa_csv.read_csv(csv_path), parquet_path)
+
+        assert read_share_price_histories(parquet_path) == read_share_price_histories(
+            csv_path
+        )
+
+    def test_read_missing_columns(self, tmp_path: Path) -> None:
+        """Test that a CSV file without the required columns is rejected."""
+        path = tmp_path / "prices.csv"
+        path.write_text("address,price\n")
+
+        with pytest.raises(DataError, match="missing columns: timestamp"):
+            read_share_price_histories(path)
+
+    def test_read_unsupported_suffix(self, tmp_path: Path) -> None:
+        """Test that unknown input file types are rejected."""
+        with pytest.raises(ConfigurationError, match="Unsupported input file type"):
+            read_share_price_histories(tmp_path / "prices.xlsx")
+
+    def test_jsonl_to_json(self, tmp_path: Path) -> None:
+        """Test analyzing a JSONL file into a single AnalysisResponse document."""
+        history = SharePriceHistory(
+            name="Vault A",
+            address=VAULT_A,
+            price_history=[
+                (1640995200 + day * 86400, 1 + day * 0.001) for day in range(40)
+            ],
+        )
+        short = SharePriceHistory(
+            name="Vault B", address=VAULT_B, price_history=[(1640995200, 1.0)]
+        )
+        input_path = tmp_path / "histories.jsonl"
+        input_path.write_text(
+            history.model_dump_json() + "\n\n" + short.model_dump_json() + "\n"
+        )
+        output_path = tmp_path / "analysis.json"
+
+        code = main(
+            ["--chain", "base", "--input", str(input_path), "-o", str(output_path)]
+        )
+
+        assert code == 0
+        response = AnalysisResponse.model_validate_json(output_path.read_text())
+        assert len(response.analyses) == 1
+        result = response.analyses[0]
+        assert result.vault_info.address == VAULT_A
+        assert result.vault_info.current_share_price == pytest.approx(1.039)
+        assert result.vault_info.last_updated_timestamp == 1640995200 + 39 * 86400
+        assert result.performance.apy_30d == pytest.approx(
+            analyze_yield_with_daily_share_price(history).apy_30d
+        )
+
+    def test_csv_to_jsonl_with_workers(self, tmp_path: Path) -> None:
+        """Test that --workers and --chunk-size produce one JSONL line per vault."""
+        input_path = tmp_path / "prices.csv"
+        _write_csv(input_path)
+        output_path = tmp_path / "analysis.jsonl"
+
+        code = main(
+            [
+                "--chain",
+                "base",
+                "--input",
+                str(input_path),
+                "--workers",
+                "2",
+                "--chunk-size",
+                "1",
+                "-o",
+                str(output_path),
+            ]
+        )
+
+        assert code == 0
+        lines = output_path.read_text().splitlines()
+        results = [AnalysisResult.model_validate_json(line) for line in lines]
+        assert [result.vault_info.address for result in results] == [VAULT_A, VAULT_B]
+        assert all(result.performance.analysis_period_days == 40 for result in results)
+
+    def test_subgraph_with_cache_dir(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture
+    ) -> None:
+        """Test fetching from the subgraph through a SharePriceStore in --cache-dir."""
+        fake = FakeSubgraph({VAULT_A: 20, VAULT_B: 5})
+        argv = [
+            "--chain",
+            "base",
+            "--vaults",
+            VAULT_A,
+            VAULT_B,
+            "--length",
+            "10",
+            "--api-key",
+            "test_api_key",
+            "--cache-dir",
+            str(tmp_path / "cache"),
+        ]
+
+        with patch("yield_analysis_sdk.subgraph._send_graphql_query_to_subgraph", fake):
+            assert main(argv) == 0
+            first = json.loads(capsys.readouterr().out)
+            assert main(argv) == 0
+            second = json.loads(capsys.readouterr().out)
+
+        assert (tmp_path / "cache" / "share_prices.sqlite").exists()
+        assert [result["vault_info"]["address"] for result in first["analyses"]] == [
+            VAULT_A,
+            VAULT_B,
+        ]
+        assert second == first
+        # The second run only asks for prices newer than the stored ones
+        assert "s0" in fake.calls[-1] and "s1" in fake.calls[-1]
+
+    def test_missing_api_key(
+        self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+    ) -> None:
+        """Test that fetching without an API key fails with a readable error."""
+        monkeypatch.delenv("SUBGRAPH_API_KEY", raising=False)
+
+        assert main(["--chain", "base", "--vaults", VAULT_A]) == 1
+        assert "API key is required" in capsys.readouterr().err
+
+    def test_unknown_chain(self, capsys: pytest.CaptureFixture) -> None:
+        """Test that a misspelled chain is rejected instead of becoming OTHER."""
+        with pytest.raises(SystemExit) as excinfo:
+            main(["--chain", "basee", "--vaults", VAULT_A])
+
+        assert excinfo.value.code == 2
+        assert "invalid chain 'basee'" in capsys.readouterr().err
+
+    def test_parquet_output(self, tmp_path: Path) -> None:
+        """Test that a .parquet output path writes flattened results."""
+        pytest.importorskip("pyarrow")
+        from yield_analysis_sdk.export import iter_analysis_results
+
+        input_path = tmp_path / "prices.csv"
+        _write_csv(input_path)
+        output_path = tmp_path / "analysis.parquet"
+
+        code = main(
+            ["--chain", "base", "--input", str(input_path), "-o", str(output_path)]
+        )
+
+        assert code == 0
+        results = list(iter_analysis_results(output_path))
+        assert [result.vault_info.address for result in results] == [VAULT_A, VAULT_B]
+
+    def test_startup_does_not_import_optional_dependencies(self) -> None:
+        """Test that importing the SDK and the CLI leaves pyarrow, httpx and ijson unloaded."""
+        code = (
+            "import sys, yield_analysis_sdk, yield_analysis_sdk.cli; "
+            "print([m for m in ('pyarrow', 'httpx', 'ijson') if m in sys.modules])"
+        )
+
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+
+        assert output.strip() == "[]"
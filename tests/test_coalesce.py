@@ -0,0 +1,147 @@
+"""
+Tests for the coalesce module.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+
+from tests.test_subgraph import VAULT_A, VAULT_B, FakeSubgraph
+from yield_analysis_sdk.coalesce import CoalescingFetcher
+from yield_analysis_sdk.exceptions import ConfigurationError, ConnectionError
+from yield_analysis_sdk.type import Chain
+
+VAULT_C = "0x" + "c" * 40
+
+
+class GatedSubgraph(FakeSubgraph):
+    """FakeSubgraph whose first query blocks until released."""
+
+    def __init__(self, days_by_vault: Dict[str, int]) -> None:
+        super().__init__(days_by_vault)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        self.started.set()
+        assert self.release.wait(5)
+        return super().__call__(*args, **kwargs)
+
+
+def _fetch_in_thread(
+    fetcher: CoalescingFetcher, addresses: List[str], results: Dict[str, Any], name: str
+) -> threading.Thread:
+    def run() -> None:
+        try:
+            results[name] = fetcher.get_daily_share_price_history(
+                Chain.BASE, addresses, 6, 10, "test_api_key"
+            )
+        except Exception as e:
+            results[name] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def _queried_addresses(fake: FakeSubgraph) -> List[str]:
+    return [
+        value
+        for variables in fake.calls
+        for name, value in variables.items()
+        if name.startswith("v")
+    ]
+
+
+class TestCoalescingFetcher:
+    """Test cases for single-flight history fetching."""
+
+    def test_single_caller(self) -> None:
+        """Test that a lone caller gets its histories in request order."""
+        fake = FakeSubgraph({VAULT_A: 5, VAULT_B: 3})
+        fetcher = CoalescingFetcher(linger=0)
+
+        with patch("yield_analysis_sdk.subgraph._send_graphql_query_to_subgraph", fake):
+            result = fetcher.get_daily_share_price_history(
+                Chain.BASE, [VAULT_B, VAULT_A, VAULT_C], 6, 10, "test_api_key"
+            )
+
+        assert [history.address for history in result] == [VAULT_B, VAULT_A]
+        assert fetcher.stats().flights == 1
+
+    def test_joins_in_flight_fetch(self) -> None:
+        """Test that a caller waits for addresses already in flight instead of refetching."""
+        fake = GatedSubgraph({VAULT_A: 5, VAULT_B: 3, VAULT_C: 4})
+        fetcher = CoalescingFetcher(linger=0)
+        results: Dict[str, Any] = {}
+
+        with patch("yield_analysis_sdk.subgraph._send_graphql_query_to_subgraph", fake):
+            first = _fetch_in_thread(fetcher, [VAULT_A, VAULT_B], results, "first")
+            assert fake.started.wait(5)
+            second = _fetch_in_thread(fetcher, [VAULT_B, VAULT_C], results, "second")
+            # Let the second caller register before the first flight lands
+            while fetcher.stats().calls < 2:
+                time.sleep(0.001)
+            fake.release.set()
+            first.join(5)
+            second.join(5)
+
+        assert [history.address for history in results["first"]] == [VAULT_A, VAULT_B]
+        assert [history.address for history in results["second"]] == [VAULT_B, VAULT_C]
+        # VAULT_B is shared, not fetched twice
+        assert results["first"][1] is results["second"][0]
+        assert sorted(_queried_addresses(fake)) == sorted([VAULT_A, VAULT_B, VAULT_C])
+
+    def test_merges_overlapping_requests_into_union(self) -> None:
+        """Test that callers arriving within the linger window share one union flight."""
+        fake = FakeSubgraph({VAULT_A: 5, VAULT_B: 3, VAULT_C: 4})
+        fetcher = CoalescingFetcher(linger=0.2)
+        results: Dict[str, Any] = {}
+
+        with patch("yield_analysis_sdk.subgraph._send_graphql_query_to_subgraph", fake):
+            threads = [
+                _fetch_in_thread(fetcher, [VAULT_A, VAULT_B], results, "first"),
+                _fetch_in_thread(fetcher, [VAULT_C, VAULT_A], results, "second"),
+            ]
+            for thread in threads:
+                thread.join(5)
+
+        stats = fetcher.stats()
+        assert stats.calls == 2
+        assert stats.flights == 1
+        assert stats.requested_addresses == 4
+        assert stats.fetched_addresses == 3
+        assert len(fake.calls) == 1
+        assert [history.address for history in results["second"]] == [VAULT_C, VAULT_A]
+
+    def test_error_is_raised_for_every_waiter(self) -> None:
+        """Test that a failed flight raises in each caller and is not cached."""
+        fetcher = CoalescingFetcher(linger=0)
+
+        with patch(
+            "yield_analysis_sdk.subgraph._send_graphql_query_to_subgraph",
+            side_effect=ConnectionError("gateway down"),
+        ):
+            with pytest.raises(ConnectionError, match="gateway down"):
+                fetcher.get_daily_share_price_history(
+                    Chain.BASE, [VAULT_A], 6, 10, "test_api_key"
+                )
+
+        fake = FakeSubgraph({VAULT_A: 2})
+        with patch("yield_analysis_sdk.subgraph._send_graphql_query_to_subgraph", fake):
+            result = fetcher.get_daily_share_price_history(
+                Chain.BASE, [VAULT_A], 6, 10, "test_api_key"
+            )
+        assert len(result[0].price_history) == 2
+
+    def test_invalid_configuration(self) -> None:
+        """Test that negative linger times and missing API keys are rejected."""
+        with pytest.raises(ConfigurationError, match="linger"):
+            CoalescingFetcher(linger=-1)
+        with pytest.raises(ConfigurationError, match="SUBGRAPH_API_KEY"):
+            CoalescingFetcher().get_daily_share_price_history(
+                Chain.BASE, [VAULT_A], 6, 10, ""
+            )
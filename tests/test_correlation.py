@@ -0,0 +1,243 @@
+"""
+Tests for the correlation module.
+"""
+
+import numpy as np
+import pytest
+
+from tests.helpers import START_TIMESTAMP, HistoryFactory
+from yield_analysis_sdk.correlation import (
+    attach_correlation,
+    compute_return_covariance,
+    covariance_from_returns,
+)
+from yield_analysis_sdk.exceptions import ConfigurationError, DataError
+from yield_analysis_sdk.type import (
+    AnalysisResponse,
+    AnalysisResult,
+    Chain,
+    CompactSharePriceHistory,
+    PerformanceAnalysis,
+    VaultInfo,
+)
+
+DAY0 = START_TIMESTAMP
+
+
+def _returns(vaults: int, days: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0003, 0.002, (vaults, days))
+    # Make the second vault follow the first
+    returns[1] += 0.8 * returns[0]
+    return returns
+
+
+def _prices(returns: np.ndarray) -> list:
+    """Prices starting at 1.0 that earn the given daily returns."""
+    return np.concatenate(([1.0], np.cumprod(1 + returns))).tolist()
+
+
+def _ledoit_wolf_reference(samples: np.ndarray) -> float:
+    """Textbook Ledoit-Wolf intensity for a (days x vaults) sample matrix."""
+    n_days, n_vaults = samples.shape
+    samples = samples - samples.mean(axis=0)
+    covariance = samples.T @ samples / n_days
+    mu = np.trace(covariance) / n_vaults
+    target = mu * np.eye(n_vaults)
+    delta = ((covariance - target) ** 2).sum()
+    beta = sum(((np.outer(row, row) - covariance) ** 2).sum() for row in samples) / (
+        n_days * n_days
+    )
+    return float(min(beta, delta) / delta)
+
+
+class TestCorrelation:
+    """Test cases for the cross-vault covariance engine."""
+
+    def test_complete_returns_match_numpy(self) -> None:
+        """Test that gap-free returns reproduce numpy's covariance and correlation."""
+        returns = _returns(5, 120)
+
+        estimate = covariance_from_returns(returns, [str(i) for i in range(5)])
+
+        np.testing.assert_allclose(estimate.covariance, np.cov(returns))
+        np.testing.assert_allclose(estimate.correlation, np.corrcoef(returns))
+        assert estimate.observations.tolist() == [[120] * 5] * 5
+        assert estimate.correlation[0, 1] > 0.5
+
+    def test_exponential_weights_match_numpy(self) -> None:
+        """Test that halflife_days applies reliability weights like numpy.cov."""
+        returns = _returns(4, 90)
+        weights = 0.5 ** (np.arange(89, -1, -1) / 20)
+
+        estimate = covariance_from_returns(
+            returns, [str(i) for i in range(4)], halflife_days=20
+        )
+
+        np.testing.assert_allclose(
+            estimate.covariance, np.cov(returns, aweights=weights)
+        )
+
+    @pytest.mark.parametrize("halflife_days", [None, 15.0])
+    def test_pairwise_complete_matches_loop(self, halflife_days: float) -> None:
+        """Test that gaps give the statistics of each pair's shared days."""
+        returns = _returns(4, 80, seed=1)
+        returns[2, :30] = np.nan
+        returns[3, ::4] = np.nan
+        weights = (
+            np.ones(80)
+            if halflife_days is None
+            else 0.5 ** (np.arange(79, -1, -1) / halflife_days)
+        )
+
+        estimate = covariance_from_returns(
+            returns, [str(i) for i in range(4)], halflife_days=halflife_days
+        )
+
+        for i in range(4):
+            for j in range(4):
+                shared = ~np.isnan(returns[i]) & ~np.isnan(returns[j])
+                pair = np.cov(
+                    returns[i, shared], returns[j, shared], aweights=weights[shared]
+                )
+                assert estimate.observations[i, j] == shared.sum()
+                assert estimate.covariance[i, j] == pytest.approx(pair[0, 1])
+                assert estimate.correlation[i, j] == pytest.approx(
+                    pair[0, 1] / np.sqrt(pair[0, 0] * pair[1, 1])
+                )
+
+    def test_min_periods(self) -> None:
+        """Test that pairs with too few shared days are NaN."""
+        returns = _returns(3, 40)
+        returns[2, :35] = np.nan
+
+        estimate = covariance_from_returns(returns, ["a", "b", "c"], min_periods=10)
+
+        assert np.isnan(estimate.correlation[0, 2])
+        assert np.isnan(estimate.covariance[2, 2])
+        assert estimate.correlation[0, 0] == 1.0
+        model = estimate.to_model()
+        assert model.correlation[0][2] is None
+        assert model.observations[2][2] == 5
+
+    def test_ledoit_wolf_shrinkage(self) -> None:
+        """Test the estimated intensity and the shrunk matrix."""
+        returns = _returns(8, 30, seed=2)
+
+        plain = covariance_from_returns(returns, [str(i) for i in range(8)])
+        shrunk = covariance_from_returns(
+            returns, [str(i) for i in range(8)], shrinkage="ledoit-wolf"
+        )
+
+        assert shrunk.shrinkage == pytest.approx(_ledoit_wolf_reference(returns.T))
+        assert 0 < shrunk.shrinkage < 1
+        off_diagonal = ~np.eye(8, dtype=bool)
+        assert np.all(
+            np.abs(shrunk.correlation[off_diagonal])
+            <= np.abs(plain.correlation[off_diagonal])
+        )
+        np.testing.assert_allclose(np.diag(shrunk.correlation), 1.0)
+
+    def test_fixed_shrinkage(self) -> None:
+        """Test blending with the identity scaled by the mean variance."""
+        returns = _returns(3, 60)
+        plain = covariance_from_returns(returns, ["a", "b", "c"])
+
+        shrunk = covariance_from_returns(returns, ["a", "b", "c"], shrinkage=0.5)
+
+        mu = np.diag(plain.covariance).mean()
+        np.testing.assert_allclose(
+            shrunk.covariance, 0.5 * plain.covariance + 0.5 * mu * np.eye(3)
+        )
+        assert shrunk.shrinkage == 0.5
+
+    def test_invalid_arguments(self) -> None:
+        """Test that invalid settings are rejected."""
+        returns = _returns(2, 10)
+        with pytest.raises(ConfigurationError, match="shrinkage"):
+            covariance_from_returns(returns, ["a", "b"], shrinkage="oas")
+        with pytest.raises(ConfigurationError, match="shrinkage"):
+            covariance_from_returns(returns, ["a", "b"], shrinkage=1.5)
+        with pytest.raises(ConfigurationError, match="halflife_days"):
+            covariance_from_returns(returns, ["a", "b"], halflife_days=0)
+        with pytest.raises(DataError, match="one address per row"):
+            covariance_from_returns(returns, ["a"])
+        with pytest.raises(DataError):
+            compute_return_covariance([])
+
+    def test_compute_return_covariance_from_histories(
+        self, make_history: HistoryFactory
+    ) -> None:
+        """Test that histories are aligned on calendar days before comparing."""
+        returns = _returns(3, 60)
+        histories = [
+            make_history(_prices(returns[index]), index).to_compact()
+            for index in range(3)
+        ]
+        # A vault that starts later only shares its own days with the others
+        late = histories[2]
+        histories[2] = CompactSharePriceHistory(
+            name=late.name,
+            address=late.address,
+            timestamps=late.timestamps[20:],
+            prices=late.prices[20:],
+        )
+
+        estimate = compute_return_covariance(histories)
+
+        assert estimate.addresses == [history.address for history in histories]
+        np.testing.assert_allclose(
+            estimate.covariance[:2, :2], np.cov(returns[:2]), rtol=1e-9
+        )
+        assert estimate.observations[0, 2] == 40
+        assert estimate.covariance[0, 2] == pytest.approx(
+            np.cov(returns[0, 20:], returns[2, 20:])[0, 1]
+        )
+
+    def test_attach_correlation(self, make_history: HistoryFactory) -> None:
+        """Test attaching the matrix in the order of the response's vaults."""
+        returns = _returns(3, 40)
+        histories = [
+            make_history(_prices(returns[index]), index).to_compact()
+            for index in range(3)
+        ]
+        analyses = [
+            AnalysisResult(
+                vault_info=VaultInfo(
+                    chain=Chain.BASE,
+                    address=history.address.upper().replace("0X", "0x"),
+                    name=history.name,
+                    protocol="Test Protocol",
+                    current_share_price=1.0,
+                    last_updated_timestamp=DAY0,
+                ),
+                performance=PerformanceAnalysis(
+                    apy_7d=5.0,
+                    apy_30d=5.0,
+                    apy_90d=0.0,
+                    volatility_30d=1.0,
+                    max_drawdown=0.5,
+                    sharpe_ratio=1.0,
+                    analysis_period_days=41,
+                ),
+            )
+            for history in reversed(histories[:2])
+        ]
+        response = AnalysisResponse(analyses=analyses)
+
+        attached = attach_correlation(response, histories)
+
+        assert response.correlation is None
+        assert attached.correlation is not None
+        assert attached.correlation.addresses == [
+            histories[1].address,
+            histories[0].address,
+        ]
+        assert attached.correlation.correlation[0][1] == pytest.approx(
+            np.corrcoef(returns[1], returns[0])[0, 1]
+        )
+        assert AnalysisResponse.model_validate_json(attached.model_dump_json()) == (
+            attached
+        )
+        with pytest.raises(DataError, match="No share price history"):
+            attach_correlation(response, histories[:1])
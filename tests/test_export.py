@@ -0,0 +1,112 @@
+"""
+Tests for the export module.
+"""
+
+from pathlib import Path
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+ds = pytest.importorskip("pyarrow.dataset")
+
+from yield_analysis_sdk.export import (
+    analysis_results_to_table,
+    analysis_schema,
+    iter_analysis_results,
+    read_analysis_table,
+    table_to_analysis_results,
+    write_analysis_parquet,
+)
+from yield_analysis_sdk.type import (
+    AnalysisResponse,
+    AnalysisResult,
+    Chain,
+    PerformanceAnalysis,
+    VaultInfo,
+)
+
+
+def _make_results(count: int) -> list:
+    return [
+        AnalysisResult(
+            vault_info=VaultInfo(
+                chain=Chain.BASE if index % 2 else Chain.ARBITRUM,
+                address=f"0x{index + 1:040x}",
+                name=f"Vault {index}",
+                protocol="Morpho Meta Vault",
+                entry_cost_bps=index,
+                current_share_price=1.0 + index / 100,
+                last_updated_timestamp=1640995200 + index,
+            ),
+            performance=PerformanceAnalysis(
+                apy_7d=index + 0.1,
+                apy_30d=index + 0.2,
+                apy_90d=index + 0.3,
+                volatility_30d=1.5,
+                max_drawdown=0.5,
+                sharpe_ratio=2.0,
+                analysis_period_days=90,
+                var_95=-0.2 if index % 2 else None,
+            ),
+            extra_info={"rank": index} if index % 3 == 0 else None,
+        )
+        for index in range(count)
+    ]
+
+
+class TestExport:
+    """Test cases for the columnar export."""
+
+    def test_table_layout(self) -> None:
+        """Test that results are flattened into one typed row per vault."""
+        table = analysis_results_to_table(AnalysisResponse(analyses=_make_results(4)))
+
+        assert table.num_rows == 4
+        assert table.schema == analysis_schema()
+        assert table.schema.field("chain").type == pa.dictionary(
+            pa.int32(), pa.string()
+        )
+        assert table.schema.field("analysis_period_days").type == pa.int64()
+        assert table.schema.field("var_95").type == pa.float64()
+        assert table.column("var_95").to_pylist() == [None, -0.2, None, -0.2]
+        assert table.column("chain").to_pylist() == [
+            "arbitrum",
+            "base",
+            "arbitrum",
+            "base",
+        ]
+        assert table.column("extra_info").to_pylist() == [
+            '{"rank": 0}',
+            None,
+            None,
+            '{"rank": 3}',
+        ]
+
+    def test_parquet_round_trip(self, tmp_path: Path) -> None:
+        """Test that results survive a Parquet round trip unchanged."""
+        results = _make_results(10)
+        path = tmp_path / "analysis.parquet"
+
+        write_analysis_parquet(results, path, row_group_size=4)
+
+        assert list(iter_analysis_results(path, batch_size=3)) == results
+        assert table_to_analysis_results(read_analysis_table(path)) == results
+
+    def test_read_selected_columns(self, tmp_path: Path) -> None:
+        """Test reading only some columns of the rows matching a filter."""
+        path = tmp_path / "analysis.parquet"
+        write_analysis_parquet(_make_results(10), path)
+
+        table = read_analysis_table(
+            path, columns=["address", "apy_30d"], filter=ds.field("apy_30d") > 7
+        )
+
+        assert table.column_names == ["address", "apy_30d"]
+        assert table.column("apy_30d").to_pylist() == [7.2, 8.2, 9.2]
+
+    def test_empty_results(self) -> None:
+        """Test that an empty batch produces an empty table with the full schema."""
+        table = analysis_results_to_table([])
+
+        assert table.num_rows == 0
+        assert table.schema == analysis_schema()
@@ -0,0 +1,65 @@
+"""
+Tests for the incremental analysis module.
+"""
+
+import pytest
+
+from tests.helpers import HistoryFactory, PricesFactory
+from yield_analysis_sdk.analysis import analyze_yield_with_daily_share_price
+from yield_analysis_sdk.exceptions import DataError
+from yield_analysis_sdk.incremental import IncrementalYieldAnalyzer
+
+
+class TestIncremental:
+    """Test cases for the incremental analyzer."""
+
+    def test_matches_full_analysis_after_every_update(
+        self, make_history: HistoryFactory, random_prices: PricesFactory
+    ) -> None:
+        """Test that incremental metrics equal a full recomputation at each step."""
+        points = make_history(random_prices(150, 3)).price_history
+
+        analyzer = IncrementalYieldAnalyzer(risk_free_rate=0.04)
+        for index, (timestamp, price) in enumerate(points):
+            analyzer.update(timestamp, price)
+            if index < 1:
+                continue
+
+            expected = analyze_yield_with_daily_share_price(
+                make_history(points=points[: index + 1]), risk_free_rate=0.04
+            )
+            result = analyzer.analysis()
+            for field, value in expected.model_dump().items():
+                assert getattr(result, field) == pytest.approx(
+                    value, rel=1e-8, abs=1e-10
+                ), (index, field)
+
+    def test_from_history(self, make_history: HistoryFactory) -> None:
+        """Test seeding the analyzer from an unsorted history."""
+        points = [(1640995200 + day * 86400, 1.0 + day * 0.001) for day in range(40)]
+        history = make_history(points=points[::-1])
+
+        analyzer = IncrementalYieldAnalyzer.from_history(history)
+
+        assert analyzer.count == 40
+        assert analyzer.analysis().apy_30d == pytest.approx(
+            analyze_yield_with_daily_share_price(make_history(points=points)).apy_30d
+        )
+
+    def test_rejects_out_of_order_updates(self) -> None:
+        """Test that timestamps must strictly increase."""
+        analyzer = IncrementalYieldAnalyzer()
+        analyzer.update(1640995200, 1.0)
+
+        with pytest.raises(DataError, match="timestamp order"):
+            analyzer.update(1640995200, 1.01)
+
+    def test_requires_two_prices(self) -> None:
+        """Test that analysis needs at least two prices."""
+        analyzer = IncrementalYieldAnalyzer()
+        analyzer.update(1640995200, 1.0)
+
+        with pytest.raises(
+            DataError, match="At least 2 daily share prices are required"
+        ):
+            analyzer.analysis()
@@ -0,0 +1,331 @@
+"""
+Tests for the optimizer module.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pytest
+
+from yield_analysis_sdk.correlation import ReturnCovariance, covariance_from_returns
+from yield_analysis_sdk.exceptions import ConfigurationError, DataError
+from yield_analysis_sdk.optimizer import (
+    DAYS_PER_YEAR,
+    maximize_sharpe_allocation,
+    optimize_allocation,
+)
+from yield_analysis_sdk.type import (
+    AnalysisResult,
+    Chain,
+    PerformanceAnalysis,
+    VaultInfo,
+)
+
+
+def _result(
+    index: int,
+    apy: float,
+    entry_cost_bps: int = 0,
+    exit_cost_bps: int = 0,
+    max_deposit_amount: float = 1_000_000_000_000.00,
+) -> AnalysisResult:
+    return AnalysisResult(
+        vault_info=VaultInfo(
+            chain=Chain.BASE,
+            address=f"0x{index + 1:040x}",
+            name=f"Vault {index}",
+            protocol="Test Protocol",
+            entry_cost_bps=entry_cost_bps,
+            exit_cost_bps=exit_cost_bps,
+            max_deposit_amount=max_deposit_amount,
+            current_share_price=1.0,
+            last_updated_timestamp=1640995200,
+        ),
+        performance=PerformanceAnalysis(
+            apy_7d=apy,
+            apy_30d=apy,
+            apy_90d=apy,
+            volatility_30d=1.0,
+            max_drawdown=0.5,
+            sharpe_ratio=1.0,
+            analysis_period_days=90,
+        ),
+    )
+
+
+def _universe(
+    count: int, seed: int = 0
+) -> Tuple[List[AnalysisResult], np.ndarray, Dict[str, float]]:
+    """Random vaults with costs and capacities, a factor covariance and holdings."""
+    rng = np.random.default_rng(seed)
+    results = [
+        _result(
+            index,
+            float(rng.uniform(2, 12)),
+            int(rng.integers(0, 30)),
+            int(rng.integers(0, 30)),
+            float(rng.uniform(1e5, 5e6)),
+        )
+        for index in range(count)
+    ]
+    factors = rng.normal(0, 0.002, (count, 3))
+    covariance = factors @ factors.T + np.diag(rng.uniform(1e-6, 2e-5, count))
+    holdings = rng.dirichlet(np.ones(count))
+    current = {
+        result.vault_info.address: float(weight)
+        for result, weight in zip(results, holdings)
+    }
+    return results, covariance, current
+
+
+def _objective(
+    weights: np.ndarray,
+    results: List[AnalysisResult],
+    covariance: np.ndarray,
+    risk_aversion: float,
+    current: Optional[Dict[str, float]],
+    holding_period_days: float = 30.0,
+) -> float:
+    """Reference objective written out from the definitions, to be minimized."""
+    value = risk_aversion / 2 * weights @ (covariance * DAYS_PER_YEAR) @ weights
+    for weight, result in zip(weights, results):
+        held = (current or {}).get(result.vault_info.address, 0.0)
+        info = result.vault_info
+        cost_bps = info.entry_cost_bps if weight > held else info.exit_cost_bps
+        amortization = DAYS_PER_YEAR / holding_period_days / 10_000
+        value += abs(weight - held) * cost_bps * amortization
+        value -= weight * result.performance.apy_30d / 100
+    return float(value)
+
+
+class TestOptimizer:
+    """Test cases for the allocation optimizer."""
+
+    def test_risk_neutral_fills_best_vaults_first(self) -> None:
+        """Test that without risk or costs capital goes to the highest APY up to capacity."""
+        results = [
+            _result(0, 4.0, max_deposit_amount=600.0),
+            _result(1, 9.0, max_deposit_amount=300.0),
+            _result(2, 7.0, max_deposit_amount=500.0),
+        ]
+
+        allocation = optimize_allocation(
+            results, np.eye(3) * 1e-6, risk_aversion=0.0, total_amount=1000.0
+        )
+
+        np.testing.assert_allclose(allocation.weights, [0.2, 0.3, 0.5], atol=1e-9)
+        assert allocation.amounts is not None
+        np.testing.assert_allclose(allocation.amounts, [200.0, 300.0, 500.0])
+        assert allocation.expected_return == pytest.approx(7.0)
+        assert allocation.converged
+
+    def test_insufficient_capacity_leaves_capital_undeployed(self) -> None:
+        """Test that weights stop at the vault capacities."""
+        results = [
+            _result(0, 5.0, max_deposit_amount=100.0),
+            _result(1, 6.0, max_deposit_amount=200.0),
+        ]
+
+        allocation = optimize_allocation(results, np.eye(2) * 1e-6, total_amount=1000.0)
+
+        np.testing.assert_allclose(allocation.weights, [0.1, 0.2], atol=1e-9)
+
+    def test_two_vault_closed_form(self) -> None:
+        """Test the interior mean-variance solution of two uncorrelated vaults."""
+        results = [_result(0, 8.0), _result(1, 6.0)]
+        daily_variance = np.array([4e-6, 1e-6])
+        risk_aversion = 20.0
+
+        allocation = optimize_allocation(
+            results, np.diag(daily_variance), risk_aversion=risk_aversion
+        )
+
+        variance = daily_variance * DAYS_PER_YEAR
+        expected = (0.08 - 0.06 + risk_aversion * variance[1]) / (
+            risk_aversion * variance.sum()
+        )
+        assert allocation.weights[0] == pytest.approx(expected, abs=1e-6)
+        assert allocation.weights.sum() == pytest.approx(1.0)
+
+    @pytest.mark.parametrize("risk_aversion", [1.0, 50.0, 1000.0])
+    def test_no_improving_transfer(self, risk_aversion: float) -> None:
+        """Test optimality: no transfer between two vaults lowers the objective."""
+        results, covariance, current = _universe(12, seed=int(risk_aversion))
+
+        allocation = optimize_allocation(
+            results,
+            covariance,
+            risk_aversion=risk_aversion,
+            total_amount=1e7,
+            current_weights=current,
+            max_weight=0.3,
+            tolerance=1e-11,
+            max_iterations=50_000,
+        )
+
+        weights = allocation.weights
+        upper = np.minimum(
+            0.3, [result.vault_info.max_deposit_amount / 1e7 for result in results]
+        )
+        assert weights.sum() == pytest.approx(1.0)
+        assert np.all(weights >= 0) and np.all(weights <= upper + 1e-12)
+        value = _objective(weights, results, covariance, risk_aversion, current)
+        for source in range(len(results)):
+            for target in range(len(results)):
+                amount = min(1e-5, weights[source], upper[target] - weights[target])
+                if source == target or amount <= 1e-12:
+                    continue
+                moved = weights.copy()
+                moved[source] -= amount
+                moved[target] += amount
+                assert (
+                    _objective(moved, results, covariance, risk_aversion, current)
+                    >= value - 1e-13
+                )
+
+    def test_high_costs_keep_current_weights(self) -> None:
+        """Test that switching costs above the yield difference prevent trading."""
+        results = [
+            _result(0, 5.0, entry_cost_bps=500, exit_cost_bps=500),
+            _result(1, 6.0, entry_cost_bps=500, exit_cost_bps=500),
+        ]
+        current = {
+            results[0].vault_info.address: 0.7,
+            results[1].vault_info.address: 0.3,
+        }
+
+        allocation = optimize_allocation(
+            results, np.eye(2) * 1e-7, risk_aversion=0.0, current_weights=current
+        )
+
+        np.testing.assert_allclose(allocation.weights, [0.7, 0.3], atol=1e-9)
+        assert allocation.cost == 0.0
+
+    def test_warm_start(self) -> None:
+        """Test that a warm start reaches the cold solution in fewer iterations."""
+        results, covariance, _ = _universe(200, seed=3)
+        first = optimize_allocation(results, covariance, total_amount=3e7)
+
+        # A day later yields and risk moved slightly
+        rng = np.random.default_rng(4)
+        updated = [
+            result.model_copy(
+                update={
+                    "performance": result.performance.model_copy(
+                        update={
+                            "apy_30d": result.performance.apy_30d + rng.normal(0, 0.05)
+                        }
+                    )
+                }
+            )
+            for result in results
+        ]
+        covariance = covariance * 1.01
+        cold = optimize_allocation(
+            updated, covariance, total_amount=3e7, current_weights=first.to_dict()
+        )
+        warm = optimize_allocation(
+            updated,
+            covariance,
+            total_amount=3e7,
+            current_weights=first.to_dict(),
+            warm_start=first,
+        )
+
+        assert warm.converged
+        assert warm.iterations < cold.iterations
+        np.testing.assert_allclose(warm.weights, cold.weights, atol=1e-5)
+
+    def test_return_covariance_input(self) -> None:
+        """Test that a ReturnCovariance is matched to the results by address."""
+        results = [_result(0, 8.0), _result(1, 6.0)]
+        addresses = [result.vault_info.address for result in results]
+        matrix = np.diag([1e-6, 4e-6])
+        estimate = ReturnCovariance(
+            addresses=addresses[::-1],
+            covariance=matrix,
+            correlation=np.eye(2),
+            observations=np.full((2, 2), 90),
+            halflife_days=None,
+            shrinkage=0.0,
+        )
+
+        from_estimate = optimize_allocation(results, estimate, risk_aversion=20.0)
+        from_matrix = optimize_allocation(
+            results, matrix[::-1, ::-1], risk_aversion=20.0
+        )
+
+        np.testing.assert_allclose(from_estimate.weights, from_matrix.weights)
+        with pytest.raises(DataError, match="No covariance"):
+            optimize_allocation(results + [_result(2, 5.0)], estimate)
+
+    def test_gapped_covariance_is_made_positive_semidefinite(self) -> None:
+        """Test that a gapped estimate is projected onto the nearest PSD matrix."""
+        rng = np.random.default_rng(0)
+        returns = rng.normal(0, 0.002, 120) + rng.normal(0, 0.0005, (6, 120))
+        # Vaults 0 and 1 never overlap, so their covariance is unknown
+        returns[0, :60] = np.nan
+        returns[1, 60:] = np.nan
+        returns[2, ::3] = np.nan
+        results = [_result(index, 5.0 + index) for index in range(6)]
+        estimate = covariance_from_returns(
+            returns,
+            [result.vault_info.address for result in results],
+            min_periods=10,
+        )
+        filled = np.nan_to_num(estimate.covariance)
+        eigenvalues, eigenvectors = np.linalg.eigh(filled)
+        assert eigenvalues[0] < 0
+        projected = (eigenvectors * np.maximum(eigenvalues, 0.0)) @ eigenvectors.T
+
+        allocation = optimize_allocation(results, estimate, risk_aversion=1000.0)
+
+        expected = optimize_allocation(results, projected, risk_aversion=1000.0)
+        assert allocation.converged
+        np.testing.assert_allclose(allocation.weights, expected.weights, atol=1e-6)
+        weights = allocation.weights
+        assert allocation.volatility == pytest.approx(
+            100 * np.sqrt(weights @ projected @ weights * DAYS_PER_YEAR)
+        )
+
+    def test_maximize_sharpe_allocation(self) -> None:
+        """Test that the best frontier point by net Sharpe ratio is returned."""
+        results, covariance, _ = _universe(20, seed=5)
+        risk_aversions = [3000.0, 300.0, 30.0]
+
+        best = maximize_sharpe_allocation(
+            results, covariance, total_amount=1e7, risk_aversions=risk_aversions
+        )
+
+        frontier = [
+            optimize_allocation(
+                results, covariance, risk_aversion=risk_aversion, total_amount=1e7
+            )
+            for risk_aversion in risk_aversions
+        ]
+        assert best.sharpe_ratio == pytest.approx(
+            max(allocation.sharpe_ratio for allocation in frontier), rel=1e-4
+        )
+        expected_sharpe = (
+            best.expected_return - best.cost - 100 * 0.05
+        ) / best.volatility
+        assert best.sharpe_ratio == pytest.approx(expected_sharpe)
+
+    def test_invalid_arguments(self) -> None:
+        """Test that invalid settings are rejected."""
+        results = [_result(0, 5.0), _result(1, 6.0)]
+        covariance = np.eye(2) * 1e-6
+        with pytest.raises(ConfigurationError, match="risk_aversion"):
+            optimize_allocation(results, covariance, risk_aversion=-1.0)
+        with pytest.raises(ConfigurationError, match="max_weight"):
+            optimize_allocation(results, covariance, max_weight=0.0)
+        with pytest.raises(ConfigurationError, match="total_amount"):
+            optimize_allocation(results, covariance, total_amount=0.0)
+        with pytest.raises(ConfigurationError, match="return metric"):
+            optimize_allocation(results, covariance, return_metric="apy_1d")
+        with pytest.raises(DataError, match="without a variance"):
+            optimize_allocation(results, np.array([[np.nan, 0.0], [0.0, 1e-6]]))
+        with pytest.raises(DataError, match="one row per vault"):
+            optimize_allocation(results, np.eye(3))
+        with pytest.raises(DataError):
+            optimize_allocation([], np.empty((0, 0)))
@@ -0,0 +1,78 @@
+"""
+Tests for the parallel analysis module.
+"""
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from yield_analysis_sdk.batch import analyze_yield_batch, pack_share_price_histories
+from yield_analysis_sdk.exceptions import DataError
+from yield_analysis_sdk.parallel import (
+    analyze_yield_parallel,
+    compute_performance_parallel,
+)
+from yield_analysis_sdk.type import SharePriceHistory
+
+
+def _histories(count: int) -> list:
+    rng = random.Random(11)
+    histories = []
+    for index in range(count):
+        price = 1.0
+        points = []
+        for day in range(rng.randint(2, 120)):
+            price *= 1 + rng.uniform(-0.01, 0.011)
+            points.append((1640995200 + day * 86400, price))
+        histories.append(
+            SharePriceHistory(
+                name=f"Vault {index}", address=f"0x{index:040x}", price_history=points
+            )
+        )
+    return histories
+
+
+class TestParallel:
+    """Test cases for parallel analysis."""
+
+    def test_analyze_yield_parallel_matches_batch(self) -> None:
+        """Test that results equal the single-process batch and keep input order."""
+        histories = _histories(50)
+
+        results = analyze_yield_parallel(histories, max_workers=2, chunk_size=7)
+
+        assert results == analyze_yield_batch(histories)
+
+    def test_compute_performance_parallel_with_executor(self) -> None:
+        """Test reusing a caller-owned process pool."""
+        prices, lengths = pack_share_price_histories(_histories(20))
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            first = compute_performance_parallel(
+                prices, chunk_size=3, executor=executor
+            )
+            second = compute_performance_parallel(
+                prices, chunk_size=5, executor=executor
+            )
+
+        assert first.analysis_period_days.tolist() == lengths.tolist()
+        for expected, actual in zip(first, second):
+            np.testing.assert_array_equal(actual, expected)
+
+    def test_compute_performance_parallel_rejects_one_dimensional_prices(
+        self,
+    ) -> None:
+        """Test that a flat price array raises DataError before any row check."""
+        with pytest.raises(DataError, match="two-dimensional"):
+            compute_performance_parallel(np.array([1.0, 1.1, 1.2]))
+
+    def test_small_batches_run_inline(self) -> None:
+        """Test that batches within one chunk skip the process pool."""
+        histories = _histories(3)
+
+        assert analyze_yield_parallel(histories, max_workers=4) == analyze_yield_batch(
+            histories
+        )
+        assert analyze_yield_parallel([]) == []
@@ -0,0 +1,153 @@
+"""
+Tests for the planner module.
+"""
+
+import asyncio
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+
+from tests.test_subgraph import VAULT_A, VAULT_B, FakeSubgraph
+from yield_analysis_sdk.async_subgraph import AsyncSubgraphClient
+from yield_analysis_sdk.exceptions import ConfigurationError
+from yield_analysis_sdk.planner import (
+    get_share_price_histories_for_request,
+    get_share_price_histories_for_request_async,
+    plan_analysis_request,
+)
+from yield_analysis_sdk.subgraph import SUBGRAPH_QUERY_URLS, set_subgraph_url
+from yield_analysis_sdk.type import AnalysisRequest, Chain, Strategy
+
+VAULT_C = "0x" + "c" * 40
+
+
+class FakeMultiChainSubgraph:
+    """Routes queries to one FakeSubgraph per chain."""
+
+    def __init__(self, fakes: Dict[Chain, FakeSubgraph]):
+        self.fakes = fakes
+        self.chains: List[Chain] = []
+
+    def __call__(
+        self,
+        chain: Chain,
+        query: str,
+        variables: Dict[str, Any],
+        api_key: str,
+        client: Any = None,
+    ) -> Dict[str, Any]:
+        self.chains.append(chain)
+        return self.fakes[chain](chain, query, variables, api_key, client)
+
+
+def _request() -> AnalysisRequest:
+    return AnalysisRequest(
+        strategies=[
+            Strategy(chainId=42161, address=VAULT_B),
+            Strategy(chainId=8453, address=VAULT_A.upper().replace("0X", "0x")),
+            Strategy(chainId=8453, address=VAULT_C),
+            Strategy(chainId=42161, address=VAULT_A),
+        ]
+    )
+
+
+class TestPlanner:
+    """Test cases for mixed-chain request planning."""
+
+    def test_registry_covers_every_chain(self) -> None:
+        """Test that every chain has a registry entry."""
+        assert set(SUBGRAPH_QUERY_URLS) == set(Chain)
+
+    def test_strategy_chain(self) -> None:
+        """Test that chain ids map to chains and unknown ids to OTHER."""
+        assert Strategy(chainId=8453, address=VAULT_A).chain == Chain.BASE
+        assert Strategy(chainId=999999, address=VAULT_A).chain == Chain.OTHER
+
+    def test_plan_groups_by_chain(self) -> None:
+        """Test that strategies are grouped per chain in order of first appearance."""
+        request = _request()
+        request.strategies.append(Strategy(chainId=8453, address=VAULT_C))
+
+        assert plan_analysis_request(request) == {
+            Chain.ARBITRUM: [VAULT_B, VAULT_A],
+            Chain.BASE: [VAULT_A, VAULT_C],
+        }
+
+    def test_plan_rejects_unconfigured_chains(self) -> None:
+        """Test that every chain without a subgraph is reported at once."""
+        request = AnalysisRequest(
+            strategies=[
+                Strategy(chainId=1, address=VAULT_A),
+                Strategy(chainId=8453, address=VAULT_A),
+                Strategy(chainId=10, address=VAULT_B),
+            ]
+        )
+
+        with pytest.raises(ConfigurationError, match="chains: ethereum, optimism"):
+            plan_analysis_request(request)
+
+    def test_set_subgraph_url(self) -> None:
+        """Test that registering an endpoint makes a chain plannable."""
+        request = AnalysisRequest(strategies=[Strategy(chainId=1, address=VAULT_A)])
+        set_subgraph_url(Chain.ETHEREUM, "https://example.com/subgraph")
+        try:
+            assert plan_analysis_request(request) == {Chain.ETHEREUM: [VAULT_A]}
+        finally:
+            set_subgraph_url(Chain.ETHEREUM, None)
+
+    def test_fetch_merges_in_request_order(self) -> None:
+        """Test one batched query per chain and results in request order."""
+        fake = FakeMultiChainSubgraph(
+            {
+                Chain.BASE: FakeSubgraph({VAULT_A: 5}),
+                Chain.ARBITRUM: FakeSubgraph({VAULT_A: 3, VAULT_B: 4}),
+            }
+        )
+
+        with patch("yield_analysis_sdk.subgraph._send_graphql_query_to_subgraph", fake):
+            results = get_share_price_histories_for_request(
+                _request(), 6, 10, "test_api_key"
+            )
+
+        # VAULT_C has no data on Base and is skipped
+        assert [(chain, history.address) for chain, history in results] == [
+            (Chain.ARBITRUM, VAULT_B),
+            (Chain.BASE, VAULT_A),
+            (Chain.ARBITRUM, VAULT_A),
+        ]
+        assert [len(history.price_history) for _, history in results] == [4, 5, 3]
+        assert sorted(fake.chains) == [Chain.ARBITRUM, Chain.BASE]
+
+    def test_fetch_requires_api_key(self) -> None:
+        """Test that fetching without an API key fails early."""
+        with pytest.raises(ConfigurationError, match="SUBGRAPH_API_KEY"):
+            get_share_price_histories_for_request(_request(), 6, 10, "")
+
+    def test_fetch_async_merges_in_request_order(self) -> None:
+        """Test that the async planner queries both chains and keeps request order."""
+        httpx = pytest.importorskip("httpx")
+        from tests.test_async_subgraph import FakeGateway
+
+        gateway = FakeGateway()
+
+        async def run() -> Any:
+            async with AsyncSubgraphClient(
+                transport=httpx.MockTransport(gateway)
+            ) as client:
+                return await get_share_price_histories_for_request_async(
+                    _request(), 6, 2, "test_api_key", client=client
+                )
+
+        results = asyncio.run(run())
+
+        assert [(chain, history.address) for chain, history in results] == [
+            (Chain.ARBITRUM, VAULT_B),
+            (Chain.BASE, VAULT_A),
+            (Chain.BASE, VAULT_C),
+            (Chain.ARBITRUM, VAULT_A),
+        ]
+        assert set(gateway.urls) == {
+            SUBGRAPH_QUERY_URLS[Chain.BASE],
+            SUBGRAPH_QUERY_URLS[Chain.ARBITRUM],
+        }
@@ -0,0 +1,117 @@
+"""
+Tests for the rolling analytics module.
+"""
+
+import numpy as np
+import pytest
+
+from tests.helpers import START_TIMESTAMP, HistoryFactory, PricesFactory
+from yield_analysis_sdk.analysis import analyze_yield_with_daily_share_price
+from yield_analysis_sdk.exceptions import ConfigurationError, DataError
+from yield_analysis_sdk.rolling import (
+    analyze_rolling_performance,
+    analyze_rolling_performance_batch,
+)
+from yield_analysis_sdk.type import CompactSharePriceHistory
+
+
+class TestRolling:
+    """Test cases for rolling performance series."""
+
+    @pytest.mark.parametrize("with_zero_price", [False, True])
+    def test_matches_analysis_of_every_prefix(
+        self,
+        with_zero_price: bool,
+        make_history: HistoryFactory,
+        random_prices: PricesFactory,
+    ) -> None:
+        """Test that entry i equals the point-in-time analysis of the first i + 1 prices."""
+        prices = random_prices(150, 7)
+        if with_zero_price:
+            prices[60] = 0.0
+        history = make_history(prices)
+
+        rolling = analyze_rolling_performance(history, risk_free_rate=0.03)
+
+        for end in range(2, len(prices) + 1):
+            expected = analyze_yield_with_daily_share_price(
+                make_history(prices[:end]), risk_free_rate=0.03
+            )
+            i = end - 1
+            assert rolling.apy_7d[i] == pytest.approx(expected.apy_7d, abs=1e-9)
+            assert rolling.apy_30d[i] == pytest.approx(expected.apy_30d, abs=1e-9)
+            assert rolling.apy_90d[i] == pytest.approx(expected.apy_90d, abs=1e-9)
+            assert rolling.volatility_30d[i] == pytest.approx(
+                expected.volatility_30d, rel=1e-9, abs=1e-9
+            )
+            assert rolling.max_drawdown[i] == pytest.approx(
+                expected.max_drawdown, abs=1e-9
+            )
+            assert rolling.sharpe_ratio[i] == pytest.approx(
+                expected.sharpe_ratio, rel=1e-9, abs=1e-9
+            )
+
+    def test_unsorted_compact_history(
+        self, make_history: HistoryFactory, random_prices: PricesFactory
+    ) -> None:
+        """Test that compact histories are ordered by timestamp first."""
+        prices = random_prices(40, 7)
+        timestamps = np.arange(len(prices), dtype=np.int64) * 86400 + START_TIMESTAMP
+        order = np.random.default_rng(1).permutation(len(prices))
+        compact = CompactSharePriceHistory(
+            name="Test Vault",
+            address="0x1234567890abcdef1234567890abcdef12345678",
+            timestamps=timestamps[order],
+            prices=np.array(prices)[order],
+        )
+
+        rolling = analyze_rolling_performance(compact)
+        expected = analyze_rolling_performance(make_history(prices))
+
+        assert rolling.timestamps.tolist() == timestamps.tolist()
+        for column, expected_column in zip(rolling, expected):
+            np.testing.assert_allclose(column, expected_column)
+
+    def test_drawdown_series(self, make_history: HistoryFactory) -> None:
+        """Test the current drawdown and its running maximum."""
+        rolling = analyze_rolling_performance(make_history([1.0, 0.8, 0.9, 1.2, 1.08]))
+
+        np.testing.assert_allclose(rolling.drawdown, [0.0, 20.0, 10.0, 0.0, 10.0])
+        np.testing.assert_allclose(rolling.max_drawdown, [0.0, 20.0, 20.0, 20.0, 20.0])
+
+    def test_windowed_sharpe_ratio(
+        self, make_history: HistoryFactory, random_prices: PricesFactory
+    ) -> None:
+        """Test that a Sharpe window only uses the trailing returns."""
+        prices = random_prices(60, 7)
+        rolling = analyze_rolling_performance(make_history(prices), sharpe_window=20)
+
+        assert np.all(rolling.sharpe_ratio[:20] == 0.0)
+        for end in (21, 45, 60):
+            expected = analyze_yield_with_daily_share_price(
+                make_history(prices[end - 21 : end])
+            )
+            assert rolling.sharpe_ratio[end - 1] == pytest.approx(
+                expected.sharpe_ratio, rel=1e-9
+            )
+
+    def test_batch(
+        self, make_history: HistoryFactory, random_prices: PricesFactory
+    ) -> None:
+        """Test that the batch helper returns one series per history in order."""
+        histories = [make_history(random_prices(10, seed)) for seed in range(3)]
+
+        results = analyze_rolling_performance_batch(histories)
+
+        assert len(results) == 3
+        np.testing.assert_allclose(
+            results[2].max_drawdown,
+            analyze_rolling_performance(histories[2]).max_drawdown,
+        )
+
+    def test_invalid_input(self, make_history: HistoryFactory) -> None:
+        """Test that short histories and tiny Sharpe windows are rejected."""
+        with pytest.raises(DataError, match="At least 2"):
+            analyze_rolling_performance(make_history([1.0]))
+        with pytest.raises(ConfigurationError, match="sharpe_window"):
+            analyze_rolling_performance(make_history([1.0, 1.1]), sharpe_window=1)
@@ -0,0 +1,103 @@
+"""
+Tests for the store module.
+"""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from tests.test_subgraph import VAULT_A, VAULT_B, FakeSubgraph
+from yield_analysis_sdk.store import SharePriceStore, sync_daily_share_price_history
+from yield_analysis_sdk.type import Chain, SharePriceHistory
+
+
+class TestStore:
+    """Test cases for the share price store."""
+
+    def test_save_and_load(self, tmp_path: Path) -> None:
+        """Test that saved histories round-trip through the database file."""
+        history = SharePriceHistory(
+            name="Test Vault",
+            address=VAULT_A,
+            price_history=[(1640995200 + 86400, 1.01), (1640995200, 1.0)],
+        )
+
+        with SharePriceStore(tmp_path / "prices.db") as store:
+            store.save(Chain.BASE, [history])
+
+        with SharePriceStore(tmp_path / "prices.db") as store:
+            loaded = store.load(Chain.BASE, [VAULT_B, VAULT_A.upper()[2:]])
+            latest = store.load(Chain.BASE, [VAULT_A], length=1)
+            other_chain = store.load(Chain.ARBITRUM, [VAULT_A])
+            marks = store.high_water_marks(Chain.BASE, [VAULT_A, VAULT_B])
+
+        assert len(loaded) == 1
+        assert loaded[0].name == "Test Vault"
+        assert loaded[0].price_history == [
+            (1640995200, 1.0),
+            (1640995200 + 86400, 1.01),
+        ]
+        assert latest[0].price_history == [(1640995200 + 86400, 1.01)]
+        assert other_chain == []
+        assert marks == {VAULT_A: 1640995200 + 86400}
+
+    def test_incremental_sync(self) -> None:
+        """Test that a second sync only fetches prices newer than the stored ones."""
+        fake = FakeSubgraph({VAULT_A: 20, VAULT_B: 5})
+        store = SharePriceStore(":memory:")
+
+        with patch("yield_analysis_sdk.subgraph._send_graphql_query_to_subgraph", fake):
+            first = sync_daily_share_price_history(
+                store, Chain.BASE, [VAULT_A], 6, 10, "test_api_key"
+            )
+            fake.stats[VAULT_A].append(
+                {
+                    "timestamp": str((1640995200 + 20 * 86400) * 1000000),
+                    "pricePerShare": "2.0",
+                    "vault": {"address": VAULT_A, "name": VAULT_A, "decimals": "6"},
+                }
+            )
+            second = sync_daily_share_price_history(
+                store, Chain.BASE, [VAULT_A, VAULT_B], 6, 10, "test_api_key"
+            )
+
+        assert len(first[0].price_history) == 10
+        assert "s0" in fake.calls[1]
+        assert "s1" not in fake.calls[1]
+        assert len(second[0].price_history) == 10
+        assert second[0].price_history[-1] == (1640995200 + 20 * 86400, 2.0)
+        assert len(second[1].price_history) == 5
+
+    def test_longer_window_backfills_older_prices(self) -> None:
+        """Test that asking for more days than stored fetches the older ones once."""
+        fake = FakeSubgraph({VAULT_A: 30, VAULT_B: 8})
+        store = SharePriceStore(":memory:")
+
+        with patch("yield_analysis_sdk.subgraph._send_graphql_query_to_subgraph", fake):
+            sync_daily_share_price_history(
+                store, Chain.BASE, [VAULT_A, VAULT_B], 6, 10, "test_api_key"
+            )
+            longer = sync_daily_share_price_history(
+                store, Chain.BASE, [VAULT_A, VAULT_B], 6, 25, "test_api_key"
+            )
+            calls = len(fake.calls)
+            again = sync_daily_share_price_history(
+                store, Chain.BASE, [VAULT_A, VAULT_B], 6, 25, "test_api_key"
+            )
+
+        expected = [
+            (1640995200 + day * 86400, pytest.approx(1.0 + day * 0.001))
+            for day in range(5, 30)
+        ]
+        assert longer[0].price_history == expected
+        assert len(longer[1].price_history) == 8
+        # The backfill only asked for days older than the stored ones
+        assert "c0" in fake.calls[calls - 1]
+        assert "s0" not in fake.calls[calls - 1]
+        assert again == longer
+        # Nothing was missing any more, so only the forward sync was sent
+        assert len(fake.calls) == calls + 1
+        ranges = store.stored_ranges(Chain.BASE, [VAULT_A, VAULT_B])
+        assert ranges[VAULT_A].days == 25 and not ranges[VAULT_A].complete
+        assert ranges[VAULT_B].complete
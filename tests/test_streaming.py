@@ -0,0 +1,166 @@
+"""
+Tests for the streaming module.
+"""
+
+import io
+import json
+from typing import Any, Dict, Optional
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+from urllib3.exceptions import ProtocolError
+
+pytest.importorskip("ijson")
+
+from tests.test_subgraph import VAULT_A, VAULT_B, FakeSubgraph
+from yield_analysis_sdk.exceptions import ConnectionError
+from yield_analysis_sdk.streaming import (
+    VaultStatsParser,
+    get_daily_share_price_history_streaming,
+    parse_vault_stats_response,
+)
+from yield_analysis_sdk.subgraph import (
+    RequestScheduler,
+    SubgraphClient,
+    get_daily_share_price_history_from_subgraph,
+)
+from yield_analysis_sdk.type import Chain
+
+
+def _body(document: Any) -> io.BytesIO:
+    return io.BytesIO(json.dumps(document).encode())
+
+
+def _streaming(fake: FakeSubgraph) -> Any:
+    """Serve FakeSubgraph responses as response bodies to the streaming parser."""
+
+    def stream(
+        chain: Chain,
+        query: str,
+        variables: Dict[str, Any],
+        api_key: str,
+        parser: VaultStatsParser,
+        client: Optional[SubgraphClient] = None,
+    ) -> Any:
+        return parser.feed(_body(fake(chain, query, variables, api_key)))
+
+    return stream
+
+
+class TestStreaming:
+    """Test cases for streaming response parsing."""
+
+    def test_parse_vault_stats_collection(self) -> None:
+        """Test parsing a multi-vault vaultStats_collection response."""
+        document = {
+            "data": {
+                "vaultStats_collection": [
+                    {
+                        "timestamp": "1641081600000000",
+                        "pricePerShare": "1.5",
+                        "vault": {"address": VAULT_A, "name": "A", "decimals": "18"},
+                    },
+                    {
+                        "timestamp": "1641081600000000",
+                        "pricePerShare": "2.0",
+                        "vault": {"address": VAULT_B, "name": "B", "decimals": "6"},
+                    },
+                    {
+                        "timestamp": "1640995200000000",
+                        "pricePerShare": "1.0",
+                        "vault": {"address": VAULT_A, "name": "A", "decimals": "18"},
+                    },
+                ]
+            }
+        }
+
+        histories = parse_vault_stats_response(_body(document), 6)
+
+        assert [history.address for history in histories] == [VAULT_A, VAULT_B]
+        assert histories[0].name == "A"
+        assert histories[0].timestamps.tolist() == [1640995200, 1641081600]
+        assert histories[0].prices.tolist() == [1e12, 1.5e12]
+        assert histories[1].price_history == [(1641081600, 2.0)]
+
+    def test_parse_graphql_errors(self) -> None:
+        """Test that GraphQL errors raise ConnectionError."""
+        document = {"errors": [{"message": "bad query"}], "data": None}
+
+        with pytest.raises(ConnectionError, match="bad query"):
+            parse_vault_stats_response(_body(document), 6)
+
+    def test_parse_invalid_json(self) -> None:
+        """Test that truncated bodies raise ConnectionError."""
+        with pytest.raises(ConnectionError, match="Invalid JSON"):
+            parse_vault_stats_response(io.BytesIO(b'{"data": {"v0": [{"ti'), 6)
+
+    def test_matches_non_streaming_fetch(self) -> None:
+        """Test that the streaming fetch paginates like the decoded path."""
+        fake = FakeSubgraph({VAULT_A: 25, VAULT_B: 7})
+
+        with patch(
+            "yield_analysis_sdk.streaming._stream_graphql_query_to_subgraph",
+            _streaming(fake),
+        ):
+            streamed = get_daily_share_price_history_streaming(
+                Chain.BASE, [VAULT_B, VAULT_A], 6, 20, "test_api_key", page_size=8
+            )
+        with patch("yield_analysis_sdk.subgraph._send_graphql_query_to_subgraph", fake):
+            decoded = get_daily_share_price_history_from_subgraph(
+                Chain.BASE, [VAULT_B, VAULT_A], 6, 20, "test_api_key", page_size=8
+            )
+
+        assert [history.address for history in streamed] == [VAULT_B, VAULT_A]
+        for compact, history in zip(streamed, decoded):
+            assert compact.price_history == history.price_history
+        assert len(streamed[1].timestamps) == 20
+        assert np.all(np.diff(streamed[1].timestamps) > 0)
+
+    def test_client_query_stream(self) -> None:
+        """Test that query_stream retries and hands the raw body to the consumer."""
+        client = SubgraphClient(scheduler=RequestScheduler(jitter=lambda: 0.0))
+        response = Mock(status_code=200)
+        response.raw = _body({"data": {"v0": []}})
+        responses = [Mock(status_code=503, text="busy", headers={}), response]
+
+        with patch.object(client.session, "post", side_effect=responses) as post:
+            with patch("yield_analysis_sdk.subgraph.time.sleep"):
+                result = client.query_stream(
+                    Chain.BASE, "query {}", {}, "test_api_key", lambda raw: raw.read()
+                )
+
+        assert result == b'{"data": {"v0": []}}'
+        assert post.call_args.kwargs["stream"] is True
+        response.close.assert_called_once()
+
+    def test_client_query_stream_http_error(self) -> None:
+        """Test that non-retryable HTTP errors raise ConnectionError."""
+        client = SubgraphClient()
+        response = Mock(status_code=400, text="bad request", headers={})
+
+        with patch.object(client.session, "post", return_value=response):
+            with pytest.raises(ConnectionError, match="HTTP Error 400"):
+                client.query_stream(
+                    Chain.BASE, "query {}", {}, "test_api_key", lambda raw: None
+                )
+
+    def test_client_query_stream_broken_body(self) -> None:
+        """Test that a connection breaking mid-body raises ConnectionError."""
+        client = SubgraphClient()
+        response = Mock(status_code=200)
+        response.raw.read.side_effect = ProtocolError("Connection broken")
+
+        with patch.object(client.session, "post", return_value=response) as post:
+            with pytest.raises(ConnectionError, match="Connection broken"):
+                client.query_stream(
+                    Chain.BASE,
+                    "query {}",
+                    {},
+                    "test_api_key",
+                    lambda raw: raw.read(),
+                )
+
+        # Part of the body may already have been consumed, so it is not retried
+        assert post.call_count == 1
+        response.close.assert_called_once()
@@ -2,18 +2,77 @@
 Tests for the subgraph module.
 """
 
-from typing import Any, Dict
+import re
+from typing import Any, Dict, List
 from unittest.mock import Mock, patch
 
 import pytest
+from requests.exceptions import ConnectTimeout
 
+from yield_analysis_sdk.exceptions import (
+    CircuitOpenError,
+    ConfigurationError,
+    ConnectionError,
+    RateLimitError,
+)
 from yield_analysis_sdk.subgraph import (
+    SUBGRAPH_QUERY_URLS,
+    RequestScheduler,
+    SubgraphClient,
     _format_price_history_response,
     _format_vault_addresses,
+    _parse_retry_after,
+    _PriceHistoryPaginator,
+    _send_graphql_query_to_subgraph,
     get_daily_share_price_history_from_subgraph,
 )
 from yield_analysis_sdk.type import Chain, SharePriceHistory
 
+VAULT_A = "0x1234567890abcdef1234567890abcdef12345678"
+VAULT_B = "0xabcdef1234567890abcdef1234567890abcdef12"
+
+
+class FakeSubgraph:
+    """In-memory stand-in for the paginated vaultStats_collection endpoint."""
+
+    def __init__(self, days_by_vault: Dict[str, int], start: int = 1640995200):
+        self.stats = {
+            address: [
+                {
+                    "timestamp": str((start + day * 86400) * 1000000),
+                    "pricePerShare": str(1.0 + day * 0.001),
+                    "vault": {"address": address, "name": address, "decimals": "6"},
+                }
+                for day in range(days)
+            ]
+            for address, days in days_by_vault.items()
+        }
+        self.calls: List[Dict[str, Any]] = []
+
+    def __call__(
+        self,
+        chain: Chain,
+        query: str,
+        variables: Dict[str, Any],
+        api_key: str,
+        client: Any = None,
+    ) -> Dict[str, Any]:
+        self.calls.append(variables)
+        data = {}
+        for alias in [name for name in variables if name.startswith("v")]:
+            index = alias[1:]
+            first = int(re.search(rf"{alias}: .*?first: (\d+)", query, re.S).group(1))
+            cursor = variables.get(f"c{index}")
+            since = variables.get(f"s{index}")
+            rows = [
+                row
+                for row in reversed(self.stats.get(variables[alias], []))
+                if (cursor is None or int(row["timestamp"]) < int(cursor))
+                and (since is None or int(row["timestamp"]) > int(since))
+            ]
+            data[alias] = rows[:first]
+        return {"data": data}
+
 
 class TestSubgraph:
     """Test cases for subgraph functionality."""
@@ -66,6 +125,8 @@ class TestSubgraph:
         assert result[0].name == "Test Vault"
         assert result[0].address == "0x1234567890abcdef1234567890abcdef12345678"
         assert len(result[0].price_history) == 2
+        assert result[0].price_history[0][0] == 1640908800
+        assert result[0]._sorted
 
     def test_format_price_history_response_no_data(self) -> None:
         """Test formatting response with no data."""
@@ -82,7 +143,7 @@ class TestSubgraph:
         """Test getting daily share price history."""
         mock_response = {
             "data": {
-                "vaultStats_collection": [
+                "v0": [
                     {
                         "timestamp": "1640995200000000",
                         "pricePerShare": "1.05",
@@ -107,3 +168,342 @@ class TestSubgraph:
         assert result[0].name == "Test Vault"
         assert result[0].address == "0x1234567890abcdef1234567890abcdef12345678"
         mock_send_query.assert_called_once()
+
+    def test_pagination_returns_every_row(self) -> None:
+        """Test that histories longer than a page are stitched together."""
+        fake = FakeSubgraph({VAULT_A: 25, VAULT_B: 12})
+
+        with patch("yield_analysis_sdk.subgraph._send_graphql_query_to_subgraph", fake):
+            result = get_daily_share_price_history_from_subgraph(
+                Chain.BASE, [VAULT_A, VAULT_B], 6, 365, "test_api_key", page_size=10
+            )
+
+        assert [history.address for history in result] == [VAULT_A, VAULT_B]
+        assert len(result[0].price_history) == 25
+        assert len(result[1].price_history) == 12
+        timestamps = [timestamp for timestamp, _ in result[0].price_history]
+        assert timestamps == sorted(timestamps)
+        assert len(set(timestamps)) == 25
+        # 25 rows in pages of 10 need three round trips
+        assert len(fake.calls) == 3
+        # Vault B was complete after two pages and is not queried again
+        assert "v1" not in fake.calls[2]
+
+    def test_pagination_is_bounded_per_vault(self) -> None:
+        """Test that each vault receives at most `length` of its latest days."""
+        fake = FakeSubgraph({VAULT_A: 400, VAULT_B: 3})
+
+        with patch("yield_analysis_sdk.subgraph._send_graphql_query_to_subgraph", fake):
+            result = get_daily_share_price_history_from_subgraph(
+                Chain.BASE, [VAULT_A, VAULT_B], 6, 30, "test_api_key"
+            )
+
+        assert len(result[0].price_history) == 30
+        assert result[0].price_history[-1][0] == 1640995200 + 399 * 86400
+        assert len(result[1].price_history) == 3
+        # Fetched histories are trusted to be in timestamp order
+        assert all(history._sorted for history in result)
+        assert len(fake.calls) == 1
+
+    def test_pagination_chunks_vaults_per_query(self) -> None:
+        """Test that vaults are spread over several queries when requested."""
+        fake = FakeSubgraph({VAULT_A: 5, VAULT_B: 5})
+
+        with patch("yield_analysis_sdk.subgraph._send_graphql_query_to_subgraph", fake):
+            result = get_daily_share_price_history_from_subgraph(
+                Chain.BASE,
+                [VAULT_A, VAULT_B],
+                6,
+                5,
+                "test_api_key",
+                vaults_per_query=1,
+            )
+
+        assert len(result) == 2
+        assert [call["v0"] for call in fake.calls] == [VAULT_A, VAULT_B]
+
+    def test_pagination_since(self) -> None:
+        """Test that only prices newer than `since` are fetched for a vault."""
+        fake = FakeSubgraph({VAULT_A: 10, VAULT_B: 10})
+        since = {VAULT_A: 1640995200 + 7 * 86400}
+
+        with patch("yield_analysis_sdk.subgraph._send_graphql_query_to_subgraph", fake):
+            result = get_daily_share_price_history_from_subgraph(
+                Chain.BASE, [VAULT_A, VAULT_B], 6, 365, "test_api_key", since=since
+            )
+
+        assert [ts for ts, _ in result[0].price_history] == [
+            1640995200 + 8 * 86400,
+            1640995200 + 9 * 86400,
+        ]
+        assert len(result[1].price_history) == 10
+        assert "s1" not in fake.calls[0]
+
+    def test_paginator_repeats_unfed_page(self) -> None:
+        """Test that a page is reissued until its response is fed back."""
+        paginator = _PriceHistoryPaginator([VAULT_A], 10)
+
+        first = paginator.next_query()
+
+        assert first is not None
+        assert paginator.next_query() == first
+
+    def test_paginator_rejects_invalid_page_size(self) -> None:
+        """Test that page sizes above the gateway cap are rejected."""
+        with pytest.raises(ConfigurationError, match="page_size"):
+            _PriceHistoryPaginator([VAULT_A], 10, page_size=5000)
+
+
+class TestSubgraphClient:
+    """Test cases for the pooled subgraph client."""
+
+    def test_query_uses_pooled_session(self) -> None:
+        """Test that queries go through the session with the configured timeouts."""
+        client = SubgraphClient(pool_maxsize=4, connect_timeout=1.0, read_timeout=2.0)
+        response = Mock(status_code=200)
+        response.json.return_value = {"data": {}}
+
+        with patch.object(client.session, "post", return_value=response) as post:
+            result = client.query(Chain.BASE, "query {}", {}, "test_api_key")
+            client.query(Chain.BASE, "query {}", {}, "test_api_key")
+
+        assert result == {"data": {}}
+        assert post.call_count == 2
+        kwargs = post.call_args.kwargs
+        assert kwargs["timeout"] == (1.0, 2.0)
+        assert kwargs["headers"]["Authorization"] == "Bearer test_api_key"
+        assert client.session.headers["Accept-Encoding"] == "gzip, deflate"
+        assert (
+            client.session.get_adapter("https://").poolmanager.connection_pool_kw[
+                "maxsize"
+            ]
+            == 4
+        )
+
+    def test_query_errors(self) -> None:
+        """Test that HTTP, GraphQL and transport errors raise ConnectionError."""
+        client = SubgraphClient(scheduler=RequestScheduler(max_retries=0))
+
+        with patch.object(
+            client.session,
+            "post",
+            return_value=Mock(status_code=500, text="boom", headers={}),
+        ):
+            with pytest.raises(ConnectionError, match="HTTP Error 500"):
+                client.query(Chain.BASE, "query {}", {}, "test_api_key")
+
+        response = Mock(status_code=200)
+        response.json.return_value = {"errors": ["bad query"]}
+        with patch.object(client.session, "post", return_value=response):
+            with pytest.raises(ConnectionError, match="GraphQL errors"):
+                client.query(Chain.BASE, "query {}", {}, "test_api_key")
+
+        with patch.object(client.session, "post", side_effect=ConnectTimeout("slow")):
+            with pytest.raises(ConnectionError, match="Request to subgraph failed"):
+                client.query(Chain.BASE, "query {}", {}, "test_api_key")
+
+    def test_query_unconfigured_chain(self) -> None:
+        """Test that chains without a subgraph raise ConfigurationError."""
+        with SubgraphClient() as client:
+            with pytest.raises(ConfigurationError, match="No subgraph configured"):
+                client.query(Chain.FANTOM, "query {}", {}, "test_api_key")
+
+    def test_send_query_uses_given_client(self) -> None:
+        """Test that callers can route queries through their own client."""
+        client = Mock(spec=SubgraphClient)
+        client.query.return_value = {"data": {}}
+
+        result = _send_graphql_query_to_subgraph(
+            Chain.BASE, "query {}", {}, "test_api_key", client
+        )
+
+        assert result == {"data": {}}
+        client.query.assert_called_once_with(Chain.BASE, "query {}", {}, "test_api_key")
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRequestScheduler:
+    """Test cases for rate limiting, retries and circuit breaking."""
+
+    def test_token_bucket_paces_each_api_key(self) -> None:
+        """Test that requests beyond the burst wait for new tokens, per API key."""
+        clock = FakeClock()
+        scheduler = RequestScheduler(requests_per_second=2, burst=2, clock=clock)
+
+        waits = [scheduler.acquire("key", "url") for _ in range(4)]
+
+        assert waits == [0.0, 0.0, 0.5, 1.0]
+        assert scheduler.acquire("other key", "url") == 0.0
+        clock.now = 10.0
+        assert scheduler.acquire("key", "url") == 0.0
+
+    def test_backoff_is_jittered_and_bounded(self) -> None:
+        """Test exponential backoff with full jitter and the retry budget."""
+        scheduler = RequestScheduler(
+            max_retries=3,
+            backoff_base=1.0,
+            backoff_max=3.0,
+            failure_threshold=10,
+            jitter=lambda: 0.5,
+        )
+
+        delays = [
+            scheduler.record_failure("key", "url", attempt) for attempt in range(4)
+        ]
+
+        assert delays == [0.5, 1.0, 1.5, None]
+
+    def test_retry_after_pauses_the_api_key(self) -> None:
+        """Test that a Retry-After pauses later requests with the same key."""
+        clock = FakeClock()
+        scheduler = RequestScheduler(clock=clock, failure_threshold=1)
+
+        delay = scheduler.record_failure(
+            "key", "url", 0, rate_limited=True, retry_after=3.0
+        )
+
+        assert delay == 0.0
+        assert scheduler.acquire("key", "url") == 3.0
+        assert scheduler.acquire("other key", "url") == 0.0
+
+    def test_circuit_breaker(self) -> None:
+        """Test that an endpoint fails fast while open and recovers after a probe."""
+        clock = FakeClock()
+        scheduler = RequestScheduler(
+            failure_threshold=2, reset_timeout=30.0, clock=clock
+        )
+
+        assert scheduler.record_failure("key", "url", 0) is not None
+        assert scheduler.record_failure("key", "url", 1) is None
+        with pytest.raises(CircuitOpenError, match="Circuit open for url"):
+            scheduler.acquire("key", "url")
+        assert scheduler.acquire("key", "other url") == 0.0
+
+        # A single probe is let through once the reset timeout has passed
+        clock.now = 30.0
+        scheduler.acquire("key", "url")
+        with pytest.raises(CircuitOpenError):
+            scheduler.acquire("key", "url")
+
+        scheduler.record_success("url")
+        assert scheduler.acquire("key", "url") == 0.0
+
+    def test_failed_probe_reopens_circuit(self) -> None:
+        """Test that a failing probe opens the circuit for another timeout."""
+        clock = FakeClock()
+        scheduler = RequestScheduler(
+            failure_threshold=1, reset_timeout=30.0, clock=clock
+        )
+        scheduler.record_failure("key", "url", 0)
+
+        clock.now = 30.0
+        scheduler.acquire("key", "url")
+        assert scheduler.record_failure("key", "url", 0) is None
+
+        clock.now = 59.0
+        with pytest.raises(CircuitOpenError):
+            scheduler.acquire("key", "url")
+
+    def test_released_probe_lets_the_next_request_probe(self) -> None:
+        """Test that a probe abandoned without an outcome does not block the circuit."""
+        clock = FakeClock()
+        scheduler = RequestScheduler(
+            failure_threshold=1, reset_timeout=30.0, clock=clock
+        )
+        scheduler.record_failure("key", "url", 0)
+
+        clock.now = 30.0
+        scheduler.acquire("key", "url")
+        scheduler.release("url")
+
+        assert scheduler.acquire("key", "url") == 0.0
+        with pytest.raises(CircuitOpenError):
+            scheduler.acquire("key", "url")
+
+    def test_probe_timeout(self) -> None:
+        """Test that a probe that never reports back stops blocking after a timeout."""
+        clock = FakeClock()
+        scheduler = RequestScheduler(
+            failure_threshold=1, reset_timeout=30.0, probe_timeout=10.0, clock=clock
+        )
+        scheduler.record_failure("key", "url", 0)
+
+        clock.now = 30.0
+        scheduler.acquire("key", "url")
+        clock.now = 35.0
+        with pytest.raises(CircuitOpenError, match="retry in 5.0s"):
+            scheduler.acquire("key", "url")
+        clock.now = 40.0
+        assert scheduler.acquire("key", "url") == 0.0
+
+    def test_interrupted_probe_is_released(self) -> None:
+        """Test that an exception other than a request error releases the probe."""
+        scheduler = RequestScheduler(failure_threshold=1, reset_timeout=0.0)
+        client = SubgraphClient(scheduler=scheduler)
+        response = Mock(status_code=200)
+        response.json.return_value = {"data": {}}
+        url = SUBGRAPH_QUERY_URLS[Chain.BASE]
+        scheduler.record_failure("test_api_key", url, 0)
+
+        with patch.object(
+            client.session, "post", side_effect=[KeyboardInterrupt(), response]
+        ):
+            with pytest.raises(KeyboardInterrupt):
+                client.query(Chain.BASE, "query {}", {}, "test_api_key")
+            result = client.query(Chain.BASE, "query {}", {}, "test_api_key")
+
+        assert result == {"data": {}}
+
+    def test_parse_retry_after(self) -> None:
+        """Test parsing Retry-After as seconds and as an HTTP date."""
+        assert _parse_retry_after("2") == 2.0
+        assert _parse_retry_after(None) is None
+        assert _parse_retry_after("soon") is None
+        assert _parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+    def test_client_retries_transient_failures(self) -> None:
+        """Test that the client retries 5xx and transport errors until success."""
+        client = SubgraphClient(scheduler=RequestScheduler(jitter=lambda: 0.0))
+        response = Mock(status_code=200)
+        response.json.return_value = {"data": {}}
+        responses = [
+            ConnectTimeout("slow"),
+            Mock(status_code=503, text="busy", headers={}),
+            response,
+        ]
+
+        with patch.object(client.session, "post", side_effect=responses) as post:
+            with patch("yield_analysis_sdk.subgraph.time.sleep") as sleep:
+                result = client.query(Chain.BASE, "query {}", {}, "test_api_key")
+
+        assert result == {"data": {}}
+        assert post.call_count == 3
+        assert [call.args[0] for call in sleep.call_args_list] == [0.0, 0.0]
+
+    def test_client_raises_rate_limit_error(self) -> None:
+        """Test that persistent 429s honor Retry-After and raise RateLimitError."""
+        client = SubgraphClient(scheduler=RequestScheduler(max_retries=2))
+        rate_limited = Mock(
+            status_code=429, text="slow down", headers={"Retry-After": "4"}
+        )
+
+        with patch.object(client.session, "post", return_value=rate_limited) as post:
+            with patch("yield_analysis_sdk.subgraph.time.sleep") as sleep:
+                with pytest.raises(RateLimitError, match="HTTP Error 429"):
+                    client.query(Chain.BASE, "query {}", {}, "test_api_key")
+
+        assert post.call_count == 3
+        # Each retry waits for the Retry-After pause before sending
+        assert [call.args[0] for call in sleep.call_args_list if call.args[0] > 0] == [
+            pytest.approx(4.0, abs=0.1),
+            pytest.approx(4.0, abs=0.1),
+        ]
@@ -3,15 +3,19 @@ Tests for the type module.
 """
 
 import json
+from array import array
 
+import numpy as np
 import pytest
 
+from yield_analysis_sdk.exceptions import ValidationError
 from yield_analysis_sdk.type import (
     AnalysisRequest,
     AnalysisResponse,
     AnalysisResult,
     AuditStatus,
     Chain,
+    CompactSharePriceHistory,
     Contract,
     PerformanceAnalysis,
     RegistrationRequest,
@@ -213,6 +217,247 @@ class TestTypes:
         assert len(price_history.price_history) == 2
         assert price_history.price_history[0] == (1640995200, 1.05)
 
+    def test_construct_trusted(self) -> None:
+        """Test that the trusted factories match validated construction."""
+        values = {
+            "apy_7d": 5.1,
+            "apy_30d": 5.2,
+            "apy_90d": 5.3,
+            "volatility_30d": 1.2,
+            "max_drawdown": 0.4,
+            "sharpe_ratio": 1.7,
+            "analysis_period_days": 90,
+        }
+        vault_values = {
+            "chain": Chain.BASE,
+            "address": "0x1234567890abcdef1234567890abcdef12345678",
+            "name": "Test Vault",
+            "protocol": "Test Protocol",
+            "current_share_price": 1.05,
+            "last_updated_timestamp": 1640995200,
+        }
+        expected = AnalysisResult(
+            vault_info=VaultInfo(**vault_values, exit_cost_bps=5),
+            performance=PerformanceAnalysis(**values),
+        )
+
+        trusted = AnalysisResult.construct_trusted(
+            vault_info=VaultInfo.construct_trusted(**vault_values, exit_cost_bps=5),
+            performance=PerformanceAnalysis.construct_trusted(**values),
+        )
+
+        assert trusted == expected
+        assert trusted.vault_info.max_deposit_amount == 1_000_000_000_000.00
+        assert trusted.model_dump_json() == expected.model_dump_json()
+
+    def test_construct_trusted_matches_model_construct(self) -> None:
+        """Test that the trusted factories set the same instance state as pydantic."""
+        performance = PerformanceAnalysis.construct_trusted(
+            apy_7d=5.1,
+            apy_30d=5.2,
+            apy_90d=5.3,
+            volatility_30d=1.2,
+            max_drawdown=0.4,
+            sharpe_ratio=1.7,
+            analysis_period_days=90,
+            var_95=-0.3,
+        )
+        vault_info = VaultInfo.construct_trusted(
+            chain=Chain.BASE,
+            address="0x1234567890abcdef1234567890abcdef12345678",
+            name="Test Vault",
+            protocol="Test Protocol",
+            current_share_price=1.05,
+            last_updated_timestamp=1640995200,
+        )
+        result = AnalysisResult.construct_trusted(
+            vault_info=vault_info, performance=performance
+        )
+
+        for trusted in (performance, vault_info, result):
+            constructed = type(trusted).model_construct(
+                trusted.model_fields_set, **trusted.__dict__
+            )
+            assert trusted.__dict__ == constructed.__dict__
+            assert trusted.model_fields_set == constructed.model_fields_set
+            assert trusted.model_extra == constructed.model_extra
+            assert trusted.__pydantic_private__ == constructed.__pydantic_private__
+            assert trusted.model_copy(update={}) == trusted
+
+    def test_performance_analysis_optional_metrics(self) -> None:
+        """Test the optional tail risk metrics of PerformanceAnalysis."""
+        values = {
+            "apy_7d": 5.1,
+            "apy_30d": 5.2,
+            "apy_90d": 5.3,
+            "volatility_30d": 1.2,
+            "max_drawdown": 0.4,
+            "sharpe_ratio": 1.7,
+            "analysis_period_days": 90,
+        }
+
+        plain = PerformanceAnalysis.construct_trusted(**values)
+        expected = PerformanceAnalysis(**values, var_95=-0.3, apy_trend_30d=0.2)
+        trusted = PerformanceAnalysis.construct_trusted(
+            **values, var_95=-0.3, apy_trend_30d=0.2
+        )
+
+        assert plain == PerformanceAnalysis(**values)
+        assert plain.cvar_99 is None
+        assert trusted == expected
+        assert trusted.model_fields_set == expected.model_fields_set
+        assert trusted.model_dump_json() == expected.model_dump_json()
+        with pytest.raises(TypeError, match="var_90"):
+            PerformanceAnalysis.construct_trusted(**values, var_90=-0.1)
+
+    def test_performance_analysis_omits_missing_optional_metrics(self) -> None:
+        """Test that optional metrics that were not computed are not serialized."""
+        values = {
+            "apy_7d": 5.1,
+            "apy_30d": 5.2,
+            "apy_90d": 5.3,
+            "volatility_30d": 1.2,
+            "max_drawdown": 0.4,
+            "sharpe_ratio": 1.7,
+            "analysis_period_days": 90,
+        }
+        plain = PerformanceAnalysis(**values)
+        extended = PerformanceAnalysis(**values, var_95=-0.3)
+
+        # The wire format of analyses without the optional metrics is unchanged
+        assert plain.model_dump() == values
+        assert json.loads(plain.model_dump_json()) == values
+        assert extended.model_dump() == {**values, "var_95": -0.3}
+        assert extended.model_dump(exclude={"var_95"}) == values
+        assert PerformanceAnalysis.model_validate_json(plain.model_dump_json()) == plain
+        assert (
+            PerformanceAnalysis.model_validate_json(extended.model_dump_json())
+            == extended
+        )
+
+    def test_share_price_history_sortedness(self) -> None:
+        """Test the timestamp order check and the trusted from_sorted factory."""
+        address = "0x1234567890abcdef1234567890abcdef12345678"
+        unsorted = SharePriceHistory(
+            name="Test Vault",
+            address=address,
+            price_history=[(1640995200, 1.05), (1640908800, 1.04)],
+        )
+        ordered = SharePriceHistory(
+            name="Test Vault",
+            address=address,
+            price_history=[(1640908800, 1.04), (1640995200, 1.05)],
+        )
+        trusted = SharePriceHistory.from_sorted(
+            "Test Vault", address, [(1640908800, 1.04), (1640995200, 1.05)]
+        )
+
+        assert not unsorted.is_sorted
+        assert ordered.is_sorted
+        assert trusted.is_sorted
+        # The trusted flag does not take part in equality
+        assert trusted == ordered
+        assert not unsorted.to_compact().is_sorted
+        assert ordered.to_compact().is_sorted
+
+    def test_share_price_history_sorted_flag_is_dropped_on_change(self) -> None:
+        """Test that replacing the points of a trusted history re-enables the check."""
+        address = "0x1234567890abcdef1234567890abcdef12345678"
+        reversed_points = [(1640995200, 1.05), (1640908800, 1.04)]
+        trusted = SharePriceHistory.from_sorted(
+            "Test Vault", address, reversed_points[::-1]
+        )
+
+        assert trusted.model_copy().is_sorted
+        assert trusted.model_copy(update={"name": "Renamed"}).is_sorted
+        assert not trusted.model_copy(
+            update={"price_history": reversed_points}
+        ).is_sorted
+        trusted.price_history = reversed_points
+        assert not trusted.is_sorted
+
+    def test_compact_share_price_history_zero_copy(self) -> None:
+        """Test that int64/float64 buffers are wrapped without copying."""
+        timestamps = array("q", [1640908800, 1640995200])
+        prices = np.array([1.04, 1.05])
+
+        history = CompactSharePriceHistory(
+            name="Test Vault",
+            address="0x1234567890ABCDEF1234567890ABCDEF12345678",
+            timestamps=timestamps,
+            prices=prices,
+        )
+
+        assert history.address == "0x1234567890abcdef1234567890abcdef12345678"
+        assert history.prices is prices
+        assert np.shares_memory(
+            history.timestamps, np.frombuffer(timestamps, dtype=np.int64)
+        )
+        assert history.price_history == [(1640908800, 1.04), (1640995200, 1.05)]
+
+    def test_compact_share_price_history_validation(self) -> None:
+        """Test whole-buffer validation of compact histories."""
+        with pytest.raises(ValidationError, match="same length"):
+            CompactSharePriceHistory(
+                name="Test Vault",
+                address="0x1234567890abcdef1234567890abcdef12345678",
+                timestamps=[1640995200],
+                prices=[1.0, 1.1],
+            )
+
+        with pytest.raises(ValidationError, match="finite"):
+            CompactSharePriceHistory(
+                name="Test Vault",
+                address="0x1234567890abcdef1234567890abcdef12345678",
+                timestamps=[1640995200],
+                prices=[float("nan")],
+            )
+
+        with pytest.raises(ValidationError, match="one-dimensional"):
+            CompactSharePriceHistory(
+                name="Test Vault",
+                address="0x1234567890abcdef1234567890abcdef12345678",
+                timestamps=[[1640995200]],
+                prices=[1.0],
+            )
+
+    def test_compact_share_price_history_rejects_fractional_timestamps(self) -> None:
+        """Test that float timestamps must be whole numbers instead of truncated."""
+        history = CompactSharePriceHistory(
+            name="Test Vault",
+            address="0x1234567890abcdef1234567890abcdef12345678",
+            timestamps=np.array([1640995200.0, 1641081600.0]),
+            prices=[1.0, 1.1],
+        )
+        assert history.timestamps.tolist() == [1640995200, 1641081600]
+
+        for timestamps in ([1640995200.5, 1641081600.0], [float("nan"), 1.0]):
+            with pytest.raises(ValidationError, match="whole numbers"):
+                CompactSharePriceHistory(
+                    name="Test Vault",
+                    address="0x1234567890abcdef1234567890abcdef12345678",
+                    timestamps=timestamps,
+                    prices=[1.0, 1.1],
+                )
+
+    def test_compact_share_price_history_round_trip(self) -> None:
+        """Test JSON serialization and conversion between representations."""
+        history = SharePriceHistory(
+            name="Test Vault",
+            address="0x1234567890abcdef1234567890abcdef12345678",
+            price_history=[(1640908800, 1.04), (1640995200, 1.05)],
+        )
+
+        compact = history.to_compact()
+        restored = CompactSharePriceHistory.model_validate_json(
+            compact.model_dump_json()
+        )
+
+        assert json.loads(compact.model_dump_json())["prices"] == [1.04, 1.05]
+        assert restored == compact
+        assert restored.to_share_price_history() == history
+        assert compact.timestamps.dtype == np.int64
+
     def test_registration_request_creation(self) -> None:
         """Test RegistrationRequest model creation."""
         request = RegistrationRequest(
@@ -6,7 +6,11 @@ import pytest
 from pydantic import BaseModel
 
 from yield_analysis_sdk.exceptions import ValidationError
-from yield_analysis_sdk.validators import AddressValidatorMixin, normalize_address
+from yield_analysis_sdk.validators import (
+    AddressValidatorMixin,
+    normalize_address,
+    normalize_addresses,
+)
 
 
 class TestValidators:
@@ -60,6 +64,47 @@ class TestValidators:
         with pytest.raises(ValidationError, match="Invalid address format"):
             normalize_address("0x1234567890abcdef1234567890abcdef1234567g")
 
+        # Test uppercase 0X prefix, reported as the candidate that was checked
+        with pytest.raises(ValidationError) as exc_info:
+            normalize_address("0X" + "A" * 40)
+        assert str(exc_info.value) == "Invalid address format: 0x0x" + "a" * 40
+
+    def test_normalize_addresses(self) -> None:
+        """Test bulk normalization keeps input order and duplicates."""
+        addresses = [
+            " 0xABCDEF1234567890ABCDEF1234567890ABCDEF12 ",
+            "1234567890abcdef1234567890abcdef12345678",
+            "0xabcdef1234567890abcdef1234567890abcdef12",
+        ]
+
+        assert normalize_addresses(addresses) == [
+            "0xabcdef1234567890abcdef1234567890abcdef12",
+            "0x1234567890abcdef1234567890abcdef12345678",
+            "0xabcdef1234567890abcdef1234567890abcdef12",
+        ]
+        assert normalize_addresses(iter([])) == []
+
+    def test_normalize_addresses_reports_all_invalid(self) -> None:
+        """Test that every invalid entry is reported in a single error."""
+        addresses = [
+            "0x1234567890abcdef1234567890abcdef12345678",
+            "0x1234",
+            "",
+            None,
+            "0x1234567890abcdef1234567890abcdef1234567g",
+        ]
+
+        with pytest.raises(ValidationError) as exc_info:
+            normalize_addresses(addresses)  # type: ignore[arg-type]
+
+        message = str(exc_info.value)
+        assert "in 4 entries" in message
+        assert "[1] '0x1234'" in message
+        assert "[2] ''" in message
+        assert "[3] None" in message
+        assert "[4] '0x1234567890abcdef1234567890abcdef1234567g'" in message
+        assert "[0]" not in message
+
     def test_address_validator_mixin(self) -> None:
         """Test the AddressValidatorMixin."""
 
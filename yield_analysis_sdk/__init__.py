@@ -8,24 +8,72 @@ __version__ = "0.5.5"
 __author__ = "Logarithm Labs"
 __email__ = "dev@logarithm.fi"
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from .alignment import (
+    AlignedPrices,
+    align_share_price_histories,
+    calendar_apy,
+    to_utc_day,
+)
 from .analysis import analyze_yield_with_daily_share_price
+from .batch import (
+    BatchPerformance,
+    analyze_yield_batch,
+    compute_performance_batch,
+    pack_share_price_histories,
+)
+from .cache import CacheStats, QueryCache
+from .coalesce import CoalescingFetcher, CoalescingStats
+from .correlation import (
+    ReturnCovariance,
+    attach_correlation,
+    compute_return_covariance,
+    covariance_from_returns,
+    daily_returns,
+)
 from .exceptions import (
+    CircuitOpenError,
     ConfigurationError,
     ConnectionError,
     DataError,
+    RateLimitError,
     ValidationError,
     YieldAnalysisError,
 )
-from .subgraph import get_daily_share_price_history_from_subgraph
+from .incremental import IncrementalYieldAnalyzer
+from .optimizer import Allocation, maximize_sharpe_allocation, optimize_allocation
+from .parallel import analyze_yield_parallel, compute_performance_parallel
+from .planner import (
+    get_share_price_histories_for_request,
+    get_share_price_histories_for_request_async,
+    plan_analysis_request,
+)
+from .rolling import (
+    RollingPerformance,
+    analyze_rolling_performance,
+    analyze_rolling_performance_batch,
+)
+from .store import SharePriceStore, StoredRange, sync_daily_share_price_history
+from .subgraph import (
+    RequestScheduler,
+    SubgraphClient,
+    get_daily_share_price_history_from_subgraph,
+    set_subgraph_url,
+)
 
 # Import main classes and functions for public API
 from .type import (
+    CHAIN_IDS,
     AnalysisRequest,
     AnalysisResponse,
     AnalysisResult,
     AuditStatus,
     Chain,
+    CompactSharePriceHistory,
     Contract,
+    CorrelationMatrix,
     PerformanceAnalysis,
     RegistrationRequest,
     RegistrationResponse,
@@ -34,11 +82,60 @@ from .type import (
     StrategyType,
     VaultInfo,
 )
-from .validators import normalize_address
+from .validators import normalize_address, normalize_addresses
+
+if TYPE_CHECKING:
+    from .async_subgraph import (
+        AsyncSubgraphClient,
+        get_daily_share_price_history_from_subgraph_async,
+        iter_daily_share_price_histories_by_chain,
+    )
+    from .export import (
+        analysis_results_to_table,
+        iter_analysis_results,
+        open_analysis_dataset,
+        read_analysis_table,
+        table_to_analysis_results,
+        write_analysis_parquet,
+    )
+    from .streaming import (
+        VaultStatsParser,
+        get_daily_share_price_history_streaming,
+        parse_vault_stats_response,
+    )
+
+# Public names of the modules built on optional dependencies (httpx, pyarrow,
+# ijson). They are imported on first access, so importing the SDK, the CLI and
+# every worker process stays cheap when they are not used
+_LAZY_EXPORTS = {
+    "AsyncSubgraphClient": "async_subgraph",
+    "get_daily_share_price_history_from_subgraph_async": "async_subgraph",
+    "iter_daily_share_price_histories_by_chain": "async_subgraph",
+    "analysis_results_to_table": "export",
+    "iter_analysis_results": "export",
+    "open_analysis_dataset": "export",
+    "read_analysis_table": "export",
+    "table_to_analysis_results": "export",
+    "write_analysis_parquet": "export",
+    "VaultStatsParser": "streaming",
+    "get_daily_share_price_history_streaming": "streaming",
+    "parse_vault_stats_response": "streaming",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     # Types and enums
     "Chain",
+    "CHAIN_IDS",
     "StrategyType",
     "AuditStatus",
     "AnalysisRequest",
@@ -48,17 +145,69 @@ __all__ = [
     "PerformanceAnalysis",
     "AnalysisResult",
     "AnalysisResponse",
+    "CorrelationMatrix",
     "SharePriceHistory",
+    "CompactSharePriceHistory",
     "RegistrationRequest",
     "RegistrationResponse",
+    "BatchPerformance",
+    "RollingPerformance",
+    "AlignedPrices",
+    "ReturnCovariance",
+    "Allocation",
+    "SubgraphClient",
+    "RequestScheduler",
+    "AsyncSubgraphClient",
+    "SharePriceStore",
+    "StoredRange",
+    "QueryCache",
+    "CacheStats",
+    "CoalescingFetcher",
+    "CoalescingStats",
+    "IncrementalYieldAnalyzer",
+    "VaultStatsParser",
     # Main functions
     "get_daily_share_price_history_from_subgraph",
+    "get_daily_share_price_history_from_subgraph_async",
+    "iter_daily_share_price_histories_by_chain",
+    "sync_daily_share_price_history",
+    "get_daily_share_price_history_streaming",
+    "parse_vault_stats_response",
+    "plan_analysis_request",
+    "get_share_price_histories_for_request",
+    "get_share_price_histories_for_request_async",
+    "set_subgraph_url",
     "analyze_yield_with_daily_share_price",
+    "analyze_yield_batch",
+    "compute_performance_batch",
+    "pack_share_price_histories",
+    "analyze_yield_parallel",
+    "align_share_price_histories",
+    "calendar_apy",
+    "to_utc_day",
+    "analyze_rolling_performance",
+    "analyze_rolling_performance_batch",
+    "compute_return_covariance",
+    "covariance_from_returns",
+    "daily_returns",
+    "attach_correlation",
+    "optimize_allocation",
+    "maximize_sharpe_allocation",
+    "compute_performance_parallel",
+    "analysis_results_to_table",
+    "table_to_analysis_results",
+    "write_analysis_parquet",
+    "open_analysis_dataset",
+    "read_analysis_table",
+    "iter_analysis_results",
     "normalize_address",
+    "normalize_addresses",
     # Exceptions
     "YieldAnalysisError",
     "DataError",
     "ConfigurationError",
     "ConnectionError",
     "ValidationError",
+    "RateLimitError",
+    "CircuitOpenError",
 ]
@@ -0,0 +1,174 @@
+"""
+Calendar alignment of share price histories on a common UTC daily grid.
+"""
+
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from .batch import FloatArray, IntArray
+from .exceptions import ConfigurationError, DataError
+from .type import AnySharePriceHistory, CompactSharePriceHistory
+
+BoolArray = npt.NDArray[np.bool_]
+
+SECONDS_PER_DAY = 86400
+
+
+class AlignedPrices(NamedTuple):
+    """
+    Share prices of many vaults on a common UTC daily grid.
+
+    Column j of every matrix is the UTC day starting at days[j]. A vault's price
+    for a day is the last price it reported during that day. Days without a
+    report are forward-filled unless the gap is too long; observed tells the
+    reported days apart from filled ones. Days before a vault's first price
+    and gaps that could not be filled are NaN.
+    """
+
+    addresses: List[str]
+    names: List[str]
+    days: IntArray
+    prices: FloatArray
+    observed: BoolArray
+
+    def to_histories(self) -> List[CompactSharePriceHistory]:
+        """Return one history per vault with a price for every non-NaN grid day."""
+        histories = []
+        for row, (address, name) in enumerate(zip(self.addresses, self.names)):
+            present = ~np.isnan(self.prices[row])
+            histories.append(
+                CompactSharePriceHistory(
+                    name=name,
+                    address=address,
+                    timestamps=self.days[present],
+                    prices=self.prices[row, present],
+                )
+            )
+        return histories
+
+
+def to_utc_day(timestamps: npt.ArrayLike) -> IntArray:
+    """Return the start of the UTC day containing each timestamp in seconds."""
+    days: IntArray = (
+        np.asarray(timestamps, dtype=np.int64) // SECONDS_PER_DAY * SECONDS_PER_DAY
+    )
+    return days
+
+
+def align_share_price_histories(
+    share_price_histories: Sequence[AnySharePriceHistory],
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    forward_fill: bool = True,
+    max_gap_days: Optional[int] = None,
+) -> AlignedPrices:
+    """
+    Bucket many histories to UTC days and align them on one daily grid.
+
+    All vaults are bucketed and scattered into the grid in a single vectorized
+    pass. The resulting matrix has one column per calendar day, so a column
+    offset of `days` always means `days` of elapsed time.
+
+    Args:
+        share_price_histories: The histories to align.
+        start: Timestamp in seconds within the first grid day. Defaults to the
+            earliest price of any vault.
+        end: Timestamp in seconds within the last grid day. Defaults to the latest
+            price of any vault.
+        forward_fill: Whether days without a price repeat the last known price.
+        max_gap_days: Longest run of consecutive missing days that is filled.
+            Longer gaps stay NaN. Defaults to no limit.
+
+    Returns:
+        AlignedPrices with one row per history, in input order.
+    """
+    if max_gap_days is not None and max_gap_days < 0:
+        raise ConfigurationError("max_gap_days must not be negative")
+
+    arrays = [history.to_arrays() for history in share_price_histories]
+    lengths = np.fromiter((len(prices) for _, prices in arrays), dtype=np.int64)
+    timestamps = np.concatenate(
+        [ts for ts, _ in arrays] or [np.empty(0, dtype=np.int64)]
+    ).astype(np.int64, copy=False)
+    prices = np.concatenate([p for _, p in arrays] or [np.empty(0)]).astype(
+        np.float64, copy=False
+    )
+    rows = np.repeat(np.arange(len(arrays), dtype=np.int64), lengths)
+
+    day_numbers = timestamps // SECONDS_PER_DAY
+    if (start is None or end is None) and not len(day_numbers):
+        raise DataError("Cannot align histories without any prices")
+    first_day = int(np.min(day_numbers)) if start is None else start // SECONDS_PER_DAY
+    last_day = int(np.max(day_numbers)) if end is None else end // SECONDS_PER_DAY
+    if last_day < first_day:
+        raise ConfigurationError("end must not be before start")
+    width = last_day - first_day + 1
+
+    # Keep the latest price of every (vault, day) inside the grid
+    inside = (day_numbers >= first_day) & (day_numbers <= last_day)
+    rows, columns, timestamps, prices = (
+        rows[inside],
+        day_numbers[inside] - first_day,
+        timestamps[inside],
+        prices[inside],
+    )
+    order = np.lexsort((timestamps, columns, rows))
+    rows, columns, prices = rows[order], columns[order], prices[order]
+    cells = rows * width + columns
+    last_in_cell = np.append(cells[1:] != cells[:-1], True)
+
+    grid = np.full((len(share_price_histories), width), np.nan)
+    observed = np.zeros(grid.shape, dtype=bool)
+    grid[rows[last_in_cell], columns[last_in_cell]] = prices[last_in_cell]
+    observed[rows[last_in_cell], columns[last_in_cell]] = True
+
+    if forward_fill and width:
+        positions = np.arange(width)
+        # Column of the most recent observed price at or before each day
+        source = np.maximum.accumulate(np.where(observed, positions, -1), axis=1)
+        filled = np.take_along_axis(grid, np.maximum(source, 0), axis=1)
+        missing = source < 0
+        if max_gap_days is not None:
+            missing |= positions - source > max_gap_days
+        grid = np.where(missing, np.nan, filled)
+
+    return AlignedPrices(
+        addresses=[history.address for history in share_price_histories],
+        names=[history.name for history in share_price_histories],
+        days=np.arange(first_day, last_day + 1, dtype=np.int64) * SECONDS_PER_DAY,
+        prices=grid,
+        observed=observed,
+    )
+
+
+def calendar_apy(aligned: AlignedPrices, days: int) -> FloatArray:
+    """
+    APY of every vault over exactly `days` calendar days ending on the last grid day.
+
+    Unlike the point-count based APYs of PerformanceAnalysis, missing reports do
+    not stretch the period.
+
+    Args:
+        aligned: Prices aligned with align_share_price_histories.
+        days: Length of the period in days.
+
+    Returns:
+        APY in percent per vault. Vaults without a price at either end of the
+        period get 0.0.
+    """
+    if days < 1:
+        raise ConfigurationError("days must be positive")
+
+    apy = np.zeros(aligned.prices.shape[0])
+    if aligned.prices.shape[1] <= days:
+        return apy
+
+    start_price = aligned.prices[:, -1 - days]
+    end_price = aligned.prices[:, -1]
+    # NaN prices compare False
+    valid = (start_price > 0) & ~np.isnan(end_price)
+    total_return = (end_price[valid] - start_price[valid]) / start_price[valid]
+    apy[valid] = (np.maximum(1 + total_return, 0.0) ** (365 / days) - 1) * 100
+    return apy
@@ -1,55 +1,92 @@
 import math
-from typing import List, Tuple
+from array import array
+from operator import itemgetter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from .exceptions import DataError
-from .type import PerformanceAnalysis, SharePriceHistory
+from .type import (
+    AnySharePriceHistory,
+    CompactSharePriceHistory,
+    PerformanceAnalysis,
+    SharePriceHistory,
+)
+
+# Number of trailing daily returns behind volatility_30d
+VOLATILITY_WINDOW = 30
+
+# (field suffix, confidence level) of the optional VaR and CVaR metrics
+TAIL_RISK_LEVELS = (("95", 0.95), ("99", 0.99))
+
+# Period behind the optional apy_trend_30d metric
+APY_TREND_DAYS = 30
+
+# Optional PerformanceAnalysis metrics filled in when tail risk is requested
+TAIL_RISK_FIELDS = tuple(
+    f"{kind}_{suffix}" for suffix, _ in TAIL_RISK_LEVELS for kind in ("var", "cvar")
+) + (f"apy_trend_{APY_TREND_DAYS}d",)
 
 
 def analyze_yield_with_daily_share_price(
-    share_price_history: SharePriceHistory, risk_free_rate: float = 0.05
+    share_price_history: AnySharePriceHistory,
+    risk_free_rate: float = 0.05,
+    include_tail_risk: bool = False,
 ) -> PerformanceAnalysis:
     """
     Analyze yield metrics from daily share price data and return essential metrics for allocation decisions.
 
     Args:
-        share_price_history: SharePriceHistory object containing daily share prices
+        share_price_history: SharePriceHistory or CompactSharePriceHistory object containing daily share prices
         risk_free_rate: Annual risk-free rate (default 0.05 = 5% for current market conditions)
+        include_tail_risk: Also compute the optional VaR, CVaR and APY trend metrics
 
     Returns:
         PerformanceAnalysis object containing essential yield and risk metrics for allocation decisions
     """
+    if isinstance(share_price_history, CompactSharePriceHistory):
+        # A memoryview iterates the buffer as Python floats without copying it,
+        # as fast as a list, whereas iterating the array yields numpy scalars
+        prices_view: Sequence[float] = memoryview(_sorted_prices(share_price_history))
+        return _analyze_prices(prices_view, risk_free_rate, include_tail_risk)
 
     daily_share_price: List[Tuple[int, float]] = share_price_history.price_history
 
     if not daily_share_price or len(daily_share_price) < 2:
         raise DataError("At least 2 daily share prices are required for analysis")
 
-    # sort daily_share_price by timestamp in ascending order
-    daily_share_price.sort(key=lambda x: x[0])
+    # order by timestamp without touching the caller's list
+    if not share_price_history.is_sorted:
+        daily_share_price = sorted(daily_share_price, key=itemgetter(0))
     # extract price from daily_share_price
     prices: list[float] = [price for timestamp, price in daily_share_price]
 
-    # Calculate daily returns
-    daily_returns = []
-    for i in range(1, len(prices)):
-        if prices[i - 1] > 0:  # Avoid division by zero
-            daily_return = (prices[i] - prices[i - 1]) / prices[i - 1]
-            daily_returns.append(daily_return)
+    return _analyze_prices(prices, risk_free_rate, include_tail_risk)
+
 
-    # Calculate core APY metrics (7d, 30d, and 90d are most important for allocation decisions)
-    apy_7d = _calculate_apy(prices, 7)
-    apy_30d = _calculate_apy(prices, 30)
-    apy_90d = _calculate_apy(prices, 90)
+def _sorted_prices(share_price_history: AnySharePriceHistory) -> np.ndarray:
+    """Return the prices ordered by timestamp without modifying the history."""
+    timestamps, prices = share_price_history.to_arrays()
+    if len(prices) < 2:
+        raise DataError("At least 2 daily share prices are required for analysis")
+    if (timestamps[1:] < timestamps[:-1]).any():
+        prices = prices[np.argsort(timestamps, kind="stable")]
+    return prices
 
-    # Calculate essential risk metrics
-    volatility_30d = _calculate_volatility(daily_returns, 30)
-    max_drawdown = _calculate_max_drawdown(prices)
 
-    # Calculate Sharpe ratio (mandatory for allocation decisions)
-    sharpe_ratio = _calculate_sharpe_ratio(daily_returns, risk_free_rate)
+def _analyze_prices(
+    prices: Sequence[float], risk_free_rate: float, include_tail_risk: bool = False
+) -> PerformanceAnalysis:
+    """Compute the performance metrics of a chronologically ordered price list."""
+    # The kernel records the daily returns only when the tail metrics need them
+    returns = array("d") if include_tail_risk else None
+    apy_7d, apy_30d, apy_90d, volatility_30d, max_drawdown, sharpe_ratio = (
+        _price_metrics(prices, risk_free_rate, returns)
+    )
+    tail_risk = _tail_risk_metrics(prices, returns) if returns is not None else {}
 
-    # Create PerformanceAnalysis object
-    performance_analysis = PerformanceAnalysis(
+    # The metrics come straight from the kernel, so skip validation
+    performance_analysis = PerformanceAnalysis.construct_trusted(
         apy_7d=apy_7d,
         apy_30d=apy_30d,
         apy_90d=apy_90d,
@@ -57,32 +94,153 @@ def analyze_yield_with_daily_share_price(
         max_drawdown=max_drawdown,
         sharpe_ratio=sharpe_ratio,
         analysis_period_days=len(prices),
+        **tail_risk,
     )
 
     return performance_analysis
 
 
-def _calculate_apy(prices: List[float], days: int) -> float:
+def _tail_risk_metrics(
+    prices: Sequence[float], returns: "array[float]"
+) -> Dict[str, float]:
+    """
+    Compute the optional tail risk metrics of a chronologically ordered price list.
+
+    Args:
+        prices: The prices, oldest first.
+        returns: The daily returns recorded by _price_metrics for the same
+            prices. NumPy reads the buffer in place, so a single buffer serves
+            every confidence level.
+    """
+    metrics = dict(
+        zip(
+            TAIL_RISK_FIELDS,
+            _calculate_tail_risk(
+                np.asarray(returns), [level for _, level in TAIL_RISK_LEVELS]
+            ),
+        )
+    )
+    metrics[f"apy_trend_{APY_TREND_DAYS}d"] = _calculate_apy_trend(
+        prices, APY_TREND_DAYS
+    )
+    return metrics
+
+
+def _price_metrics(
+    prices: Sequence[float],
+    risk_free_rate: float,
+    returns: Optional["array[float]"] = None,
+) -> Tuple[float, float, float, float, float, float]:
+    """
+    Compute every floating point metric of a chronologically ordered price series.
+
+    Returns, drawdown and the moments behind the Sharpe ratio are accumulated in a
+    single pass without building a list of returns. The moments are sums shifted
+    by the first return, which keeps the variance free of cancellation for the
+    tightly clustered returns of yield-bearing vaults. Only the trailing
+    volatility window is revisited afterwards.
+
+    Args:
+        prices: At least one price, oldest first.
+        risk_free_rate: Annual risk-free rate used for the Sharpe ratio.
+        returns: Optional buffer the daily returns are appended to as they are
+            computed, for metrics that need all of them.
+
+    Returns:
+        Tuple of apy_7d, apy_30d, apy_90d, volatility_30d, max_drawdown and
+        sharpe_ratio, in the units of PerformanceAnalysis.
+    """
+    count = 0
+    shift = 0.0
+    shifted_sum = 0.0
+    shifted_sum_sq = 0.0
+
+    iterator = iter(prices)
+    previous = peak = next(iterator)
+    max_drawdown = 0.0
+
+    for price in iterator:
+        if previous > 0:  # Avoid division by zero
+            daily_return = (price - previous) / previous
+            if returns is not None:
+                returns.append(daily_return)
+            if count == 0:
+                shift = daily_return
+            deviation = daily_return - shift
+            shifted_sum += deviation
+            shifted_sum_sq += deviation * deviation
+            count += 1
+
+        if price > peak:
+            peak = price
+        else:
+            drawdown = (peak - price) / peak
+            if drawdown > max_drawdown:
+                max_drawdown = drawdown
+        previous = price
+
+    volatility_30d = 0.0
+    if count >= VOLATILITY_WINDOW:
+        volatility_30d = _calculate_volatility(
+            _trailing_returns(prices, VOLATILITY_WINDOW), VOLATILITY_WINDOW
+        )
+
+    sharpe_ratio = 0.0
+    if count >= 2:
+        mean_deviation = shifted_sum / count
+        variance = (shifted_sum_sq - shifted_sum * mean_deviation) / (count - 1)
+        std_dev = math.sqrt(max(variance, 0.0))
+        if std_dev > 0:
+            annualized_return = (shift + mean_deviation) * 365
+            annualized_volatility = std_dev * math.sqrt(365)
+            sharpe_ratio = (annualized_return - risk_free_rate) / annualized_volatility
+
+    return (
+        _calculate_apy(prices, 7),
+        _calculate_apy(prices, 30),
+        _calculate_apy(prices, 90),
+        volatility_30d,
+        max_drawdown * 100,  # Convert to percentage
+        sharpe_ratio,
+    )
+
+
+def _trailing_returns(prices: Sequence[float], count: int) -> List[float]:
+    """Return the last `count` daily returns, skipping non-positive previous prices."""
+    returns: List[float] = []
+    index = len(prices) - 1
+    while len(returns) < count and index > 0:
+        previous = prices[index - 1]
+        if previous > 0:  # Avoid division by zero
+            returns.append((prices[index] - previous) / previous)
+        index -= 1
+    return returns
+
+
+def _calculate_apy(prices: Sequence[float], days: int) -> float:
     """Calculate APY for a given period."""
     if len(prices) < days:
         return 0.0
 
-    start_price = prices[-days]
-    end_price = prices[-1]
+    return _annualize_return(prices[-days], prices[-1], days)
+
 
+def _annualize_return(start_price: float, end_price: float, days: int) -> float:
+    """Convert the return between two prices `days` points apart into an APY."""
     if start_price <= 0:
         return 0.0
 
     # Calculate total return
     total_return = (end_price - start_price) / start_price
 
-    # Convert to APY (annualized)
-    apy: float = (1 + total_return) ** (365 / days) - 1
+    # Convert to APY (annualized). A negative end price is at worst a total loss;
+    # raising the negative growth to a fractional power would give a complex APY.
+    apy: float = max(1 + total_return, 0.0) ** (365 / days) - 1
 
     return apy * 100  # Convert to percentage
 
 
-def _calculate_volatility(returns: List[float], days: int) -> float:
+def _calculate_volatility(returns: Sequence[float], days: int) -> float:
     """Calculate volatility (standard deviation of returns) for a given period."""
     if len(returns) < days:
         return 0.0
@@ -104,65 +262,34 @@ def _calculate_volatility(returns: List[float], days: int) -> float:
     return annualized_volatility * 100  # Convert to percentage
 
 
-def _calculate_max_drawdown(prices: List[float]) -> float:
-    """Calculate maximum drawdown from peak."""
-    if not prices:
-        return 0.0
-
-    max_drawdown = 0.0
-    peak = prices[0]
-
-    for price in prices:
-        if price > peak:
-            peak = price
-        else:
-            drawdown = (peak - price) / peak
-            max_drawdown = max(max_drawdown, drawdown)
-
-    return max_drawdown * 100  # Convert to percentage
-
-
-def _calculate_sharpe_ratio(returns: List[float], risk_free_rate: float) -> float:
-    """Calculate Sharpe ratio using proper annualization."""
-    if not returns:
-        return 0.0
-
-    mean_return = sum(returns) / len(returns)
-
-    # Calculate sample variance (using n-1 for sample standard deviation)
-    variance = sum((r - mean_return) ** 2 for r in returns) / (len(returns) - 1)
-    std_dev = math.sqrt(variance)
-
-    if std_dev == 0:
-        return 0.0
-
-    # Annualize returns and volatility (assuming daily data)
-    # Daily return to annual: daily_return * 365
-    # Daily volatility to annual: daily_vol * sqrt(365)
-    annualized_return = mean_return * 365
-    annualized_volatility = std_dev * math.sqrt(365)
-
-    sharpe_ratio = (annualized_return - risk_free_rate) / annualized_volatility
-
-    return sharpe_ratio
+def _calculate_tail_risk(
+    returns: np.ndarray, confidence_levels: Sequence[float]
+) -> List[float]:
+    """
+    Calculate Value at Risk and Conditional Value at Risk at several confidence levels.
 
+    A single selection pass (numpy.partition) places every requested quantile,
+    so no full sort is needed. The returns are not modified.
 
-def _calculate_var(returns: List[float], confidence_level: float) -> float:
-    """Calculate Value at Risk at given confidence level."""
-    if not returns:
-        return 0.0
-
-    # Sort returns in ascending order
-    sorted_returns = sorted(returns)
+    Returns:
+        VaR and CVaR for each confidence level in turn, in percent.
+    """
+    if not len(returns):
+        return [0.0] * (2 * len(confidence_levels))
 
-    # Find the percentile
-    index = int((1 - confidence_level) * len(sorted_returns))
-    var = sorted_returns[index]
+    # Index of each percentile among the ascending returns
+    indices = [int((1 - level) * len(returns)) for level in confidence_levels]
+    partitioned = np.partition(returns, indices)
 
-    return var * 100  # Convert to percentage
+    metrics = []
+    for index in indices:
+        # Everything before a partition index is at most the value at it
+        metrics.append(float(partitioned[index]) * 100)
+        metrics.append(float(partitioned[: index + 1].mean()) * 100)
+    return metrics
 
 
-def _calculate_apy_trend(prices: List[float], days: int) -> float:
+def _calculate_apy_trend(prices: Sequence[float], days: int) -> float:
     """Calculate APY trend over a period."""
     if len(prices) < days * 2:
         return 0.0
@@ -175,6 +302,6 @@ def _calculate_apy_trend(prices: List[float], days: int) -> float:
     previous_apy = _calculate_apy(previous_prices, days)
 
     # Calculate trend (positive means increasing APY)
-    trend = recent_apy - previous_apy
+    trend = float(recent_apy - previous_apy)
 
     return trend
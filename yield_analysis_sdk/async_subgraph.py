@@ -0,0 +1,292 @@
+"""
+Asynchronous subgraph access for fetching many chains and vaults concurrently.
+
+Requires the optional httpx dependency: pip install "yield-analysis-sdk[async]"
+"""
+
+import asyncio
+from types import TracebackType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from .cache import QueryCache
+from .exceptions import ConfigurationError, ConnectionError
+from .subgraph import (
+    DEFAULT_VAULTS_PER_QUERY,
+    MAX_PAGE_SIZE,
+    RETRYABLE_STATUS_CODES,
+    RequestScheduler,
+    _decode_graphql_response,
+    _format_vault_addresses,
+    _get_subgraph_url,
+    _PriceHistoryPaginator,
+    _record_failed_response,
+)
+from .type import Chain, SharePriceHistory
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class AsyncSubgraphClient:
+    """
+    Asynchronous counterpart of SubgraphClient built on httpx.
+
+    All queries sent through one client share a connection pool and a semaphore
+    that bounds the number of requests in flight, across every chain.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        max_connections: int = 20,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+        cache: Optional[QueryCache] = None,
+        scheduler: Optional[RequestScheduler] = None,
+    ) -> None:
+        """
+        Args:
+            max_concurrency: Maximum number of queries in flight at once.
+            max_connections: Maximum number of pooled connections.
+            connect_timeout: Seconds to wait for a connection to be established.
+            read_timeout: Seconds to wait for the server to send a response.
+            transport: Optional httpx transport, e.g. for testing.
+            cache: Optional QueryCache answering repeated queries in-process.
+            scheduler: RequestScheduler pacing and retrying requests. Defaults to a
+                scheduler with default settings owned by this client.
+        """
+        # Imported here so that importing the SDK does not load httpx
+        try:
+            import httpx
+        except ImportError as e:  # pragma: no cover - exercised only without the extra
+            raise ConfigurationError(
+                'httpx is required for AsyncSubgraphClient: pip install "yield-analysis-sdk[async]"'
+            ) from e
+        if max_concurrency < 1:
+            raise ConfigurationError("max_concurrency must be positive")
+
+        self.cache = cache
+        self.scheduler = scheduler or RequestScheduler()
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout, pool=None),
+            transport=transport,
+        )
+
+    async def query(
+        self, chain: Chain, query: str, variables: Dict[str, Any], api_key: str
+    ) -> Any:
+        """Send a GraphQL query to the subgraph of the given chain."""
+        import httpx
+
+        url = _get_subgraph_url(chain)
+        headers = {"Authorization": f"Bearer {api_key}"}
+        payload = {"query": query, "variables": variables}
+
+        if self.cache is not None:
+            key = self.cache.make_key(chain, query, variables)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        attempt = 0
+        while True:
+            wait = self.scheduler.acquire(api_key, url)
+            try:
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                async with self.semaphore:
+                    response = await self.http.post(url, headers=headers, json=payload)
+            except httpx.HTTPError as e:
+                delay = self.scheduler.record_failure(api_key, url, attempt)
+                if delay is None:
+                    raise ConnectionError(f"Request to subgraph failed: {e}") from e
+            except BaseException:
+                # E.g. a cancelled task: the attempt has no outcome to record
+                self.scheduler.release(url)
+                raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    self.scheduler.record_success(url)
+                    break
+                delay = _record_failed_response(
+                    self.scheduler, api_key, url, attempt, response
+                )
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        result = _decode_graphql_response(response)
+        if self.cache is not None:
+            self.cache.put(key, result)
+        return result
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        await self.http.aclose()
+
+    async def __aenter__(self) -> "AsyncSubgraphClient":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
+
+
+async def _fetch_chunk(
+    client: AsyncSubgraphClient,
+    chain: Chain,
+    addresses: List[str],
+    underlying_asset_decimals: int,
+    length: int,
+    api_key: str,
+    page_size: int,
+) -> List[SharePriceHistory]:
+    """Fetch every page of a single chunk of vault addresses."""
+    paginator = _PriceHistoryPaginator(addresses, length, page_size, len(addresses))
+    while (request := paginator.next_query()) is not None:
+        query, variables = request
+        paginator.feed(await client.query(chain, query, variables, api_key))
+    return paginator.results(underlying_asset_decimals)
+
+
+def _chunk_addresses(vault_addresses: List[str], chunk_size: int) -> List[List[str]]:
+    if chunk_size < 1:
+        raise ConfigurationError("vaults_per_query must be positive")
+    addresses = list(dict.fromkeys(_format_vault_addresses(vault_addresses)))
+    return [
+        addresses[start : start + chunk_size]
+        for start in range(0, len(addresses), chunk_size)
+    ]
+
+
+async def get_daily_share_price_history_from_subgraph_async(
+    chain: Chain,
+    vault_addresses: List[str],
+    underlying_asset_decimals: int,
+    length: int,
+    api_key: str,
+    page_size: int = MAX_PAGE_SIZE,
+    vaults_per_query: int = DEFAULT_VAULTS_PER_QUERY,
+    client: Optional[AsyncSubgraphClient] = None,
+) -> List[SharePriceHistory]:
+    """
+    Get the daily share price history of many vaults, querying address chunks concurrently.
+
+    Args:
+        chain: The blockchain chain to query.
+        vault_addresses: A list of vault addresses to query.
+        underlying_asset_decimals: The number of decimals of the underlying asset. e.g. 6 for USDC.
+        length: The number of days to query.
+        api_key: The API key for the subgraph.
+        page_size: Maximum number of rows requested per vault and round trip.
+        vaults_per_query: Maximum number of vaults packed into a single query.
+        client: The AsyncSubgraphClient to send queries with. A temporary client is
+            created and closed when omitted.
+
+    Returns:
+        One SharePriceHistory per vault with data, in the order of vault_addresses.
+    """
+    if not api_key:
+        raise ConfigurationError("SUBGRAPH_API_KEY is required")
+
+    histories: List[SharePriceHistory] = []
+    async for _, chunk in iter_daily_share_price_histories_by_chain(
+        {chain: vault_addresses},
+        underlying_asset_decimals,
+        length,
+        api_key,
+        page_size,
+        vaults_per_query,
+        client,
+        ordered=True,
+    ):
+        histories.extend(chunk)
+    return histories
+
+
+async def iter_daily_share_price_histories_by_chain(
+    vault_addresses_by_chain: Dict[Chain, List[str]],
+    underlying_asset_decimals: int,
+    length: int,
+    api_key: str,
+    page_size: int = MAX_PAGE_SIZE,
+    vaults_per_query: int = DEFAULT_VAULTS_PER_QUERY,
+    client: Optional[AsyncSubgraphClient] = None,
+    ordered: bool = False,
+) -> AsyncIterator[Tuple[Chain, List[SharePriceHistory]]]:
+    """
+    Fetch share price histories on several chains at once, yielding as they complete.
+
+    Every chain is split into chunks of vaults_per_query addresses and all chunks are
+    fetched concurrently, bounded by the client's semaphore. Each completed chunk is
+    yielded as a (chain, histories) pair, so a refresh takes roughly as long as the
+    slowest chunk rather than the sum of all of them.
+
+    Args:
+        vault_addresses_by_chain: Vault addresses to query, grouped by chain.
+        underlying_asset_decimals: The number of decimals of the underlying asset. e.g. 6 for USDC.
+        length: The number of days to query.
+        api_key: The API key for the subgraph.
+        page_size: Maximum number of rows requested per vault and round trip.
+        vaults_per_query: Maximum number of vaults packed into a single query.
+        client: The AsyncSubgraphClient to send queries with. A temporary client is
+            created and closed when omitted.
+        ordered: Yield chunks in request order instead of completion order.
+
+    Yields:
+        (chain, histories) pairs in completion order.
+    """
+    if not api_key:
+        raise ConfigurationError("SUBGRAPH_API_KEY is required")
+
+    async def fetch(
+        client: AsyncSubgraphClient, chain: Chain, addresses: List[str]
+    ) -> Tuple[Chain, List[SharePriceHistory]]:
+        histories = await _fetch_chunk(
+            client,
+            chain,
+            addresses,
+            underlying_asset_decimals,
+            length,
+            api_key,
+            page_size,
+        )
+        return chain, histories
+
+    chunks = [
+        (chain, addresses)
+        for chain, chain_addresses in vault_addresses_by_chain.items()
+        for addresses in _chunk_addresses(chain_addresses, vaults_per_query)
+    ]
+    owns_client = client is None
+    if client is None:
+        client = AsyncSubgraphClient()
+
+    tasks = [asyncio.ensure_future(fetch(client, *chunk)) for chunk in chunks]
+    try:
+        for completed in tasks if ordered else asyncio.as_completed(tasks):
+            yield await completed
+    finally:
+        for task in tasks:
+            task.cancel()
+        if owns_client:
+            await client.aclose()
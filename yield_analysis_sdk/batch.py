@@ -0,0 +1,387 @@
+"""
+Vectorized yield analysis for many share price histories at once.
+"""
+
+import math
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .analysis import (
+    APY_TREND_DAYS,
+    TAIL_RISK_FIELDS,
+    TAIL_RISK_LEVELS,
+    _price_metrics,
+    _sorted_prices,
+)
+from .exceptions import DataError
+from .type import AnySharePriceHistory, PerformanceAnalysis
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+# Rows are processed in blocks so the temporary (vaults x days) arrays stay bounded
+DEFAULT_CHUNK_SIZE = 1024
+
+
+class BatchPerformance(NamedTuple):
+    """Columnar performance metrics with one entry per vault."""
+
+    apy_7d: FloatArray
+    apy_30d: FloatArray
+    apy_90d: FloatArray
+    volatility_30d: FloatArray
+    max_drawdown: FloatArray
+    sharpe_ratio: FloatArray
+    analysis_period_days: IntArray
+    # Optional tail risk metrics, None unless requested
+    var_95: Optional[FloatArray] = None
+    cvar_95: Optional[FloatArray] = None
+    var_99: Optional[FloatArray] = None
+    cvar_99: Optional[FloatArray] = None
+    apy_trend_30d: Optional[FloatArray] = None
+
+    def to_performance_analyses(self) -> List[PerformanceAnalysis]:
+        """Convert the columnar metrics into one PerformanceAnalysis per vault."""
+        rows = zip(*(column.tolist() for column in self[:7]))
+        optional = {
+            field: column
+            for field in TAIL_RISK_FIELDS
+            if (column := getattr(self, field)) is not None
+        }
+        if not optional:
+            return [
+                PerformanceAnalysis.construct_trusted(
+                    apy_7d=apy_7d,
+                    apy_30d=apy_30d,
+                    apy_90d=apy_90d,
+                    volatility_30d=volatility_30d,
+                    max_drawdown=max_drawdown,
+                    sharpe_ratio=sharpe_ratio,
+                    analysis_period_days=analysis_period_days,
+                )
+                for (
+                    apy_7d,
+                    apy_30d,
+                    apy_90d,
+                    volatility_30d,
+                    max_drawdown,
+                    sharpe_ratio,
+                    analysis_period_days,
+                ) in rows
+            ]
+
+        optional_rows = zip(*(column.tolist() for column in optional.values()))
+        return [
+            PerformanceAnalysis.construct_trusted(
+                apy_7d=apy_7d,
+                apy_30d=apy_30d,
+                apy_90d=apy_90d,
+                volatility_30d=volatility_30d,
+                max_drawdown=max_drawdown,
+                sharpe_ratio=sharpe_ratio,
+                analysis_period_days=analysis_period_days,
+                **dict(zip(optional, values)),
+            )
+            for (
+                apy_7d,
+                apy_30d,
+                apy_90d,
+                volatility_30d,
+                max_drawdown,
+                sharpe_ratio,
+                analysis_period_days,
+            ), values in zip(rows, optional_rows)
+        ]
+
+
+def pack_share_price_histories(
+    share_price_histories: Sequence[AnySharePriceHistory],
+) -> Tuple[FloatArray, IntArray]:
+    """
+    Pack share price histories into a single (vaults x days) price matrix.
+
+    Each row holds one vault's prices sorted by timestamp and right-aligned, so the
+    last column is the most recent price of every vault. Shorter histories are
+    padded with NaN on the left. The input histories are not modified.
+
+    Args:
+        share_price_histories: The histories to pack.
+
+    Returns:
+        A tuple of the price matrix and the number of prices in each row.
+    """
+    sorted_prices = []
+    for history in share_price_histories:
+        try:
+            sorted_prices.append(_sorted_prices(history))
+        except DataError as e:
+            raise DataError(f"{e}: {history.address}") from e
+
+    lengths = np.fromiter(
+        map(len, sorted_prices), dtype=np.int64, count=len(sorted_prices)
+    )
+    width = max(lengths.tolist(), default=0)
+    prices = np.full((len(sorted_prices), width), np.nan)
+    for row, series in enumerate(sorted_prices):
+        prices[row, width - len(series) :] = series
+
+    return prices, lengths
+
+
+def _check_left_padded(prices: FloatArray) -> None:
+    """
+    Check that every row of a price matrix only has NaN on its left.
+
+    The batch kernels read each row as one uninterrupted series ending in the last
+    column. Interior or trailing NaN, e.g. from an aligned matrix with unfilled
+    gaps, would silently turn into NaN or zero metrics instead.
+
+    Raises:
+        DataError: If a row has a NaN after its first price.
+    """
+    missing = np.isnan(prices)
+    gaps = missing[:, 1:] & ~missing[:, :-1]
+    if gaps.any():
+        row = int(np.flatnonzero(gaps.any(axis=1))[0])
+        raise DataError(
+            "Price matrix rows may only be padded with NaN on the left, "
+            f"row {row} has a gap or trailing NaN"
+        )
+
+
+def compute_performance_batch(
+    prices: FloatArray,
+    risk_free_rate: float = 0.05,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    include_tail_risk: bool = False,
+) -> BatchPerformance:
+    """
+    Compute performance metrics for every row of a packed price matrix.
+
+    The metrics match analyze_yield_with_daily_share_price applied to each row.
+
+    Args:
+        prices: Right-aligned, NaN left-padded price matrix as produced by
+            pack_share_price_histories.
+        risk_free_rate: Annual risk-free rate used for the Sharpe ratio.
+        chunk_size: Number of rows processed per block.
+        include_tail_risk: Also compute the optional VaR, CVaR and APY trend metrics.
+
+    Returns:
+        BatchPerformance with one entry per row.
+
+    Raises:
+        DataError: If a row has NaN anywhere but in its left padding.
+    """
+    if prices.ndim != 2:
+        raise DataError("Price matrix must be two-dimensional")
+    if chunk_size < 1:
+        raise DataError("chunk_size must be positive")
+    _check_left_padded(prices)
+
+    n_vaults = prices.shape[0]
+    apy_7d, apy_30d, apy_90d, volatility_30d, max_drawdown, sharpe_ratio = (
+        np.zeros(n_vaults) for _ in range(6)
+    )
+    columns = [apy_7d, apy_30d, apy_90d, volatility_30d, max_drawdown, sharpe_ratio]
+    tail_risk = (
+        {field: np.zeros(n_vaults) for field in TAIL_RISK_FIELDS}
+        if include_tail_risk
+        else {}
+    )
+    columns.extend(tail_risk.values())
+
+    for start in range(0, n_vaults, chunk_size):
+        stop = min(start + chunk_size, n_vaults)
+        block = _compute_block(prices[start:stop], risk_free_rate, include_tail_risk)
+        for column, values in zip(columns, block):
+            column[start:stop] = values
+
+    return BatchPerformance(
+        apy_7d=apy_7d,
+        apy_30d=apy_30d,
+        apy_90d=apy_90d,
+        volatility_30d=volatility_30d,
+        max_drawdown=max_drawdown,
+        sharpe_ratio=sharpe_ratio,
+        analysis_period_days=np.count_nonzero(~np.isnan(prices), axis=1).astype(
+            np.int64
+        ),
+        **tail_risk,
+    )
+
+
+def analyze_yield_batch(
+    share_price_histories: Sequence[AnySharePriceHistory],
+    risk_free_rate: float = 0.05,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    include_tail_risk: bool = False,
+) -> List[PerformanceAnalysis]:
+    """
+    Analyze many share price histories in one vectorized pass.
+
+    Args:
+        share_price_histories: The histories to analyze.
+        risk_free_rate: Annual risk-free rate (default 0.05 = 5% for current market conditions)
+        chunk_size: Number of vaults processed per block.
+        include_tail_risk: Also compute the optional VaR, CVaR and APY trend metrics.
+
+    Returns:
+        One PerformanceAnalysis per history, in input order.
+    """
+    if not share_price_histories:
+        return []
+
+    prices, _ = pack_share_price_histories(share_price_histories)
+    return compute_performance_batch(
+        prices, risk_free_rate, chunk_size, include_tail_risk
+    ).to_performance_analyses()
+
+
+def _compute_block(
+    prices: FloatArray, risk_free_rate: float, include_tail_risk: bool = False
+) -> List[FloatArray]:
+    """
+    Compute the floating point metrics for a block of rows.
+
+    The tail risk metrics, when requested, follow the six core metrics in the
+    order of TAIL_RISK_FIELDS.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        previous = prices[:, :-1]
+        returns = np.where(previous > 0, (prices[:, 1:] - previous) / previous, np.nan)
+
+        apy_7d = _batch_apy(prices, 7)
+        apy_30d = _batch_apy(prices, 30)
+        apy_90d = _batch_apy(prices, 90)
+        volatility_30d = _batch_volatility(returns, 30)
+        max_drawdown = _batch_max_drawdown(prices)
+        sharpe_ratio = _batch_sharpe_ratio(returns, risk_free_rate)
+
+    metrics = [apy_7d, apy_30d, apy_90d, volatility_30d, max_drawdown, sharpe_ratio]
+
+    # Non-positive prices drop returns from the middle of a series, which the
+    # fixed trailing windows above cannot express. Those rare rows use the
+    # scalar path instead.
+    for row in np.flatnonzero(np.any(prices <= 0, axis=1)):
+        series = prices[row]
+        for values, value in zip(
+            metrics, _price_metrics(series[~np.isnan(series)].tolist(), risk_free_rate)
+        ):
+            values[row] = value
+
+    if include_tail_risk:
+        # Skipped returns are already NaN here, so no scalar fallback is needed
+        metrics.extend(_batch_tail_risk(returns))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            metrics.append(_batch_apy_trend(prices, APY_TREND_DAYS))
+
+    return metrics
+
+
+def _batch_apy(prices: FloatArray, days: int) -> FloatArray:
+    """Calculate APY for a given period for every row."""
+    apy = np.zeros(prices.shape[0])
+    if prices.shape[1] < days:
+        return apy
+
+    start_price = prices[:, -days]
+    end_price = prices[:, -1]
+    # NaN start prices (history shorter than the period) compare False
+    valid = start_price > 0
+
+    total_return = (end_price[valid] - start_price[valid]) / start_price[valid]
+    # Clamped at a total loss like the scalar APY, instead of NaN
+    apy[valid] = (np.maximum(1 + total_return, 0.0) ** (365 / days) - 1) * 100
+    return apy
+
+
+def _batch_apy_trend(prices: FloatArray, days: int) -> FloatArray:
+    """Calculate the APY change between the last two periods for every row."""
+    trend = np.zeros(prices.shape[0])
+    if prices.shape[1] < days * 2:
+        return trend
+
+    enough = ~np.isnan(prices[:, -days * 2])
+    recent_apy = _batch_apy(prices[enough], days)
+    previous_apy = _batch_apy(prices[enough, :-days], days)
+    trend[enough] = recent_apy - previous_apy
+    return trend
+
+
+def _batch_tail_risk(returns: FloatArray) -> List[FloatArray]:
+    """
+    Calculate VaR and CVaR at every level of TAIL_RISK_LEVELS for every row.
+
+    Rows are grouped by their number of valid returns. Within a group, moving
+    the NaN entries to the end makes the quantile indices line up, so a single
+    numpy.partition call places every quantile of every row in the group.
+    """
+    n_rows = returns.shape[0]
+    levels = [level for _, level in TAIL_RISK_LEVELS]
+    metrics = [np.zeros(n_rows) for _ in range(2 * len(levels))]
+
+    counts = np.count_nonzero(~np.isnan(returns), axis=1)
+    # inf sorts after every valid return, so it never lands in a lower tail
+    filled = np.where(np.isnan(returns), np.inf, returns)
+    for count in np.unique(counts[counts > 0]).tolist():
+        rows = np.flatnonzero(counts == count)
+        indices = [int((1 - level) * count) for level in levels]
+        partitioned = np.partition(filled[rows], indices, axis=1)
+        for position, index in enumerate(indices):
+            metrics[2 * position][rows] = partitioned[:, index] * 100
+            metrics[2 * position + 1][rows] = (
+                partitioned[:, : index + 1].mean(axis=1) * 100
+            )
+
+    return metrics
+
+
+def _batch_volatility(returns: FloatArray, days: int) -> FloatArray:
+    """Calculate annualized volatility of the trailing returns for every row."""
+    volatility = np.zeros(returns.shape[0])
+    if returns.shape[1] < days:
+        return volatility
+
+    period_returns = returns[:, -days:]
+    valid = ~np.isnan(period_returns).any(axis=1)
+    volatility[valid] = (
+        np.std(period_returns[valid], axis=1, ddof=1) * math.sqrt(365) * 100
+    )
+    return volatility
+
+
+def _batch_max_drawdown(prices: FloatArray) -> FloatArray:
+    """Calculate maximum drawdown from peak for every row."""
+    # fmax ignores the NaN padding, so the running peak starts at the first price
+    peak = np.fmax.accumulate(prices, axis=1)
+    drawdown = np.nanmax((peak - prices) / peak, axis=1)
+    result: FloatArray = np.maximum(drawdown, 0.0) * 100
+    return result
+
+
+def _batch_sharpe_ratio(returns: FloatArray, risk_free_rate: float) -> FloatArray:
+    """Calculate the annualized Sharpe ratio for every row."""
+    sharpe_ratio = np.zeros(returns.shape[0])
+    valid_returns = ~np.isnan(returns)
+    count = valid_returns.sum(axis=1)
+
+    enough = count >= 2
+    if not enough.any():
+        return sharpe_ratio
+
+    returns = returns[enough]
+    count = count[enough]
+    mean_return = np.nansum(returns, axis=1) / count
+    variance = np.nansum((returns - mean_return[:, None]) ** 2, axis=1) / (count - 1)
+    std_dev = np.sqrt(variance)
+
+    nonzero = std_dev != 0
+    annualized_return = mean_return[nonzero] * 365
+    annualized_volatility = std_dev[nonzero] * math.sqrt(365)
+    ratios = np.zeros(len(std_dev))
+    ratios[nonzero] = (annualized_return - risk_free_rate) / annualized_volatility
+    sharpe_ratio[enough] = ratios
+    return sharpe_ratio
@@ -0,0 +1,135 @@
+"""
+In-process cache of subgraph query results.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from .exceptions import ConfigurationError
+from .type import Chain
+
+# Daily stats only change when a new UTC day starts
+DAILY_INTERVAL_SECONDS = 86400
+
+
+class CacheStats(NamedTuple):
+    """Counters describing the state of a QueryCache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+
+
+class QueryCache:
+    """
+    Thread-safe TTL and LRU cache of decoded subgraph responses.
+
+    Entries are keyed by chain, query text and variables. Each entry expires after
+    `ttl` seconds or at the next interval boundary, whichever comes first, so daily
+    stats cached before midnight UTC are refetched after it. Least recently used
+    entries are evicted once the cached responses exceed `max_bytes`, measured by
+    their JSON size.
+
+    Cached responses are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = None,
+        interval_seconds: int = DAILY_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            max_bytes: Budget for the JSON size of all cached responses.
+            ttl: Optional maximum age of an entry in seconds.
+            interval_seconds: Entries never outlive the interval they were cached in.
+            clock: Source of the current UNIX time, e.g. for testing.
+        """
+        if max_bytes < 1:
+            raise ConfigurationError("max_bytes must be positive")
+        if interval_seconds < 1:
+            raise ConfigurationError("interval_seconds must be positive")
+
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.interval_seconds = interval_seconds
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(chain: Chain, query: str, variables: Dict[str, Any]) -> str:
+        """Build a cache key that ignores whitespace and variable order."""
+        return json.dumps(
+            [chain.value, " ".join(query.split()), variables],
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached response for a key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key: str, value: Any) -> None:
+        """Cache a response, evicting least recently used entries if needed."""
+        size = len(json.dumps(value, separators=(",", ":")))
+        if size > self.max_bytes:
+            return
+
+        now = self.clock()
+        expires_at = (now // self.interval_seconds + 1) * self.interval_seconds
+        if self.ttl is not None:
+            expires_at = min(expires_at, now + self.ttl)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, size, value)
+            self._size_bytes += size
+            while self._size_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached entry. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                entries=len(self._entries),
+                size_bytes=self._size_bytes,
+            )
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._size_bytes -= size
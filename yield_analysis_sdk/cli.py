@@ -0,0 +1,431 @@
+"""
+Command line interface for bulk yield analysis.
+
+Histories are fetched from the subgraph or read from a CSV, Parquet or JSONL file,
+analyzed in one batch and written out as an AnalysisResponse.
+
+Examples:
+    yield-analyzer --chain base --vaults 0xabc... 0xdef... -o analysis.json
+    yield-analyzer --chain base --input prices.parquet --workers 8 -o analysis.jsonl
+"""
+
+import argparse
+import csv
+import os
+import sys
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+from pydantic import ValidationError as PydanticValidationError
+
+from .batch import analyze_yield_batch
+from .exceptions import ConfigurationError, DataError, YieldAnalysisError
+from .export import write_analysis_parquet
+from .parallel import analyze_yield_parallel
+from .store import SharePriceStore, sync_daily_share_price_history
+from .subgraph import SubgraphClient, get_daily_share_price_history_from_subgraph
+from .type import (
+    AnalysisResult,
+    AnySharePriceHistory,
+    Chain,
+    CompactSharePriceHistory,
+    PerformanceAnalysis,
+    SharePriceHistory,
+    VaultInfo,
+)
+from .validators import normalize_addresses
+
+# File name of the share price store kept in --cache-dir
+STORE_FILE_NAME = "share_prices.sqlite"
+
+_CSV_SUFFIXES = {".csv"}
+_PARQUET_SUFFIXES = {".parquet", ".pq"}
+_JSONL_SUFFIXES = {".jsonl", ".ndjson"}
+_CHAIN_NAMES = [chain.value for chain in Chain if chain is not Chain.OTHER]
+
+
+def _parse_chain(value: str) -> Chain:
+    """Look up a --chain value, rejecting names that Chain would map to OTHER."""
+    if value not in _CHAIN_NAMES:
+        raise argparse.ArgumentTypeError(
+            f"invalid chain {value!r} (choose from {', '.join(_CHAIN_NAMES)})"
+        )
+    return Chain(value)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser of the yield-analyzer command."""
+    parser = argparse.ArgumentParser(
+        prog="yield-analyzer",
+        description="Analyze the yield of many vaults and write an AnalysisResponse.",
+    )
+
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--vaults",
+        nargs="+",
+        metavar="ADDRESS",
+        help="Vaults to fetch from the subgraph",
+    )
+    source.add_argument(
+        "--vaults-file",
+        type=Path,
+        metavar="PATH",
+        help="File with one vault address per line to fetch from the subgraph",
+    )
+    source.add_argument(
+        "--input",
+        type=Path,
+        metavar="PATH",
+        help=(
+            "Read histories from a file instead of the subgraph: .csv or .parquet "
+            "with address, timestamp, price and optional name columns, or .jsonl "
+            "with one SharePriceHistory per line"
+        ),
+    )
+
+    parser.add_argument(
+        "--chain",
+        type=_parse_chain,
+        required=True,
+        metavar="CHAIN",
+        help=f"Chain of the vaults: {', '.join(_CHAIN_NAMES)}",
+    )
+    parser.add_argument(
+        "--decimals",
+        type=int,
+        default=6,
+        help="Decimals of the underlying asset (default: 6)",
+    )
+    parser.add_argument(
+        "--length", type=int, default=90, help="Days of history to fetch (default: 90)"
+    )
+    parser.add_argument(
+        "--api-key",
+        default=os.environ.get("SUBGRAPH_API_KEY"),
+        help="Subgraph API key (default: $SUBGRAPH_API_KEY)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        metavar="DIR",
+        help="Keep fetched prices in a SharePriceStore here and only fetch new days",
+    )
+
+    parser.add_argument(
+        "--risk-free-rate", type=float, default=0.05, help="Annual risk-free rate"
+    )
+    parser.add_argument(
+        "--protocol", default="Unknown", help="Protocol reported in the vault info"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes used for the analysis (default: 1)",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, help="Vaults analyzed per block or worker task"
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        metavar="PATH",
+        help="Output file, '-' for stdout (default: -)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "jsonl", "parquet"],
+        help=(
+            "json writes one AnalysisResponse, jsonl one AnalysisResult per line, "
+            "parquet one flattened row per vault (default: from the output suffix, "
+            "else json)"
+        ),
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point of the yield-analyzer command."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        histories = _load_histories(args)
+        usable = []
+        for history in histories:
+            if len(history.price_history) < 2:
+                print(
+                    f"Skipping {history.address}: at least 2 daily share prices are required",
+                    file=sys.stderr,
+                )
+            else:
+                usable.append(history)
+
+        performances = _analyze(usable, args)
+        output_format = args.format or _output_format(args.output)
+        results = _iter_results(
+            usable, performances, args.chain, args.protocol, args.risk_free_rate
+        )
+        if output_format == "parquet":
+            if args.output == "-":
+                raise ConfigurationError("Parquet output needs an output file")
+            write_analysis_parquet(results, args.output)
+        elif args.output == "-":
+            write_results(results, sys.stdout, output_format)
+        else:
+            with open(args.output, "w", encoding="utf-8") as stream:
+                write_results(results, stream, output_format)
+    except (YieldAnalysisError, OSError) as e:
+        print(f"yield-analyzer: error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def write_results(
+    results: Iterable[AnalysisResult], stream: IO[str], output_format: str = "json"
+) -> None:
+    """
+    Serialize analysis results one at a time, without building an AnalysisResponse.
+
+    Args:
+        results: The results to write.
+        stream: Text stream to write to.
+        output_format: "json" writes a single AnalysisResponse document, "jsonl" one
+            AnalysisResult per line.
+    """
+    if output_format == "jsonl":
+        for result in results:
+            stream.write(result.model_dump_json())
+            stream.write("\n")
+    elif output_format == "json":
+        stream.write('{"analyses":[')
+        for index, result in enumerate(results):
+            if index:
+                stream.write(",")
+            stream.write(result.model_dump_json())
+        stream.write("]}\n")
+    else:
+        raise ConfigurationError(f"Unsupported output format: {output_format}")
+
+
+def read_share_price_histories(path: Path) -> List[AnySharePriceHistory]:
+    """
+    Read share price histories from a CSV, Parquet or JSONL file.
+
+    CSV and Parquet files hold one row per price with `address`, `timestamp`,
+    `price` and optional `name` columns. JSONL files hold one SharePriceHistory
+    per line.
+
+    Args:
+        path: The file to read. The format is chosen by its suffix.
+
+    Returns:
+        One history per vault, in order of first appearance.
+    """
+    suffix = path.suffix.lower()
+    if suffix in _CSV_SUFFIXES:
+        return _read_csv(path)
+    if suffix in _PARQUET_SUFFIXES:
+        return _read_parquet(path)
+    if suffix in _JSONL_SUFFIXES:
+        return _read_jsonl(path)
+    raise ConfigurationError(f"Unsupported input file type: {path.suffix}")
+
+
+def _output_format(output: str) -> str:
+    suffix = Path(output).suffix.lower()
+    if suffix in _JSONL_SUFFIXES:
+        return "jsonl"
+    if suffix in _PARQUET_SUFFIXES:
+        return "parquet"
+    return "json"
+
+
+def _load_histories(args: argparse.Namespace) -> List[AnySharePriceHistory]:
+    if args.input is not None:
+        return read_share_price_histories(args.input)
+
+    if args.vaults_file is not None:
+        addresses = [
+            line.strip()
+            for line in args.vaults_file.read_text().splitlines()
+            if line.strip()
+        ]
+    else:
+        addresses = args.vaults
+    if not args.api_key:
+        raise ConfigurationError(
+            "A subgraph API key is required: pass --api-key or set SUBGRAPH_API_KEY"
+        )
+
+    with SubgraphClient() as client:
+        if args.cache_dir is None:
+            return list(
+                get_daily_share_price_history_from_subgraph(
+                    args.chain,
+                    addresses,
+                    args.decimals,
+                    args.length,
+                    args.api_key,
+                    client=client,
+                )
+            )
+
+        args.cache_dir.mkdir(parents=True, exist_ok=True)
+        with SharePriceStore(args.cache_dir / STORE_FILE_NAME) as store:
+            return list(
+                sync_daily_share_price_history(
+                    store,
+                    args.chain,
+                    addresses,
+                    args.decimals,
+                    args.length,
+                    args.api_key,
+                    client=client,
+                )
+            )
+
+
+def _analyze(
+    histories: List[AnySharePriceHistory], args: argparse.Namespace
+) -> List[PerformanceAnalysis]:
+    options = {} if args.chunk_size is None else {"chunk_size": args.chunk_size}
+    if args.workers > 1:
+        return analyze_yield_parallel(
+            histories, args.risk_free_rate, max_workers=args.workers, **options
+        )
+    return analyze_yield_batch(histories, args.risk_free_rate, **options)
+
+
+def _iter_results(
+    histories: List[AnySharePriceHistory],
+    performances: List[PerformanceAnalysis],
+    chain: Chain,
+    protocol: str,
+    risk_free_rate: float,
+) -> Iterator[AnalysisResult]:
+    for history, performance in zip(histories, performances):
+        timestamps, prices = history.to_arrays()
+        latest = int(np.argmax(timestamps))
+        # Everything below was validated on the way in
+        yield AnalysisResult.construct_trusted(
+            vault_info=VaultInfo.construct_trusted(
+                chain=chain,
+                address=history.address,
+                name=history.name,
+                protocol=protocol,
+                risk_free_rate=risk_free_rate,
+                current_share_price=float(prices[latest]),
+                last_updated_timestamp=int(timestamps[latest]),
+            ),
+            performance=performance,
+        )
+
+
+def _read_csv(path: Path) -> List[AnySharePriceHistory]:
+    addresses: List[str] = []
+    names: List[str] = []
+    timestamps: List[int] = []
+    prices: List[float] = []
+
+    with open(path, newline="", encoding="utf-8") as stream:
+        reader = csv.DictReader(stream)
+        _check_columns(reader.fieldnames or [], path)
+        for line, row in enumerate(reader, start=2):
+            try:
+                timestamps.append(int(row["timestamp"]))
+                prices.append(float(row["price"]))
+            except (TypeError, ValueError) as e:
+                raise DataError(f"{path}:{line}: invalid row: {e}")
+            addresses.append(row["address"])
+            names.append(row.get("name") or "")
+
+    return _group_rows(
+        addresses,
+        names,
+        np.array(timestamps, dtype=np.int64),
+        np.array(prices, dtype=np.float64),
+    )
+
+
+def _read_parquet(path: Path) -> List[AnySharePriceHistory]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ConfigurationError(
+            'pyarrow is required to read Parquet files: pip install "yield-analysis-sdk[parquet]"'
+        )
+
+    schema_names = pq.read_schema(path).names
+    _check_columns(schema_names, path)
+    columns = ["address", "timestamp", "price"]
+    if "name" in schema_names:
+        columns.append("name")
+    table = pq.read_table(path, columns=columns)
+
+    addresses = table.column("address").to_pylist()
+    names = (
+        table.column("name").to_pylist() if "name" in columns else [""] * table.num_rows
+    )
+    return _group_rows(
+        addresses,
+        names,
+        table.column("timestamp").to_numpy().astype(np.int64, copy=False),
+        table.column("price").to_numpy().astype(np.float64, copy=False),
+    )
+
+
+def _read_jsonl(path: Path) -> List[AnySharePriceHistory]:
+    histories: List[AnySharePriceHistory] = []
+    with open(path, encoding="utf-8") as stream:
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                histories.append(SharePriceHistory.model_validate_json(line))
+            except PydanticValidationError as e:
+                raise DataError(f"{path}:{number}: invalid share price history: {e}")
+    return histories
+
+
+def _check_columns(columns: Sequence[str], path: Path) -> None:
+    missing = {"address", "timestamp", "price"}.difference(columns)
+    if missing:
+        raise DataError(f"{path} is missing columns: {', '.join(sorted(missing))}")
+
+
+def _group_rows(
+    addresses: Sequence[str],
+    names: Sequence[Optional[str]],
+    timestamps: np.ndarray,
+    prices: np.ndarray,
+) -> List[AnySharePriceHistory]:
+    """Split long-format rows into one compact history per vault."""
+    # Normalize each distinct spelling once, then number vaults by first appearance
+    spellings = list(dict.fromkeys(addresses))
+    normalized = dict(zip(spellings, normalize_addresses(spellings)))
+    vault_ids: Dict[str, int] = {}
+    codes = np.empty(len(addresses), dtype=np.int64)
+    for row, address in enumerate(addresses):
+        codes[row] = vault_ids.setdefault(normalized[address], len(vault_ids))
+
+    order = np.argsort(codes, kind="stable")
+    ends = np.cumsum(np.bincount(codes, minlength=len(vault_ids)))
+    histories: List[AnySharePriceHistory] = []
+    start = 0
+    for address, end in zip(vault_ids, ends.tolist()):
+        rows = order[start:end]
+        histories.append(
+            CompactSharePriceHistory(
+                name=names[rows[0]] or address,
+                address=address,
+                timestamps=timestamps[rows],
+                prices=prices[rows],
+            )
+        )
+        start = end
+    return histories
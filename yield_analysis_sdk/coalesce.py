@@ -0,0 +1,196 @@
+"""
+Coalescing of concurrent share price history fetches.
+"""
+
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .exceptions import ConfigurationError
+from .subgraph import (
+    DEFAULT_VAULTS_PER_QUERY,
+    MAX_PAGE_SIZE,
+    SubgraphClient,
+    _format_vault_addresses,
+    get_daily_share_price_history_from_subgraph,
+)
+from .type import Chain, SharePriceHistory
+
+# (chain, underlying_asset_decimals, length, api_key)
+_GroupKey = Tuple[Chain, int, int, str]
+
+
+class CoalescingStats(NamedTuple):
+    """Counters describing the work saved by a CoalescingFetcher."""
+
+    calls: int
+    flights: int
+    requested_addresses: int
+    fetched_addresses: int
+
+
+class _Flight:
+    """One union fetch shared by every caller that asked for its addresses."""
+
+    def __init__(self) -> None:
+        self.addresses: Dict[str, None] = {}
+        self.done = threading.Event()
+        self.histories: Dict[str, SharePriceHistory] = {}
+        self.error: Optional[BaseException] = None
+
+
+class _Group:
+    """Flights of callers that share a chain, window and credentials."""
+
+    def __init__(self) -> None:
+        self.pending: Optional[_Flight] = None
+        self.in_flight: Dict[str, _Flight] = {}
+
+
+class CoalescingFetcher:
+    """
+    Single-flight front for get_daily_share_price_history_from_subgraph.
+
+    Concurrent callers asking for the same chain, window length, decimals and API
+    key share work: an address already being fetched is never requested again
+    while that fetch is in flight, and addresses requested within `linger`
+    seconds of each other are merged into one union query. Each caller receives
+    the histories of its own addresses, in its own order.
+
+    Histories are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        client: Optional[SubgraphClient] = None,
+        linger: float = 0.01,
+        page_size: int = MAX_PAGE_SIZE,
+        vaults_per_query: int = DEFAULT_VAULTS_PER_QUERY,
+    ) -> None:
+        """
+        Args:
+            client: The SubgraphClient to send queries with. A shared default client
+                is used when omitted.
+            linger: Seconds the first caller of a batch waits for others to join
+                before the union query is sent.
+            page_size: Maximum number of rows requested per vault and round trip.
+            vaults_per_query: Maximum number of vaults packed into a single query.
+        """
+        if linger < 0:
+            raise ConfigurationError("linger must not be negative")
+
+        self.client = client
+        self.linger = linger
+        self.page_size = page_size
+        self.vaults_per_query = vaults_per_query
+        self.calls = 0
+        self.flights = 0
+        self.requested_addresses = 0
+        self.fetched_addresses = 0
+        self._groups: Dict[_GroupKey, _Group] = {}
+        self._lock = threading.Lock()
+
+    def get_daily_share_price_history(
+        self,
+        chain: Chain,
+        vault_addresses: List[str],
+        underlying_asset_decimals: int,
+        length: int,
+        api_key: str,
+    ) -> List[SharePriceHistory]:
+        """
+        Get the daily share price history of vaults, sharing fetches with concurrent callers.
+
+        Args:
+            chain: The blockchain chain to query.
+            vault_addresses: A list of vault addresses to query.
+            underlying_asset_decimals: The number of decimals of the underlying asset. e.g. 6 for USDC.
+            length: The number of days to query.
+            api_key: The API key for the subgraph.
+
+        Returns:
+            One SharePriceHistory per vault with data, in the order of vault_addresses.
+        """
+        if not api_key:
+            raise ConfigurationError("SUBGRAPH_API_KEY is required")
+
+        addresses = list(dict.fromkeys(_format_vault_addresses(vault_addresses)))
+        key = (chain, underlying_asset_decimals, length, api_key)
+
+        flights: Dict[str, _Flight] = {}
+        with self._lock:
+            self.calls += 1
+            self.requested_addresses += len(addresses)
+            group = self._groups.setdefault(key, _Group())
+            leader = group.pending is None
+            for address in addresses:
+                flight = group.in_flight.get(address)
+                if flight is None:
+                    if group.pending is None:
+                        group.pending = _Flight()
+                    flight = group.pending
+                    flight.addresses[address] = None
+                flights[address] = flight
+            # Only the caller that opened the pending flight sends it
+            own_flight = group.pending if leader else None
+
+        if own_flight is not None:
+            self._run(key, group, own_flight)
+
+        for flight in dict.fromkeys(flights.values()):
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+
+        return [
+            flights[address].histories[address]
+            for address in addresses
+            if address in flights[address].histories
+        ]
+
+    def stats(self) -> CoalescingStats:
+        """Return a snapshot of the coalescing counters."""
+        with self._lock:
+            return CoalescingStats(
+                calls=self.calls,
+                flights=self.flights,
+                requested_addresses=self.requested_addresses,
+                fetched_addresses=self.fetched_addresses,
+            )
+
+    def _run(self, key: _GroupKey, group: _Group, flight: _Flight) -> None:
+        """Close the pending flight to new callers, fetch it and wake its waiters."""
+        if self.linger > 0:
+            time.sleep(self.linger)
+
+        with self._lock:
+            group.pending = None
+            addresses = list(flight.addresses)
+            for address in addresses:
+                group.in_flight[address] = flight
+            self.flights += 1
+            self.fetched_addresses += len(addresses)
+
+        chain, underlying_asset_decimals, length, api_key = key
+        try:
+            histories = get_daily_share_price_history_from_subgraph(
+                chain,
+                addresses,
+                underlying_asset_decimals,
+                length,
+                api_key,
+                self.page_size,
+                self.vaults_per_query,
+                self.client,
+            )
+            flight.histories = {history.address: history for history in histories}
+        except BaseException as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                for address in addresses:
+                    if group.in_flight.get(address) is flight:
+                        del group.in_flight[address]
+                if not group.in_flight and group.pending is None:
+                    self._groups.pop(key, None)
+            flight.done.set()
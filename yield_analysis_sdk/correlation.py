@@ -0,0 +1,337 @@
+"""
+Cross-vault covariance and correlation of daily share price returns.
+"""
+
+import math
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .alignment import AlignedPrices, align_share_price_histories
+from .batch import FloatArray, IntArray
+from .exceptions import ConfigurationError, DataError
+from .type import AnalysisResponse, AnySharePriceHistory, CorrelationMatrix
+from .validators import normalize_address
+
+# Shrinkage value selecting the Ledoit-Wolf estimate of the shrinkage intensity
+LEDOIT_WOLF = "ledoit-wolf"
+
+Shrinkage = Union[None, float, str]
+
+
+class ReturnCovariance(NamedTuple):
+    """
+    Covariance and correlation of the daily returns of many vaults.
+
+    Entry (i, j) of every matrix describes vaults i and j over the days on which
+    both have a return. Pairs with fewer than min_periods such days are NaN.
+    """
+
+    addresses: List[str]
+    covariance: FloatArray
+    correlation: FloatArray
+    observations: IntArray
+    halflife_days: Optional[float]
+    shrinkage: float
+
+    def to_model(self) -> CorrelationMatrix:
+        """Convert the matrices into a CorrelationMatrix with None for NaN entries."""
+        return CorrelationMatrix(
+            addresses=list(self.addresses),
+            covariance=_nan_to_none(self.covariance),
+            correlation=_nan_to_none(self.correlation),
+            observations=self.observations.tolist(),
+            halflife_days=self.halflife_days,
+            shrinkage=self.shrinkage,
+        )
+
+
+def daily_returns(aligned: AlignedPrices) -> FloatArray:
+    """
+    Daily returns of every vault on an aligned grid.
+
+    Column t is the return from grid day t to day t + 1. A return is only defined
+    when both days were reported and the earlier price is positive, so filled
+    days never contribute artificial zero returns. Undefined returns are NaN.
+    """
+    prices = np.where(aligned.observed, aligned.prices, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        previous = prices[:, :-1]
+        returns: FloatArray = np.where(
+            previous > 0, (prices[:, 1:] - previous) / previous, np.nan
+        )
+    return returns
+
+
+def compute_return_covariance(
+    share_price_histories: Sequence[AnySharePriceHistory],
+    halflife_days: Optional[float] = None,
+    shrinkage: Shrinkage = None,
+    min_periods: int = 2,
+) -> ReturnCovariance:
+    """
+    Estimate the covariance and correlation of daily returns across vaults.
+
+    The histories are aligned on one UTC daily grid, turned into a single
+    (vaults x days) returns matrix and reduced with a handful of matrix products,
+    so the cost is dominated by BLAS rather than by a Python loop over pairs.
+
+    Args:
+        share_price_histories: The histories to compare.
+        halflife_days: Half-life in days of exponentially decaying weights. Equal
+            weights when omitted.
+        shrinkage: Intensity in [0, 1] of the shrinkage towards a scaled
+            identity matrix, or "ledoit-wolf" to estimate it from the data.
+        min_periods: Minimum number of shared return days for a pair.
+
+    Returns:
+        ReturnCovariance with one row and column per history, in input order.
+    """
+    if not share_price_histories:
+        raise DataError("At least one share price history is required")
+
+    aligned = align_share_price_histories(share_price_histories, forward_fill=False)
+    return covariance_from_returns(
+        daily_returns(aligned),
+        aligned.addresses,
+        halflife_days,
+        shrinkage,
+        min_periods,
+    )
+
+
+def covariance_from_returns(
+    returns: FloatArray,
+    addresses: List[str],
+    halflife_days: Optional[float] = None,
+    shrinkage: Shrinkage = None,
+    min_periods: int = 2,
+) -> ReturnCovariance:
+    """
+    Estimate covariance and correlation from a (vaults x days) returns matrix.
+
+    Missing returns are NaN. Each pair uses the days on which both vaults have a
+    return (pairwise-complete estimation); complete matrices take a faster path
+    with a single matrix product.
+
+    Args:
+        returns: Daily returns, one row per vault and one column per day, oldest first.
+        addresses: Vault address of every row.
+        halflife_days: Half-life in days of exponentially decaying weights. Equal
+            weights when omitted.
+        shrinkage: Intensity in [0, 1] of the shrinkage towards a scaled
+            identity matrix, or "ledoit-wolf" to estimate it from the data.
+        min_periods: Minimum number of shared return days for a pair.
+
+    Returns:
+        ReturnCovariance with one row and column per row of returns.
+    """
+    if returns.ndim != 2:
+        raise DataError("Returns matrix must be two-dimensional")
+    if len(addresses) != returns.shape[0]:
+        raise DataError("Expected one address per row of the returns matrix")
+    if halflife_days is not None and halflife_days <= 0:
+        raise ConfigurationError("halflife_days must be positive")
+    if min_periods < 2:
+        raise ConfigurationError("min_periods must be at least 2")
+
+    weights = _decay_weights(returns.shape[1], halflife_days)
+    observed = ~np.isnan(returns)
+    mask = observed.astype(np.float64)
+    # Centering on each vault's own mean keeps the sums below free of cancellation
+    counts = mask.sum(axis=1)
+    means = np.divide(
+        np.nansum(returns, axis=1), counts, out=np.zeros(len(counts)), where=counts > 0
+    )
+    centered = np.where(observed, returns - means[:, None], 0.0)
+    weighted = centered * weights
+
+    observations = (mask @ mask.T).round().astype(np.int64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if observed.all():
+            covariance, correlation = _complete_covariance(centered, weighted, weights)
+        else:
+            covariance, correlation = _pairwise_covariance(
+                centered, weighted, mask, weights
+            )
+
+    intensity = _shrinkage_intensity(shrinkage, centered, weights)
+    if intensity > 0:
+        covariance = _shrink(covariance, intensity)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            correlation = _correlation_from_covariance(covariance)
+
+    insufficient = observations < min_periods
+    covariance[insufficient] = np.nan
+    correlation[insufficient] = np.nan
+    np.fill_diagonal(correlation, np.where(np.diag(insufficient), np.nan, 1.0))
+
+    return ReturnCovariance(
+        addresses=list(addresses),
+        covariance=covariance,
+        correlation=np.clip(correlation, -1.0, 1.0),
+        observations=observations,
+        halflife_days=halflife_days,
+        shrinkage=intensity,
+    )
+
+
+def attach_correlation(
+    response: AnalysisResponse,
+    share_price_histories: Sequence[AnySharePriceHistory],
+    halflife_days: Optional[float] = None,
+    shrinkage: Shrinkage = None,
+    min_periods: int = 2,
+) -> AnalysisResponse:
+    """
+    Return a copy of an AnalysisResponse carrying the correlation of its vaults.
+
+    The matrix follows the order of response.analyses. Histories of vaults that
+    are not in the response are ignored.
+
+    Args:
+        response: The response to extend. It is not modified.
+        share_price_histories: Histories covering every vault of the response.
+        halflife_days: Half-life in days of exponentially decaying weights. Equal
+            weights when omitted.
+        shrinkage: Intensity in [0, 1] of the shrinkage towards a scaled
+            identity matrix, or "ledoit-wolf" to estimate it from the data.
+        min_periods: Minimum number of shared return days for a pair.
+
+    Raises:
+        DataError: If a vault of the response has no history.
+    """
+    histories: Dict[str, AnySharePriceHistory] = {
+        history.address: history for history in share_price_histories
+    }
+    ordered = []
+    missing = []
+    for result in response.analyses:
+        address = normalize_address(result.vault_info.address)
+        history = histories.get(address)
+        if history is None:
+            missing.append(address)
+        else:
+            ordered.append(history)
+    if missing:
+        raise DataError(f"No share price history for vaults: {', '.join(missing)}")
+
+    estimate = compute_return_covariance(ordered, halflife_days, shrinkage, min_periods)
+    return response.model_copy(update={"correlation": estimate.to_model()})
+
+
+def _decay_weights(days: int, halflife_days: Optional[float]) -> FloatArray:
+    """Weight of every day, 1.0 on the most recent one."""
+    if halflife_days is None:
+        return np.ones(days)
+    weights: FloatArray = 0.5 ** (np.arange(days - 1, -1, -1) / halflife_days)
+    return weights
+
+
+def _complete_covariance(
+    centered: FloatArray, weighted: FloatArray, weights: FloatArray
+) -> Tuple[FloatArray, FloatArray]:
+    """Weighted covariance and correlation of a returns matrix without gaps."""
+    total = weights.sum()
+    mean = weighted.sum(axis=1) / total
+    # Unbiased for reliability weights; reduces to n - 1 for equal weights
+    denominator = total - (weights * weights).sum() / total
+    covariance: FloatArray = (weighted @ centered.T - np.outer(mean, mean) * total) / (
+        denominator
+    )
+    return covariance, _correlation_from_covariance(covariance)
+
+
+def _pairwise_covariance(
+    centered: FloatArray, weighted: FloatArray, mask: FloatArray, weights: FloatArray
+) -> Tuple[FloatArray, FloatArray]:
+    """
+    Weighted pairwise-complete covariance and correlation.
+
+    Every sum over the days shared by two vaults is one matrix product with the
+    0/1 observation mask. The correlation uses the variances of each pair's
+    shared days, so it stays within [-1, 1] up to rounding.
+    """
+    weighted_mask = mask * weights
+    total = weighted_mask @ mask.T
+    total_sq = (weighted_mask * weights) @ mask.T
+    # sums[i, j] is the weighted sum of vault i's returns on the days shared with j
+    sums = weighted @ mask.T
+    sums_sq = (weighted * centered) @ mask.T
+    cross = weighted @ centered.T
+
+    denominator = total - total_sq / total
+    covariance: FloatArray = (cross - sums * sums.T / total) / denominator
+    variance = np.maximum((sums_sq - sums * sums / total) / denominator, 0.0)
+    correlation: FloatArray = covariance / np.sqrt(variance * variance.T)
+    return covariance, correlation
+
+
+def _correlation_from_covariance(covariance: FloatArray) -> FloatArray:
+    """Normalize a covariance matrix by the outer product of its standard deviations."""
+    std_dev = np.sqrt(np.maximum(np.diag(covariance), 0.0))
+    correlation: FloatArray = covariance / np.outer(std_dev, std_dev)
+    return correlation
+
+
+def _shrinkage_intensity(
+    shrinkage: Shrinkage, centered: FloatArray, weights: FloatArray
+) -> float:
+    """Resolve the shrinkage argument into an intensity in [0, 1]."""
+    if shrinkage is None:
+        return 0.0
+    if isinstance(shrinkage, str):
+        if shrinkage != LEDOIT_WOLF:
+            raise ConfigurationError(
+                f"Unknown shrinkage {shrinkage!r}, expected a number or {LEDOIT_WOLF!r}"
+            )
+        return _ledoit_wolf_intensity(centered, weights)
+    if not 0 <= shrinkage <= 1:
+        raise ConfigurationError("shrinkage must be between 0 and 1")
+    return float(shrinkage)
+
+
+def _ledoit_wolf_intensity(centered: FloatArray, weights: FloatArray) -> float:
+    """
+    Ledoit-Wolf optimal intensity of shrinkage towards a scaled identity.
+
+    Missing returns count as the vault's mean (zero after centering), and
+    exponential weights enter by rescaling each day's returns by the square root
+    of its normalized weight.
+    """
+    n_vaults, n_days = centered.shape
+    if n_vaults == 0 or n_days == 0:
+        return 0.0
+
+    scale = np.sqrt(weights * n_days / weights.sum())
+    samples = (centered * scale).T
+    sample_covariance = samples.T @ samples / n_days
+
+    mu = np.trace(sample_covariance) / n_vaults
+    norm_sq = float((sample_covariance * sample_covariance).sum())
+    # Squared distance between the sample covariance and the target mu * I
+    delta = norm_sq - 2 * mu * np.trace(sample_covariance) + n_vaults * mu * mu
+    if delta <= 0:
+        return 0.0
+    # Mean squared distance of the per-day outer products from their mean
+    row_norms = (samples * samples).sum(axis=1)
+    beta = (float((row_norms * row_norms).sum()) / n_days - norm_sq) / n_days
+    return float(min(max(beta, 0.0), delta) / delta)
+
+
+def _shrink(covariance: FloatArray, intensity: float) -> FloatArray:
+    """Blend a covariance matrix with the identity scaled by its mean variance."""
+    variances = np.diag(covariance)
+    variances = variances[~np.isnan(variances)]
+    mu = float(variances.mean()) if len(variances) else 0.0
+    shrunk: FloatArray = (1 - intensity) * covariance
+    shrunk[np.diag_indices_from(shrunk)] += intensity * mu
+    return shrunk
+
+
+def _nan_to_none(matrix: FloatArray) -> List[List[Optional[float]]]:
+    """Convert a matrix to nested lists with None in place of NaN."""
+    return [
+        [None if math.isnan(value) else value for value in row]
+        for row in matrix.tolist()
+    ]
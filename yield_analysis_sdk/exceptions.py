@@ -33,3 +33,15 @@ class ValidationError(YieldAnalysisError):
     """Exception raised for validation errors."""
 
     pass
+
+
+class RateLimitError(ConnectionError):
+    """Exception raised when the subgraph keeps rate limiting after every retry."""
+
+    pass
+
+
+class CircuitOpenError(ConnectionError):
+    """Exception raised when requests to a failing endpoint are short-circuited."""
+
+    pass
@@ -0,0 +1,224 @@
+"""
+Columnar export of analysis results to Apache Arrow and Parquet.
+
+Requires the optional pyarrow dependency: pip install "yield-analysis-sdk[parquet]"
+"""
+
+import json
+from enum import Enum
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from .exceptions import ConfigurationError
+from .type import AnalysisResponse, AnalysisResult, PerformanceAnalysis, VaultInfo
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+# Flattened column layout: vault info fields, then performance fields
+VAULT_INFO_COLUMNS = list(VaultInfo.model_fields)
+PERFORMANCE_COLUMNS = list(PerformanceAnalysis.model_fields)
+EXTRA_INFO_COLUMN = "extra_info"
+
+AnalysisResults = Union[AnalysisResponse, Iterable[AnalysisResult]]
+
+
+def _require_pyarrow() -> Any:
+    """Import pyarrow on first use, so importing the SDK does not load it."""
+    try:
+        import pyarrow
+    except ImportError as e:  # pragma: no cover - exercised only without the extra
+        raise ConfigurationError(
+            'pyarrow is required for Arrow/Parquet export: pip install "yield-analysis-sdk[parquet]"'
+        ) from e
+    return pyarrow
+
+
+def _arrow_type(annotation: Any) -> "pa.DataType":
+    """Map a model field annotation to the Arrow type of its column."""
+    pa = _require_pyarrow()
+    if get_origin(annotation) is Union:
+        annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        # Few distinct values per batch, so store them once
+        return pa.dictionary(pa.int32(), pa.string())
+    if annotation is bool:
+        return pa.bool_()
+    if annotation is int:
+        return pa.int64()
+    if annotation is float:
+        return pa.float64()
+    return pa.string()
+
+
+def analysis_schema() -> "pa.Schema":
+    """Return the Arrow schema of flattened analysis results."""
+    pa = _require_pyarrow()
+    fields = [
+        pa.field(name, _arrow_type(field.annotation), nullable=not field.is_required())
+        for model in (VaultInfo, PerformanceAnalysis)
+        for name, field in model.model_fields.items()
+    ]
+    fields.append(pa.field(EXTRA_INFO_COLUMN, pa.string()))
+    return pa.schema(fields)
+
+
+def analysis_results_to_table(results: AnalysisResults) -> "pa.Table":
+    """
+    Flatten analysis results into an Arrow table with one row per vault.
+
+    VaultInfo and PerformanceAnalysis fields become top-level columns and
+    extra_info is stored as a JSON string.
+
+    Args:
+        results: An AnalysisResponse or an iterable of AnalysisResult.
+
+    Returns:
+        Arrow table following analysis_schema().
+    """
+    pa = _require_pyarrow()
+    if isinstance(results, AnalysisResponse):
+        results = results.analyses
+    results = list(results)
+
+    schema = analysis_schema()
+    vault_infos = [result.vault_info for result in results]
+    performances = [result.performance for result in results]
+
+    columns = []
+    for name in VAULT_INFO_COLUMNS:
+        values = [getattr(vault_info, name) for vault_info in vault_infos]
+        if isinstance(schema.field(name).type, pa.DictionaryType):
+            values = [value.value for value in values]
+        columns.append(pa.array(values, type=schema.field(name).type))
+    for name in PERFORMANCE_COLUMNS:
+        columns.append(
+            pa.array(
+                [getattr(performance, name) for performance in performances],
+                type=schema.field(name).type,
+            )
+        )
+    columns.append(
+        pa.array(
+            [
+                None if result.extra_info is None else json.dumps(result.extra_info)
+                for result in results
+            ],
+            type=pa.string(),
+        )
+    )
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def table_to_analysis_results(table: "pa.Table") -> List[AnalysisResult]:
+    """
+    Rebuild AnalysisResult objects from a table written by this module.
+
+    Columns missing from the table fall back to the model defaults, so tables
+    read with a column selection still convert as long as required fields are
+    present.
+    """
+    _require_pyarrow()
+    return [_row_to_result(row) for row in table.to_pylist()]
+
+
+def write_analysis_parquet(
+    results: AnalysisResults,
+    path: Union[str, Path],
+    compression: str = "zstd",
+    row_group_size: Optional[int] = None,
+) -> None:
+    """
+    Write analysis results to a Parquet file.
+
+    Args:
+        results: An AnalysisResponse or an iterable of AnalysisResult.
+        path: Destination file.
+        compression: Parquet compression codec.
+        row_group_size: Maximum number of rows per row group.
+    """
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    pq.write_table(
+        analysis_results_to_table(results),
+        str(path),
+        compression=compression,
+        row_group_size=row_group_size,
+    )
+
+
+def open_analysis_dataset(path: Union[str, Path]) -> "ds.Dataset":
+    """
+    Open one Parquet file or a directory of them lazily.
+
+    Nothing is read until the dataset is scanned, and scans only read the
+    requested columns and the row groups that can match the filter, e.g.
+    dataset.to_table(columns=["address", "apy_30d"], filter=ds.field("apy_30d") > 5).
+    """
+    _require_pyarrow()
+    import pyarrow.dataset as ds
+
+    return ds.dataset(str(path), format="parquet")
+
+
+def read_analysis_table(
+    path: Union[str, Path],
+    columns: Optional[Sequence[str]] = None,
+    filter: Optional["ds.Expression"] = None,
+) -> "pa.Table":
+    """
+    Read selected columns of stored analysis results.
+
+    Args:
+        path: A Parquet file or a directory of them.
+        columns: Columns to read, all of them by default.
+        filter: Optional pyarrow.dataset expression selecting rows.
+
+    Returns:
+        Arrow table with the requested columns.
+    """
+    return open_analysis_dataset(path).to_table(
+        columns=None if columns is None else list(columns), filter=filter
+    )
+
+
+def iter_analysis_results(
+    path: Union[str, Path], batch_size: int = 1024
+) -> Iterator[AnalysisResult]:
+    """
+    Yield stored analysis results one at a time, reading `batch_size` rows at once.
+
+    Args:
+        path: A Parquet file or a directory of them.
+        batch_size: Number of rows decoded per batch.
+    """
+    for batch in open_analysis_dataset(path).to_batches(batch_size=batch_size):
+        for row in batch.to_pylist():
+            yield _row_to_result(row)
+
+
+def _row_to_result(row: Dict[str, Any]) -> AnalysisResult:
+    extra_info = row.get(EXTRA_INFO_COLUMN)
+    return AnalysisResult(
+        vault_info=VaultInfo.model_validate(
+            {name: row[name] for name in VAULT_INFO_COLUMNS if name in row}
+        ),
+        performance=PerformanceAnalysis.model_validate(
+            {name: row[name] for name in PERFORMANCE_COLUMNS if name in row}
+        ),
+        extra_info=None if extra_info is None else json.loads(extra_info),
+    )
@@ -0,0 +1,146 @@
+"""
+Incremental yield analysis for histories that grow one daily price at a time.
+"""
+
+import math
+from collections import deque
+from typing import Deque, Iterable, Optional, Tuple
+
+from .analysis import _annualize_return
+from .exceptions import DataError
+from .type import AnySharePriceHistory, PerformanceAnalysis
+
+# Longest APY period reported by PerformanceAnalysis
+_APY_WINDOW = 90
+_VOLATILITY_WINDOW = 30
+
+
+class IncrementalYieldAnalyzer:
+    """
+    Stateful analyzer that updates yield metrics in O(1) per appended price.
+
+    The analyzer keeps a running peak and maximum drawdown, Welford mean and
+    variance of all daily returns for the Sharpe ratio, a sliding-window variance
+    over the last 30 returns for volatility, and the last 90 prices for the APYs.
+    analysis() produces the same PerformanceAnalysis as
+    analyze_yield_with_daily_share_price on the full history.
+    """
+
+    def __init__(self, risk_free_rate: float = 0.05) -> None:
+        """
+        Args:
+            risk_free_rate: Annual risk-free rate (default 0.05 = 5% for current market conditions)
+        """
+        self.risk_free_rate = risk_free_rate
+        self.count = 0
+        self.last_timestamp: Optional[int] = None
+
+        self._prices: Deque[float] = deque(maxlen=_APY_WINDOW)
+        self._peak = 0.0
+        self._max_drawdown = 0.0
+
+        # Welford state over every return
+        self._return_count = 0
+        self._return_mean = 0.0
+        self._return_m2 = 0.0
+
+        # Sliding Welford state over the trailing volatility window
+        self._window: Deque[float] = deque(maxlen=_VOLATILITY_WINDOW)
+        self._window_mean = 0.0
+        self._window_m2 = 0.0
+
+    @classmethod
+    def from_history(
+        cls, share_price_history: AnySharePriceHistory, risk_free_rate: float = 0.05
+    ) -> "IncrementalYieldAnalyzer":
+        """Create an analyzer seeded with an existing history."""
+        analyzer = cls(risk_free_rate)
+        points = share_price_history.price_history
+        if not share_price_history.is_sorted:
+            points = sorted(points, key=lambda x: x[0])
+        analyzer.extend(points)
+        return analyzer
+
+    def extend(self, points: Iterable[Tuple[int, float]]) -> None:
+        """Append several (timestamp, price) points in timestamp order."""
+        for timestamp, price in points:
+            self.update(timestamp, price)
+
+    def update(self, timestamp: int, price: float) -> None:
+        """Append the next (timestamp, price) point."""
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            raise DataError(
+                f"Prices must be appended in timestamp order: {timestamp} <= {self.last_timestamp}"
+            )
+
+        if self._prices:
+            previous = self._prices[-1]
+            if previous > 0:  # Avoid division by zero
+                self._add_return((price - previous) / previous)
+
+        if self.count == 0 or price > self._peak:
+            self._peak = price
+        else:
+            self._max_drawdown = max(
+                self._max_drawdown, (self._peak - price) / self._peak
+            )
+
+        self._prices.append(price)
+        self.count += 1
+        self.last_timestamp = timestamp
+
+    def analysis(self) -> PerformanceAnalysis:
+        """Return the metrics of every price appended so far."""
+        if self.count < 2:
+            raise DataError("At least 2 daily share prices are required for analysis")
+
+        return PerformanceAnalysis.construct_trusted(
+            apy_7d=self._apy(7),
+            apy_30d=self._apy(30),
+            apy_90d=self._apy(90),
+            volatility_30d=self._volatility(),
+            max_drawdown=self._max_drawdown * 100,
+            sharpe_ratio=self._sharpe_ratio(),
+            analysis_period_days=self.count,
+        )
+
+    def _add_return(self, value: float) -> None:
+        self._return_count += 1
+        delta = value - self._return_mean
+        self._return_mean += delta / self._return_count
+        self._return_m2 += delta * (value - self._return_mean)
+
+        if len(self._window) < _VOLATILITY_WINDOW:
+            delta = value - self._window_mean
+            self._window_mean += delta / (len(self._window) + 1)
+            self._window_m2 += delta * (value - self._window_mean)
+        else:
+            # Replace the oldest return while keeping the window size fixed
+            oldest = self._window[0]
+            previous_mean = self._window_mean
+            self._window_mean += (value - oldest) / _VOLATILITY_WINDOW
+            self._window_m2 += (value - oldest) * (
+                value - self._window_mean + oldest - previous_mean
+            )
+        self._window.append(value)
+
+    def _apy(self, days: int) -> float:
+        if self.count < days:
+            return 0.0
+        return _annualize_return(self._prices[-days], self._prices[-1], days)
+
+    def _volatility(self) -> float:
+        if len(self._window) < _VOLATILITY_WINDOW:
+            return 0.0
+        variance = max(self._window_m2, 0.0) / (_VOLATILITY_WINDOW - 1)
+        return math.sqrt(variance) * math.sqrt(365) * 100
+
+    def _sharpe_ratio(self) -> float:
+        if self._return_count < 2:
+            return 0.0
+        std_dev = math.sqrt(max(self._return_m2, 0.0) / (self._return_count - 1))
+        if std_dev == 0:
+            return 0.0
+        annualized_return = self._return_mean * 365
+        annualized_volatility = std_dev * math.sqrt(365)
+        return (annualized_return - self.risk_free_rate) / annualized_volatility
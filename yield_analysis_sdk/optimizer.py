@@ -0,0 +1,479 @@
+"""
+Capacity- and cost-constrained portfolio allocation across analyzed vaults.
+"""
+
+import math
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .batch import FloatArray
+from .correlation import ReturnCovariance
+from .exceptions import ConfigurationError, DataError
+from .type import AnalysisResult
+
+# Covariances are estimated from daily returns
+DAYS_PER_YEAR = 365
+
+# Risk aversions swept by maximize_sharpe_allocation, smallest risk first
+DEFAULT_RISK_AVERSIONS = tuple(float(value) for value in np.logspace(5, 0, 11))
+
+CovarianceInput = Union[ReturnCovariance, FloatArray]
+
+
+class Allocation(NamedTuple):
+    """
+    Portfolio weights over the vaults of an optimization, in input order.
+
+    Returns, volatility and costs are annualized percentages, like the metrics
+    of PerformanceAnalysis. Weights sum to one unless vault capacities cannot
+    absorb the whole budget; the remainder stays undeployed.
+    """
+
+    addresses: List[str]
+    weights: FloatArray
+    amounts: Optional[FloatArray]
+    expected_return: float
+    volatility: float
+    cost: float
+    sharpe_ratio: float
+    risk_aversion: float
+    iterations: int
+    converged: bool
+    # Solver state reused when the allocation warm-starts the next run
+    lipschitz: float
+    multiplier: float
+
+    def to_dict(self) -> Dict[str, float]:
+        """Return the weights keyed by vault address."""
+        return dict(zip(self.addresses, self.weights.tolist()))
+
+
+class _Problem(NamedTuple):
+    """Vectorized inputs of one optimization, in annual fractions."""
+
+    addresses: List[str]
+    mean: FloatArray
+    covariance: FloatArray
+    upper: FloatArray
+    budget: float
+    anchor: FloatArray
+    entry_cost: FloatArray
+    exit_cost: FloatArray
+    risk_free_rate: float
+
+
+def optimize_allocation(
+    results: Sequence[AnalysisResult],
+    covariance: CovarianceInput,
+    risk_aversion: float = 10.0,
+    total_amount: Optional[float] = None,
+    current_weights: Optional[Mapping[str, float]] = None,
+    max_weight: float = 1.0,
+    holding_period_days: float = 30.0,
+    return_metric: str = "apy_30d",
+    warm_start: Optional[Allocation] = None,
+    tolerance: float = 1e-7,
+    max_iterations: int = 5000,
+) -> Allocation:
+    """
+    Solve a capacity- and cost-constrained mean-variance allocation.
+
+    Maximizes expected return minus risk_aversion / 2 times variance minus
+    amortized entry and exit costs, over long-only weights that respect each
+    vault's capacity and max_weight. The problem is solved with accelerated
+    projected (proximal) gradient steps in NumPy: each step costs one
+    matrix-vector product, and the projection onto the capacity box and budget
+    is exact.
+
+    Args:
+        results: Analyzed vaults to allocate across.
+        covariance: Covariance of daily returns, either a ReturnCovariance
+            covering every vault or a matrix in the order of results. Unknown
+            (NaN) covariances between vaults are treated as zero, and gapped or
+            pairwise-complete estimates are projected onto the nearest positive
+            semidefinite matrix.
+        risk_aversion: Weight of the variance penalty.
+        total_amount: Amount of underlying token to allocate. Enables the
+            max_deposit_amount capacity of each vault and the returned amounts.
+        current_weights: Current weights by vault address, from which entry
+            and exit costs are charged. Defaults to undeployed capital, so every
+            allocation pays entry costs.
+        max_weight: Largest weight of any single vault.
+        holding_period_days: Expected holding period over which one-off entry
+            and exit costs are amortized.
+        return_metric: PerformanceAnalysis field used as expected return.
+        warm_start: Allocation of a previous run, e.g. yesterday's. Its weights
+            and solver state seed the solver, which usually cuts the number of
+            iterations sharply when inputs changed little.
+        tolerance: Convergence threshold on the largest weight change.
+        max_iterations: Maximum number of gradient steps.
+
+    Returns:
+        Allocation with one weight per result, in input order.
+    """
+    if risk_aversion < 0:
+        raise ConfigurationError("risk_aversion must not be negative")
+    problem = _build_problem(
+        results,
+        covariance,
+        total_amount,
+        current_weights,
+        max_weight,
+        holding_period_days,
+        return_metric,
+    )
+    return _solve(
+        problem, risk_aversion, total_amount, warm_start, tolerance, max_iterations
+    )
+
+
+def maximize_sharpe_allocation(
+    results: Sequence[AnalysisResult],
+    covariance: CovarianceInput,
+    total_amount: Optional[float] = None,
+    current_weights: Optional[Mapping[str, float]] = None,
+    max_weight: float = 1.0,
+    holding_period_days: float = 30.0,
+    return_metric: str = "apy_30d",
+    risk_aversions: Sequence[float] = DEFAULT_RISK_AVERSIONS,
+    warm_start: Optional[Allocation] = None,
+    tolerance: float = 1e-7,
+    max_iterations: int = 5000,
+) -> Allocation:
+    """
+    Find the constrained allocation with the highest net Sharpe ratio.
+
+    Costs and capacities make the maximum Sharpe problem non-convex, so the
+    mean-variance frontier is traced over risk_aversions instead, each solve
+    warm-started from the previous one, and the allocation with the best
+    (return - cost - risk-free rate) / volatility is returned.
+
+    Args:
+        results: Analyzed vaults to allocate across.
+        covariance: Covariance of daily returns, either a ReturnCovariance
+            covering every vault or a matrix in the order of results.
+        total_amount: Amount of underlying token to allocate.
+        current_weights: Current weights by vault address.
+        max_weight: Largest weight of any single vault.
+        holding_period_days: Expected holding period over which one-off entry
+            and exit costs are amortized.
+        return_metric: PerformanceAnalysis field used as expected return.
+        risk_aversions: Points of the frontier to evaluate.
+        warm_start: Allocation of a previous run seeding the first solve.
+        tolerance: Convergence threshold on the largest weight change.
+        max_iterations: Maximum number of gradient steps per solve.
+
+    Returns:
+        The Allocation with the highest Sharpe ratio among the frontier points.
+    """
+    if not risk_aversions:
+        raise ConfigurationError("At least one risk aversion is required")
+    if min(risk_aversions) < 0:
+        raise ConfigurationError("risk_aversion must not be negative")
+    problem = _build_problem(
+        results,
+        covariance,
+        total_amount,
+        current_weights,
+        max_weight,
+        holding_period_days,
+        return_metric,
+    )
+
+    allocations = []
+    for risk_aversion in risk_aversions:
+        warm_start = _solve(
+            problem,
+            float(risk_aversion),
+            total_amount,
+            warm_start,
+            tolerance,
+            max_iterations,
+        )
+        allocations.append(warm_start)
+    # The first of equally good allocations takes the least risk
+    return max(allocations, key=lambda allocation: allocation.sharpe_ratio)
+
+
+def _build_problem(
+    results: Sequence[AnalysisResult],
+    covariance: CovarianceInput,
+    total_amount: Optional[float],
+    current_weights: Optional[Mapping[str, float]],
+    max_weight: float,
+    holding_period_days: float,
+    return_metric: str,
+) -> _Problem:
+    """Validate the inputs and gather them into annualized arrays."""
+    if not results:
+        raise DataError("At least one analysis result is required")
+    if total_amount is not None and total_amount <= 0:
+        raise ConfigurationError("total_amount must be positive")
+    if not 0 < max_weight <= 1:
+        raise ConfigurationError("max_weight must be in (0, 1]")
+    if holding_period_days <= 0:
+        raise ConfigurationError("holding_period_days must be positive")
+
+    addresses = [result.vault_info.address for result in results]
+    try:
+        mean = np.array(
+            [getattr(result.performance, return_metric) for result in results],
+            dtype=np.float64,
+        )
+    except (AttributeError, TypeError) as e:
+        raise ConfigurationError(f"Unknown return metric: {return_metric}") from e
+    if np.isnan(mean).any():
+        raise DataError(f"Missing {return_metric} for some vaults")
+
+    upper = np.full(len(results), max_weight)
+    if total_amount is not None:
+        capacity = np.array(
+            [result.vault_info.max_deposit_amount for result in results]
+        )
+        upper = np.minimum(upper, np.maximum(capacity, 0.0) / total_amount)
+
+    anchor = np.zeros(len(results))
+    if current_weights is not None:
+        anchor = np.array(
+            [current_weights.get(address, 0.0) for address in addresses],
+            dtype=np.float64,
+        )
+
+    # One-off costs as annual fractions over the holding period
+    amortization = DAYS_PER_YEAR / holding_period_days / 10_000
+    entry_cost = (
+        np.array([result.vault_info.entry_cost_bps for result in results])
+        * amortization
+    )
+    exit_cost = (
+        np.array([result.vault_info.exit_cost_bps for result in results]) * amortization
+    )
+
+    return _Problem(
+        addresses=addresses,
+        mean=mean / 100,
+        covariance=_daily_covariance(covariance, addresses) * DAYS_PER_YEAR,
+        upper=upper,
+        budget=min(1.0, float(upper.sum())),
+        anchor=anchor,
+        entry_cost=entry_cost,
+        exit_cost=exit_cost,
+        risk_free_rate=float(
+            np.mean([result.vault_info.risk_free_rate for result in results])
+        ),
+    )
+
+
+def _daily_covariance(covariance: CovarianceInput, addresses: List[str]) -> FloatArray:
+    """
+    Return the daily covariance in the order of addresses, positive semidefinite.
+
+    Unknown (NaN) covariances are set to zero. Such a matrix, like any pairwise-
+    complete estimate, need not be positive semidefinite, which would make the
+    objective non-convex, so it is replaced by the nearest positive semidefinite
+    matrix. Complete matrices are used as given.
+    """
+    pairwise = False
+    if isinstance(covariance, ReturnCovariance):
+        index = {address: row for row, address in enumerate(covariance.addresses)}
+        missing = [address for address in addresses if address not in index]
+        if missing:
+            raise DataError(f"No covariance for vaults: {', '.join(missing)}")
+        rows = np.array([index[address] for address in addresses], dtype=np.int64)
+        matrix = covariance.covariance[np.ix_(rows, rows)]
+        observations = covariance.observations[np.ix_(rows, rows)]
+        # Pairs estimated over different days
+        pairwise = np.unique(observations).size > 1
+    else:
+        matrix = np.asarray(covariance, dtype=np.float64)
+        if matrix.shape != (len(addresses), len(addresses)):
+            raise DataError("Covariance matrix must have one row per vault")
+
+    if np.isnan(np.diag(matrix)).any():
+        raise DataError("Covariance matrix has vaults without a variance")
+    gaps = np.isnan(matrix)
+    if not (pairwise or gaps.any()):
+        return matrix
+    return _nearest_psd(np.where(gaps, 0.0, matrix))
+
+
+def _nearest_psd(matrix: FloatArray) -> FloatArray:
+    """Nearest positive semidefinite matrix in Frobenius norm, by eigenvalue clipping."""
+    symmetric: FloatArray = (matrix + matrix.T) / 2
+    eigenvalues, eigenvectors = np.linalg.eigh(symmetric)
+    if eigenvalues[0] >= 0:
+        return symmetric
+    projected = (eigenvectors * np.maximum(eigenvalues, 0.0)) @ eigenvectors.T
+    resolved: FloatArray = (projected + projected.T) / 2
+    return resolved
+
+
+def _prox(
+    point: FloatArray, step: float, problem: _Problem, multiplier: float
+) -> Tuple[FloatArray, float]:
+    """
+    Proximal step of the amortized costs onto the feasible set.
+
+    Minimizes ||w - point||^2 / 2 + step * cost(w) subject to 0 <= w <= upper
+    and sum(w) = budget. For a fixed budget multiplier the problem separates per
+    vault into a closed form; the multiplier is found with safeguarded Newton
+    steps, starting from the previous one.
+    """
+    entry = problem.entry_cost * step
+    exit_cost = problem.exit_cost * step
+    anchor = problem.anchor
+    upper = problem.upper
+
+    # The budget is met between these multipliers
+    low = float(np.min(point - entry - upper))
+    high = float(np.max(point + exit_cost))
+    multiplier = min(max(multiplier, low), high)
+
+    for _ in range(100):
+        shifted = point - multiplier
+        # Moving away from the current weight pays the entry or exit cost
+        weights = np.where(
+            shifted > anchor + entry,
+            shifted - entry,
+            np.where(shifted < anchor - exit_cost, shifted + exit_cost, anchor),
+        )
+        weights = np.clip(weights, 0.0, upper)
+        excess = float(weights.sum()) - problem.budget
+        if abs(excess) <= 1e-12:
+            break
+        if excess > 0:
+            low = multiplier
+        else:
+            high = multiplier
+        # Weights strictly inside a linear piece move one for one with the multiplier
+        free = int(
+            np.count_nonzero(
+                (weights > 0)
+                & (weights < upper)
+                & ((shifted > anchor + entry) | (shifted < anchor - exit_cost))
+            )
+        )
+        candidate = multiplier + excess / free if free else math.nan
+        multiplier = candidate if low < candidate < high else (low + high) / 2
+    return weights, multiplier
+
+
+def _solve(
+    problem: _Problem,
+    risk_aversion: float,
+    total_amount: Optional[float],
+    warm_start: Optional[Allocation],
+    tolerance: float,
+    max_iterations: int,
+) -> Allocation:
+    """Run accelerated proximal gradient descent with backtracking and restarts."""
+    covariance = problem.covariance
+    mean = problem.mean
+
+    if warm_start is not None:
+        previous = warm_start.to_dict()
+        start = np.array([previous.get(address, 0.0) for address in problem.addresses])
+        # The curvature of the objective scales with the risk aversion
+        lipschitz = warm_start.lipschitz * risk_aversion
+        if warm_start.risk_aversion > 0:
+            lipschitz /= warm_start.risk_aversion
+        multiplier = warm_start.multiplier
+    else:
+        start = np.full(len(mean), problem.budget / len(mean))
+        lipschitz = risk_aversion * float(np.trace(covariance)) / len(mean)
+        multiplier = 0.0
+    # Without risk aversion the step is unbounded; cap it where the prox would
+    # otherwise lose precision to cancellation
+    lipschitz = max(lipschitz, 1e-3 * float(np.max(np.abs(mean))), 1e-12)
+    # A zero step projects the start onto the feasible set
+    weights, multiplier = _prox(start, 0.0, problem, multiplier)
+
+    product = covariance @ weights
+    previous_weights, previous_product = weights, product
+    momentum = 1.0
+    converged = False
+    iterations = 0
+
+    while iterations < max_iterations:
+        iterations += 1
+        next_momentum = (1 + math.sqrt(1 + 4 * momentum * momentum)) / 2
+        beta = (momentum - 1) / next_momentum
+        point = weights + beta * (weights - previous_weights)
+        # The covariance product is linear, so the extrapolated point needs none
+        point_product = product + beta * (product - previous_product)
+        gradient = risk_aversion * point_product - mean
+        point_value = risk_aversion / 2 * point @ point_product - mean @ point
+
+        while True:
+            candidate, multiplier = _prox(
+                point - gradient / lipschitz, 1 / lipschitz, problem, multiplier
+            )
+            candidate_product = covariance @ candidate
+            step = candidate - point
+            value = risk_aversion / 2 * candidate @ candidate_product - mean @ candidate
+            bound = point_value + gradient @ step + lipschitz / 2 * step @ step
+            if value <= bound + 1e-15 * abs(bound):
+                break
+            lipschitz *= 2
+
+        # Restart the momentum when it points uphill
+        if (point - candidate) @ (candidate - weights) > 0:
+            next_momentum = 1.0
+        change = float(np.max(np.abs(candidate - weights)))
+        previous_weights, previous_product = weights, product
+        weights, product = candidate, candidate_product
+        momentum = next_momentum
+        if change <= tolerance:
+            converged = True
+            break
+
+    return _allocation(
+        problem,
+        weights,
+        product,
+        risk_aversion,
+        total_amount,
+        iterations,
+        converged,
+        lipschitz,
+        multiplier,
+    )
+
+
+def _allocation(
+    problem: _Problem,
+    weights: FloatArray,
+    product: FloatArray,
+    risk_aversion: float,
+    total_amount: Optional[float],
+    iterations: int,
+    converged: bool,
+    lipschitz: float,
+    multiplier: float,
+) -> Allocation:
+    """Summarize solved weights in the percent units of PerformanceAnalysis."""
+    expected_return = float(problem.mean @ weights)
+    volatility = math.sqrt(max(float(weights @ product), 0.0))
+    moves = weights - problem.anchor
+    cost = float(
+        problem.entry_cost @ np.maximum(moves, 0.0)
+        + problem.exit_cost @ np.maximum(-moves, 0.0)
+    )
+    excess_return = expected_return - cost - problem.risk_free_rate
+    sharpe_ratio = excess_return / volatility if volatility > 0 else 0.0
+
+    return Allocation(
+        addresses=list(problem.addresses),
+        weights=weights,
+        amounts=None if total_amount is None else weights * total_amount,
+        expected_return=expected_return * 100,
+        volatility=volatility * 100,
+        cost=cost * 100,
+        sharpe_ratio=sharpe_ratio,
+        risk_aversion=risk_aversion,
+        iterations=iterations,
+        converged=converged,
+        lipschitz=lipschitz,
+        multiplier=multiplier,
+    )
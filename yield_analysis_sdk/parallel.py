@@ -0,0 +1,156 @@
+"""
+Multi-process yield analysis for large vault universes.
+"""
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch import (
+    BatchPerformance,
+    FloatArray,
+    _check_left_padded,
+    compute_performance_batch,
+    pack_share_price_histories,
+)
+from .exceptions import ConfigurationError, DataError
+from .type import AnySharePriceHistory, PerformanceAnalysis
+
+# Rows analyzed by a single worker task
+DEFAULT_PARALLEL_CHUNK_SIZE = 256
+
+
+def _analyze_shared_rows(
+    name: str,
+    shape: Tuple[int, int],
+    start: int,
+    stop: int,
+    risk_free_rate: float,
+) -> Tuple[int, BatchPerformance]:
+    """Worker task: analyze rows [start, stop) of the shared price matrix."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        prices: FloatArray = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        # The metrics are freshly allocated arrays, not views of the mapping, so
+        # only they travel back to the parent
+        return start, compute_performance_batch(prices[start:stop], risk_free_rate)
+    finally:
+        shm.close()
+
+
+def compute_performance_parallel(
+    prices: FloatArray,
+    risk_free_rate: float = 0.05,
+    max_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_PARALLEL_CHUNK_SIZE,
+    executor: Optional[Executor] = None,
+) -> BatchPerformance:
+    """
+    Compute performance metrics for every row of a packed price matrix on many cores.
+
+    The matrix is copied once into shared memory. Workers attach to it and analyze
+    chunks of rows, so no price data is pickled.
+
+    Args:
+        prices: Right-aligned, NaN left-padded price matrix as produced by
+            pack_share_price_histories.
+        risk_free_rate: Annual risk-free rate used for the Sharpe ratio.
+        max_workers: Number of worker processes. Defaults to the number of CPUs.
+        chunk_size: Number of rows per worker task.
+        executor: Optional process pool to reuse between calls.
+
+    Returns:
+        BatchPerformance with one entry per row, in row order.
+
+    Raises:
+        DataError: If the matrix is not two-dimensional or a row has NaN anywhere
+            but in its left padding.
+    """
+    if prices.ndim != 2:
+        raise DataError("Price matrix must be two-dimensional")
+    if chunk_size < 1:
+        raise ConfigurationError("chunk_size must be positive")
+    _check_left_padded(prices)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    n_vaults = prices.shape[0]
+    if n_vaults <= chunk_size or (executor is None and max_workers <= 1):
+        return compute_performance_batch(prices, risk_free_rate)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(prices.nbytes, 1))
+    owns_executor = executor is None
+    pool = executor or ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        # Only a temporary view is used, so nothing can touch the mapping
+        # after close()
+        np.ndarray(prices.shape, dtype=np.float64, buffer=shm.buf)[:] = prices
+
+        futures = [
+            pool.submit(
+                _analyze_shared_rows,
+                shm.name,
+                prices.shape,
+                start,
+                min(start + chunk_size, n_vaults),
+                risk_free_rate,
+            )
+            for start in range(0, n_vaults, chunk_size)
+        ]
+
+        columns = [np.zeros(n_vaults) for _ in range(6)]
+        analysis_period_days = np.zeros(n_vaults, dtype=np.int64)
+        for future in futures:
+            start, block = future.result()
+            stop = start + len(block.analysis_period_days)
+            for column, values in zip(columns, block[:6]):
+                column[start:stop] = values
+            analysis_period_days[start:stop] = block.analysis_period_days
+    finally:
+        if owns_executor:
+            pool.shutdown()
+        shm.close()
+        shm.unlink()
+
+    apy_7d, apy_30d, apy_90d, volatility_30d, max_drawdown, sharpe_ratio = columns
+    return BatchPerformance(
+        apy_7d=apy_7d,
+        apy_30d=apy_30d,
+        apy_90d=apy_90d,
+        volatility_30d=volatility_30d,
+        max_drawdown=max_drawdown,
+        sharpe_ratio=sharpe_ratio,
+        analysis_period_days=analysis_period_days,
+    )
+
+
+def analyze_yield_parallel(
+    share_price_histories: Sequence[AnySharePriceHistory],
+    risk_free_rate: float = 0.05,
+    max_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_PARALLEL_CHUNK_SIZE,
+    executor: Optional[Executor] = None,
+) -> List[PerformanceAnalysis]:
+    """
+    Analyze many share price histories across a pool of worker processes.
+
+    Args:
+        share_price_histories: The histories to analyze.
+        risk_free_rate: Annual risk-free rate (default 0.05 = 5% for current market conditions)
+        max_workers: Number of worker processes. Defaults to the number of CPUs.
+        chunk_size: Number of vaults per worker task.
+        executor: Optional process pool to reuse between calls.
+
+    Returns:
+        One PerformanceAnalysis per history, in input order.
+    """
+    if not share_price_histories:
+        return []
+
+    prices, _ = pack_share_price_histories(share_price_histories)
+    return compute_performance_parallel(
+        prices, risk_free_rate, max_workers, chunk_size, executor
+    ).to_performance_analyses()
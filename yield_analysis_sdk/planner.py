@@ -0,0 +1,187 @@
+"""
+Planning and fetching of share price histories for mixed-chain analysis requests.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .async_subgraph import (
+    AsyncSubgraphClient,
+    get_daily_share_price_history_from_subgraph_async,
+)
+from .exceptions import ConfigurationError
+from .subgraph import (
+    DEFAULT_VAULTS_PER_QUERY,
+    MAX_PAGE_SIZE,
+    SUBGRAPH_QUERY_URLS,
+    SubgraphClient,
+    get_daily_share_price_history_from_subgraph,
+)
+from .type import AnalysisRequest, Chain, SharePriceHistory
+from .validators import normalize_addresses
+
+ChainHistories = List[Tuple[Chain, SharePriceHistory]]
+
+
+def plan_analysis_request(request: AnalysisRequest) -> Dict[Chain, List[str]]:
+    """
+    Group the strategies of a request by chain.
+
+    Args:
+        request: The analysis request to plan.
+
+    Returns:
+        Normalized, de-duplicated vault addresses per chain, with chains and
+        addresses in order of first appearance.
+
+    Raises:
+        ConfigurationError: If any strategy is on a chain without a configured
+            subgraph. All such chains are reported before anything is fetched.
+    """
+    addresses = normalize_addresses(strategy.address for strategy in request.strategies)
+    plan: Dict[Chain, Dict[str, None]] = {}
+    for strategy, address in zip(request.strategies, addresses):
+        plan.setdefault(strategy.chain, {})[address] = None
+
+    missing = [chain.value for chain in plan if SUBGRAPH_QUERY_URLS.get(chain) is None]
+    if missing:
+        raise ConfigurationError(
+            f"No subgraph configured for chains: {', '.join(missing)}"
+        )
+    return {chain: list(chain_addresses) for chain, chain_addresses in plan.items()}
+
+
+def _merge_in_request_order(
+    request: AnalysisRequest, histories_by_chain: Dict[Chain, List[SharePriceHistory]]
+) -> ChainHistories:
+    """Order fetched histories like the strategies of the request."""
+    by_vault = {
+        (chain, history.address): history
+        for chain, histories in histories_by_chain.items()
+        for history in histories
+    }
+    addresses = normalize_addresses(strategy.address for strategy in request.strategies)
+    merged: ChainHistories = []
+    for strategy, address in zip(request.strategies, addresses):
+        history = by_vault.get((strategy.chain, address))
+        if history is not None:
+            merged.append((strategy.chain, history))
+    return merged
+
+
+def get_share_price_histories_for_request(
+    request: AnalysisRequest,
+    underlying_asset_decimals: int,
+    length: int,
+    api_key: str,
+    page_size: int = MAX_PAGE_SIZE,
+    vaults_per_query: int = DEFAULT_VAULTS_PER_QUERY,
+    client: Optional[SubgraphClient] = None,
+) -> ChainHistories:
+    """
+    Fetch the share price histories of every strategy of a mixed-chain request.
+
+    Strategies are grouped by chain and each chain is fetched with batched
+    queries on its own thread, so a request spanning several chains takes about
+    as long as its slowest chain.
+
+    Args:
+        request: The analysis request whose strategies are fetched.
+        underlying_asset_decimals: The number of decimals of the underlying asset. e.g. 6 for USDC.
+        length: The number of days to query.
+        api_key: The API key for the subgraph.
+        page_size: Maximum number of rows requested per vault and round trip.
+        vaults_per_query: Maximum number of vaults packed into a single query.
+        client: The SubgraphClient to send queries with. A shared default client is
+            used when omitted.
+
+    Returns:
+        One (chain, history) pair per strategy with data, in request order.
+    """
+    if not api_key:
+        raise ConfigurationError("SUBGRAPH_API_KEY is required")
+
+    plan = plan_analysis_request(request)
+    if not plan:
+        return []
+
+    with ThreadPoolExecutor(max_workers=len(plan)) as executor:
+        futures = {
+            chain: executor.submit(
+                get_daily_share_price_history_from_subgraph,
+                chain,
+                addresses,
+                underlying_asset_decimals,
+                length,
+                api_key,
+                page_size,
+                vaults_per_query,
+                client,
+            )
+            for chain, addresses in plan.items()
+        }
+        histories_by_chain = {
+            chain: future.result() for chain, future in futures.items()
+        }
+    return _merge_in_request_order(request, histories_by_chain)
+
+
+async def get_share_price_histories_for_request_async(
+    request: AnalysisRequest,
+    underlying_asset_decimals: int,
+    length: int,
+    api_key: str,
+    page_size: int = MAX_PAGE_SIZE,
+    vaults_per_query: int = DEFAULT_VAULTS_PER_QUERY,
+    client: Optional[AsyncSubgraphClient] = None,
+) -> ChainHistories:
+    """
+    Asynchronous counterpart of get_share_price_histories_for_request.
+
+    Every chain, and every address chunk within a chain, is fetched concurrently
+    through one AsyncSubgraphClient.
+
+    Args:
+        request: The analysis request whose strategies are fetched.
+        underlying_asset_decimals: The number of decimals of the underlying asset. e.g. 6 for USDC.
+        length: The number of days to query.
+        api_key: The API key for the subgraph.
+        page_size: Maximum number of rows requested per vault and round trip.
+        vaults_per_query: Maximum number of vaults packed into a single query.
+        client: The AsyncSubgraphClient to send queries with. A temporary client is
+            created and closed when omitted.
+
+    Returns:
+        One (chain, history) pair per strategy with data, in request order.
+    """
+    if not api_key:
+        raise ConfigurationError("SUBGRAPH_API_KEY is required")
+
+    plan = plan_analysis_request(request)
+    if not plan:
+        return []
+
+    owns_client = client is None
+    if client is None:
+        client = AsyncSubgraphClient()
+    try:
+        results = await asyncio.gather(
+            *(
+                get_daily_share_price_history_from_subgraph_async(
+                    chain,
+                    addresses,
+                    underlying_asset_decimals,
+                    length,
+                    api_key,
+                    page_size,
+                    vaults_per_query,
+                    client,
+                )
+                for chain, addresses in plan.items()
+            )
+        )
+    finally:
+        if owns_client:
+            await client.aclose()
+    return _merge_in_request_order(request, dict(zip(plan, results)))
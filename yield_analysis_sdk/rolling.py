@@ -0,0 +1,217 @@
+"""
+Rolling yield analytics: every metric of PerformanceAnalysis as a daily time series.
+"""
+
+import math
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .analysis import VOLATILITY_WINDOW
+from .batch import FloatArray, IntArray
+from .exceptions import ConfigurationError, DataError
+from .type import AnySharePriceHistory
+
+
+class RollingPerformance(NamedTuple):
+    """
+    Performance metrics of one vault with one entry per price, oldest first.
+
+    Entry i holds the metrics of the history up to and including timestamps[i],
+    i.e. what analyze_yield_with_daily_share_price returns for the first i + 1
+    prices. Metrics that need more history than is available are 0.0, as in
+    PerformanceAnalysis.
+    """
+
+    timestamps: IntArray
+    apy_7d: FloatArray
+    apy_30d: FloatArray
+    apy_90d: FloatArray
+    volatility_30d: FloatArray
+    drawdown: FloatArray
+    max_drawdown: FloatArray
+    sharpe_ratio: FloatArray
+
+
+def analyze_rolling_performance(
+    share_price_history: AnySharePriceHistory,
+    risk_free_rate: float = 0.05,
+    sharpe_window: Optional[int] = None,
+) -> RollingPerformance:
+    """
+    Compute rolling APY, volatility, drawdown and Sharpe ratio series in O(n).
+
+    Windowed metrics come from prefix sums of daily returns rather than from
+    re-analyzing every prefix of the history.
+
+    Args:
+        share_price_history: SharePriceHistory or CompactSharePriceHistory object containing daily share prices
+        risk_free_rate: Annual risk-free rate (default 0.05 = 5% for current market conditions)
+        sharpe_window: Number of trailing daily returns behind each Sharpe ratio.
+            Defaults to all returns so far, matching PerformanceAnalysis.
+
+    Returns:
+        RollingPerformance with one entry per price, in timestamp order.
+    """
+    if sharpe_window is not None and sharpe_window < 2:
+        raise ConfigurationError("sharpe_window must be at least 2")
+
+    timestamps, prices = share_price_history.to_arrays()
+    if len(prices) < 2:
+        raise DataError("At least 2 daily share prices are required for analysis")
+    if (timestamps[1:] < timestamps[:-1]).any():
+        order = np.argsort(timestamps, kind="stable")
+        timestamps, prices = timestamps[order], prices[order]
+
+    # Returns after a non-positive price are skipped, as in the point-in-time metrics
+    previous = prices[:-1]
+    valid = previous > 0
+    returns = (prices[1:][valid] - previous[valid]) / previous[valid]
+    # Number of usable returns within each prefix of the history
+    return_counts = np.concatenate(([0], np.cumsum(valid)))
+
+    drawdown, max_drawdown = _rolling_drawdown(prices)
+    if sharpe_window is None:
+        sharpe_ratio = _expanding_sharpe_ratio(returns, risk_free_rate)
+    else:
+        sharpe_ratio = _windowed_sharpe_ratio(returns, sharpe_window, risk_free_rate)
+
+    return RollingPerformance(
+        timestamps=np.array(timestamps, dtype=np.int64),
+        apy_7d=_rolling_apy(prices, 7),
+        apy_30d=_rolling_apy(prices, 30),
+        apy_90d=_rolling_apy(prices, 90),
+        volatility_30d=_rolling_volatility(returns, VOLATILITY_WINDOW)[return_counts],
+        drawdown=drawdown,
+        max_drawdown=max_drawdown,
+        sharpe_ratio=sharpe_ratio[return_counts],
+    )
+
+
+def analyze_rolling_performance_batch(
+    share_price_histories: Sequence[AnySharePriceHistory],
+    risk_free_rate: float = 0.05,
+    sharpe_window: Optional[int] = None,
+) -> List[RollingPerformance]:
+    """
+    Compute rolling metrics for many vaults.
+
+    Args:
+        share_price_histories: The histories to analyze.
+        risk_free_rate: Annual risk-free rate (default 0.05 = 5% for current market conditions)
+        sharpe_window: Number of trailing daily returns behind each Sharpe ratio.
+            Defaults to all returns so far, matching PerformanceAnalysis.
+
+    Returns:
+        One RollingPerformance per history, in input order.
+    """
+    return [
+        analyze_rolling_performance(history, risk_free_rate, sharpe_window)
+        for history in share_price_histories
+    ]
+
+
+def _rolling_apy(prices: FloatArray, days: int) -> FloatArray:
+    """APY over the trailing `days` prices at every point of the series."""
+    apy = np.zeros(len(prices))
+    if len(prices) < days:
+        return apy
+
+    start_price = prices[: len(prices) - days + 1]
+    end_price = prices[days - 1 :]
+    valid = start_price > 0
+    total_return = (end_price[valid] - start_price[valid]) / start_price[valid]
+    apy[days - 1 :][valid] = (
+        np.maximum(1 + total_return, 0.0) ** (365 / days) - 1
+    ) * 100
+    return apy
+
+
+def _window_sums(values: FloatArray, window: int) -> FloatArray:
+    """Sums of every run of `window` consecutive values, from prefix sums."""
+    prefix = np.concatenate(([0.0], np.cumsum(values)))
+    result: FloatArray = prefix[window:] - prefix[:-window]
+    return result
+
+
+def _rolling_volatility(returns: FloatArray, window: int) -> FloatArray:
+    """
+    Annualized volatility of the trailing `window` returns, indexed by return count.
+
+    Entry k holds the volatility once k returns are available.
+    """
+    volatility = np.zeros(len(returns) + 1)
+    if len(returns) < window:
+        return volatility
+
+    # Centering on the mean keeps the prefix sums free of cancellation
+    deviations = returns - returns.mean()
+    sums = _window_sums(deviations, window)
+    sums_sq = _window_sums(deviations * deviations, window)
+    variance = np.maximum((sums_sq - sums * sums / window) / (window - 1), 0.0)
+    volatility[window:] = np.sqrt(variance) * math.sqrt(365) * 100
+    return volatility
+
+
+def _rolling_drawdown(prices: FloatArray) -> Tuple[FloatArray, FloatArray]:
+    """Current drawdown from the running peak and its running maximum, in percent."""
+    peak = np.maximum.accumulate(prices)
+    drawdown = np.zeros(len(prices))
+    positive = peak > 0
+    drawdown[positive] = (peak[positive] - prices[positive]) / peak[positive] * 100
+    return drawdown, np.maximum.accumulate(drawdown)
+
+
+def _sharpe_from_sums(
+    shift: float,
+    sums: FloatArray,
+    sums_sq: FloatArray,
+    counts: FloatArray,
+    risk_free_rate: float,
+) -> FloatArray:
+    """Sharpe ratios from sums of returns shifted by `shift` over `counts` returns."""
+    mean_deviation = sums / counts
+    variance = (sums_sq - sums * mean_deviation) / (counts - 1)
+    std_dev = np.sqrt(np.maximum(variance, 0.0))
+
+    sharpe_ratio = np.zeros(len(sums))
+    nonzero = std_dev > 0
+    annualized_return = (shift + mean_deviation[nonzero]) * 365
+    annualized_volatility = std_dev[nonzero] * math.sqrt(365)
+    sharpe_ratio[nonzero] = (annualized_return - risk_free_rate) / annualized_volatility
+    return sharpe_ratio
+
+
+def _expanding_sharpe_ratio(returns: FloatArray, risk_free_rate: float) -> FloatArray:
+    """Sharpe ratio of all returns so far, indexed by return count."""
+    sharpe_ratio = np.zeros(len(returns) + 1)
+    if len(returns) < 2:
+        return sharpe_ratio
+
+    # Shifted by the first return like the point-in-time kernel
+    shift = float(returns[0])
+    deviations = returns - shift
+    sums = np.cumsum(deviations)[1:]
+    sums_sq = np.cumsum(deviations * deviations)[1:]
+    counts = np.arange(2, len(returns) + 1, dtype=np.float64)
+    sharpe_ratio[2:] = _sharpe_from_sums(shift, sums, sums_sq, counts, risk_free_rate)
+    return sharpe_ratio
+
+
+def _windowed_sharpe_ratio(
+    returns: FloatArray, window: int, risk_free_rate: float
+) -> FloatArray:
+    """Sharpe ratio of the trailing `window` returns, indexed by return count."""
+    sharpe_ratio = np.zeros(len(returns) + 1)
+    if len(returns) < window:
+        return sharpe_ratio
+
+    shift = float(returns.mean())
+    deviations = returns - shift
+    sums = _window_sums(deviations, window)
+    sums_sq = _window_sums(deviations * deviations, window)
+    counts = np.full(len(sums), float(window))
+    sharpe_ratio[window:] = _sharpe_from_sums(
+        shift, sums, sums_sq, counts, risk_free_rate
+    )
+    return sharpe_ratio
@@ -0,0 +1,282 @@
+"""
+On-disk storage of share price histories with incremental subgraph sync.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from types import TracebackType
+from typing import Dict, Iterable, List, NamedTuple, Optional, Type, Union
+
+from .exceptions import ConfigurationError
+from .subgraph import (
+    DEFAULT_VAULTS_PER_QUERY,
+    MAX_PAGE_SIZE,
+    SubgraphClient,
+    _format_vault_addresses,
+    get_daily_share_price_history_from_subgraph,
+)
+from .type import Chain, SharePriceHistory
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vaults (
+    chain TEXT NOT NULL,
+    address TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (chain, address)
+);
+CREATE TABLE IF NOT EXISTS share_prices (
+    chain TEXT NOT NULL,
+    address TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    price REAL NOT NULL,
+    PRIMARY KEY (chain, address, timestamp)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS history_starts (
+    chain TEXT NOT NULL,
+    address TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    PRIMARY KEY (chain, address)
+);
+"""
+
+_MAX_QUERY_PARAMETERS = 900
+
+
+class StoredRange(NamedTuple):
+    """The stored prices of one vault."""
+
+    first: int
+    last: int
+    days: int
+    # Whether the subgraph is known to have no prices older than `first`
+    complete: bool
+
+
+class SharePriceStore:
+    """
+    SQLite-backed store of daily share price histories keyed by chain and vault.
+
+    Prices are stored exactly as fetched, i.e. already scaled by the underlying
+    asset decimals used for the fetch. Keep using the same decimals for a vault.
+    The store can be shared between threads.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Args:
+            path: SQLite database file, created if missing. ":memory:" keeps the
+                store in memory.
+        """
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(_SCHEMA)
+
+    def save(
+        self, chain: Chain, share_price_histories: Iterable[SharePriceHistory]
+    ) -> None:
+        """Insert or update the prices of the given histories."""
+        with self._lock, self._connection:
+            for history in share_price_histories:
+                self._connection.execute(
+                    "INSERT INTO vaults (chain, address, name) VALUES (?, ?, ?) "
+                    "ON CONFLICT (chain, address) DO UPDATE SET name = excluded.name",
+                    (chain.value, history.address, history.name),
+                )
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO share_prices "
+                    "(chain, address, timestamp, price) VALUES (?, ?, ?, ?)",
+                    (
+                        (chain.value, history.address, timestamp, price)
+                        for timestamp, price in history.price_history
+                    ),
+                )
+
+    def load(
+        self, chain: Chain, vault_addresses: List[str], length: Optional[int] = None
+    ) -> List[SharePriceHistory]:
+        """
+        Load stored histories, oldest price first.
+
+        Args:
+            chain: The blockchain chain of the vaults.
+            vault_addresses: The vault addresses to load.
+            length: If given, only the latest `length` prices of each vault.
+
+        Returns:
+            One SharePriceHistory per stored vault, in the order of vault_addresses.
+        """
+        result = []
+        with self._lock:
+            for address in dict.fromkeys(_format_vault_addresses(vault_addresses)):
+                row = self._connection.execute(
+                    "SELECT name FROM vaults WHERE chain = ? AND address = ?",
+                    (chain.value, address),
+                ).fetchone()
+                if row is None:
+                    continue
+
+                points = self._connection.execute(
+                    "SELECT timestamp, price FROM share_prices "
+                    "WHERE chain = ? AND address = ? ORDER BY timestamp DESC LIMIT ?",
+                    (chain.value, address, -1 if length is None else length),
+                ).fetchall()
+                points.reverse()
+                result.append(
+                    SharePriceHistory.from_sorted(
+                        name=row[0], address=address, price_history=points
+                    )
+                )
+        return result
+
+    def high_water_marks(
+        self, chain: Chain, vault_addresses: List[str]
+    ) -> Dict[str, int]:
+        """Return the latest stored timestamp of every stored vault among the given ones."""
+        return {
+            address: stored.last
+            for address, stored in self.stored_ranges(chain, vault_addresses).items()
+        }
+
+    def stored_ranges(
+        self, chain: Chain, vault_addresses: List[str]
+    ) -> Dict[str, StoredRange]:
+        """Return the range of stored prices of every stored vault among the given ones."""
+        addresses = list(dict.fromkeys(_format_vault_addresses(vault_addresses)))
+        ranges: Dict[str, StoredRange] = {}
+
+        with self._lock:
+            # Stay below SQLite's limit on the number of bound parameters
+            for start in range(0, len(addresses), _MAX_QUERY_PARAMETERS):
+                chunk = addresses[start : start + _MAX_QUERY_PARAMETERS]
+                placeholders = ", ".join("?" for _ in chunk)
+                rows = self._connection.execute(
+                    "SELECT p.address, MIN(p.timestamp), MAX(p.timestamp), COUNT(*), "
+                    "MIN(p.timestamp) <= COALESCE(MIN(h.timestamp), -1) "
+                    "FROM share_prices AS p LEFT JOIN history_starts AS h "
+                    "ON h.chain = p.chain AND h.address = p.address "
+                    f"WHERE p.chain = ? AND p.address IN ({placeholders}) "
+                    "GROUP BY p.address",
+                    (chain.value, *chunk),
+                ).fetchall()
+                for address, first, last, days, complete in rows:
+                    ranges[address] = StoredRange(first, last, days, bool(complete))
+        return ranges
+
+    def mark_history_start(self, chain: Chain, vault_addresses: List[str]) -> None:
+        """Record that the subgraph has no prices older than the stored ones."""
+        addresses = list(dict.fromkeys(_format_vault_addresses(vault_addresses)))
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO history_starts (chain, address, timestamp) "
+                "SELECT chain, address, MIN(timestamp) FROM share_prices "
+                "WHERE chain = ? AND address = ? GROUP BY chain, address",
+                ((chain.value, address) for address in addresses),
+            )
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "SharePriceStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def sync_daily_share_price_history(
+    store: SharePriceStore,
+    chain: Chain,
+    vault_addresses: List[str],
+    underlying_asset_decimals: int,
+    length: int,
+    api_key: str,
+    page_size: int = MAX_PAGE_SIZE,
+    vaults_per_query: int = DEFAULT_VAULTS_PER_QUERY,
+    client: Optional[SubgraphClient] = None,
+) -> List[SharePriceHistory]:
+    """
+    Bring the store up to date and return the latest `length` days of each vault.
+
+    Vaults already in the store only query the subgraph for prices newer than their
+    latest stored timestamp; new vaults fetch their full `length`-day window. When
+    fewer than `length` days are stored, e.g. because an earlier sync asked for a
+    shorter window, the missing days are backfilled with prices older than the
+    earliest stored one. Vaults whose history is known to start there are not
+    queried again.
+
+    Args:
+        store: The SharePriceStore to update.
+        chain: The blockchain chain to query.
+        vault_addresses: A list of vault addresses to query.
+        underlying_asset_decimals: The number of decimals of the underlying asset. e.g. 6 for USDC.
+        length: The number of days to return.
+        api_key: The API key for the subgraph.
+        page_size: Maximum number of rows requested per vault and round trip.
+        vaults_per_query: Maximum number of vaults packed into a single query.
+        client: The SubgraphClient to send queries with.
+
+    Returns:
+        One SharePriceHistory per vault with data, in the order of vault_addresses.
+    """
+    if length < 1:
+        raise ConfigurationError("length must be positive")
+
+    stored = store.stored_ranges(chain, vault_addresses)
+    new_prices = get_daily_share_price_history_from_subgraph(
+        chain,
+        vault_addresses,
+        underlying_asset_decimals,
+        length,
+        api_key,
+        page_size,
+        vaults_per_query,
+        client,
+        since={address: span.last for address, span in stored.items()},
+    )
+    store.save(chain, new_prices)
+    # A full-window fetch that came back short reached the vault's first price
+    store.mark_history_start(
+        chain,
+        [
+            history.address
+            for history in new_prices
+            if history.address not in stored and len(history.price_history) < length
+        ],
+    )
+
+    # Group the vaults to backfill by the number of missing days
+    backfills: Dict[int, Dict[str, int]] = {}
+    for address, span in store.stored_ranges(chain, vault_addresses).items():
+        if span.days < length and not span.complete:
+            backfills.setdefault(length - span.days, {})[address] = span.first
+    for missing, until in backfills.items():
+        old_prices = get_daily_share_price_history_from_subgraph(
+            chain,
+            list(until),
+            underlying_asset_decimals,
+            missing,
+            api_key,
+            page_size,
+            vaults_per_query,
+            client,
+            until=until,
+        )
+        store.save(chain, old_prices)
+        fetched = {
+            history.address: len(history.price_history) for history in old_prices
+        }
+        store.mark_history_start(
+            chain, [address for address in until if fetched.get(address, 0) < missing]
+        )
+
+    return store.load(chain, vault_addresses, length)
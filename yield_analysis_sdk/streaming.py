@@ -0,0 +1,288 @@
+"""
+Streaming parse of subgraph responses into compact share price histories.
+
+Rows are read from the response body one at a time and appended to per-vault
+int64/float64 buffers, so a pull never holds the decoded JSON document or one
+dict per row in memory.
+
+Requires the optional ijson dependency: pip install "yield-analysis-sdk[streaming]"
+"""
+
+from array import array
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .exceptions import ConfigurationError, ConnectionError
+from .subgraph import (
+    DEFAULT_VAULTS_PER_QUERY,
+    MAX_PAGE_SIZE,
+    SubgraphClient,
+    _format_vault_addresses,
+    _get_default_client,
+    _PriceHistoryPaginator,
+)
+from .type import Chain, CompactSharePriceHistory
+from .validators import normalize_address
+
+
+def _require_ijson() -> Any:
+    """Import ijson on first use, so importing the SDK does not load it."""
+    try:
+        import ijson
+    except ImportError as e:  # pragma: no cover - exercised only without the extra
+        raise ConfigurationError(
+            'ijson is required for streaming responses: pip install "yield-analysis-sdk[streaming]"'
+        ) from e
+    return ijson
+
+
+def _classify_prefix(prefix: str) -> Tuple[str, str]:
+    """
+    Return the role of an ijson event prefix within a vaultStats response.
+
+    Roles are ("entry", field) for the entries of a field under "data",
+    ("value", key) for their scalar values, ("errors", "") for the GraphQL
+    errors and ("", "") for anything else.
+    """
+    if prefix == "errors":
+        return "errors", ""
+    parts = prefix.split(".")
+    if len(parts) < 3 or parts[0] != "data" or parts[2] != "item":
+        return "", ""
+    if len(parts) == 3:
+        return "entry", parts[1]
+    if len(parts) == 4:
+        return "value", parts[3]
+    if len(parts) == 5 and parts[3] == "vault":
+        return "value", "vault_" + parts[4]
+    return "", ""
+
+
+class _VaultBuffer:
+    """Growable share price columns of one vault."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.timestamps = array("q")
+        self.prices = array("d")
+
+
+class VaultStatsParser:
+    """
+    Incremental consumer of vaultStats entries from subgraph responses.
+
+    Every list field under "data" is treated as a collection of vaultStats
+    entries, which covers both the vaultStats_collection query and the aliased
+    per-vault fields of paginated queries. One parser can consume several
+    responses; rows of the same vault accumulate in the same buffer.
+    """
+
+    def __init__(self, underlying_asset_decimals: int) -> None:
+        """
+        Args:
+            underlying_asset_decimals: The number of decimals of the underlying asset. e.g. 6 for USDC.
+        """
+        self.underlying_asset_decimals = underlying_asset_decimals
+        self._vaults: Dict[str, _VaultBuffer] = {}
+        self._multipliers: Dict[str, float] = {}
+
+    def feed(self, stream: BinaryIO) -> Dict[str, Tuple[int, Optional[str]]]:
+        """
+        Parse one JSON response body.
+
+        Args:
+            stream: Binary file-like object positioned at the start of the body.
+
+        Returns:
+            Mapping of response field to the number of entries it contained and
+            the raw timestamp of its last entry, as expected by the paginator.
+
+        Raises:
+            ConnectionError: If the response carries GraphQL errors.
+        """
+        ijson = _require_ijson()
+        counts: Dict[str, Tuple[int, Optional[str]]] = {}
+        errors: List[Any] = []
+        entry: Dict[str, Any] = {}
+        error_builder: Any = None
+        # Each distinct event prefix is classified once rather than per event
+        roles: Dict[str, Tuple[str, str]] = {}
+
+        try:
+            for prefix, event, value in ijson.parse(stream, use_float=True):
+                if error_builder is not None:
+                    if prefix == "errors" and event == "end_array":
+                        errors = error_builder.value
+                        error_builder = None
+                    else:
+                        error_builder.event(event, value)
+                    continue
+
+                role = roles.get(prefix)
+                if role is None:
+                    role = roles[prefix] = _classify_prefix(prefix)
+                kind, name = role
+
+                if kind == "value":
+                    entry[name] = value
+                elif kind == "entry" and event == "end_map":
+                    timestamp = self._append(entry)
+                    count = counts[name][0] if name in counts else 0
+                    counts[name] = (count + 1, timestamp)
+                    entry = {}
+                elif kind == "errors" and event == "start_array":
+                    error_builder = ijson.ObjectBuilder()
+                    error_builder.event(event, value)
+        except ijson.JSONError as e:
+            raise ConnectionError(f"Invalid JSON response from subgraph: {e}") from e
+
+        if errors:
+            raise ConnectionError(f"GraphQL errors: {errors}")
+        return counts
+
+    def _append(self, entry: Dict[str, Any]) -> str:
+        """Append one entry to its vault buffer and return its raw timestamp."""
+        address = entry["vault_address"]
+        vault = self._vaults.get(address)
+        if vault is None:
+            vault = self._vaults[address] = _VaultBuffer(
+                entry.get("vault_name") or address
+            )
+
+        decimals = str(entry["vault_decimals"])
+        multiplier = self._multipliers.get(decimals)
+        if multiplier is None:
+            multiplier = self._multipliers[decimals] = 10 ** (
+                int(decimals) - self.underlying_asset_decimals
+            )
+
+        timestamp = str(entry["timestamp"])
+        # Convert microseconds to seconds
+        vault.timestamps.append(int(timestamp) // 1000000)
+        vault.prices.append(float(entry["pricePerShare"]) * multiplier)
+        return timestamp
+
+    def results(
+        self, addresses: Optional[List[str]] = None
+    ) -> List[CompactSharePriceHistory]:
+        """
+        Build one CompactSharePriceHistory per vault, oldest price first.
+
+        Args:
+            addresses: Optional normalized addresses giving the output order.
+                Vaults without rows are skipped. Defaults to the order in which
+                vaults first appeared.
+        """
+        if addresses is None:
+            addresses = list(self._vaults)
+
+        histories = []
+        for address in addresses:
+            vault = self._vaults.get(address)
+            if vault is None:
+                continue
+            # Subgraph pages are newest first
+            timestamps = np.frombuffer(vault.timestamps, dtype=np.int64)[::-1]
+            prices = np.frombuffer(vault.prices, dtype=np.float64)[::-1]
+            if np.any(timestamps[1:] < timestamps[:-1]):
+                order = np.argsort(timestamps, kind="stable")
+                timestamps, prices = timestamps[order], prices[order]
+            histories.append(
+                CompactSharePriceHistory(
+                    name=vault.name,
+                    address=address,
+                    timestamps=np.ascontiguousarray(timestamps),
+                    prices=np.ascontiguousarray(prices),
+                )
+            )
+        return histories
+
+
+def parse_vault_stats_response(
+    stream: BinaryIO, underlying_asset_decimals: int
+) -> List[CompactSharePriceHistory]:
+    """
+    Parse a vaultStats response body incrementally into compact histories.
+
+    Args:
+        stream: Binary file-like object with the JSON response body.
+        underlying_asset_decimals: The number of decimals of the underlying asset. e.g. 6 for USDC.
+
+    Returns:
+        One CompactSharePriceHistory per vault, in order of first appearance.
+    """
+    parser = VaultStatsParser(underlying_asset_decimals)
+    parser.feed(stream)
+    return parser.results()
+
+
+def _stream_graphql_query_to_subgraph(
+    chain: Chain,
+    query: str,
+    variables: Dict[str, Any],
+    api_key: str,
+    parser: VaultStatsParser,
+    client: Optional[SubgraphClient] = None,
+) -> Dict[str, Tuple[int, Optional[str]]]:
+    if client is None:
+        client = _get_default_client()
+    return client.query_stream(chain, query, variables, api_key, parser.feed)
+
+
+def get_daily_share_price_history_streaming(
+    chain: Chain,
+    vault_addresses: List[str],
+    underlying_asset_decimals: int,
+    length: int,
+    api_key: str,
+    page_size: int = MAX_PAGE_SIZE,
+    vaults_per_query: int = DEFAULT_VAULTS_PER_QUERY,
+    client: Optional[SubgraphClient] = None,
+    since: Optional[Dict[str, int]] = None,
+) -> List[CompactSharePriceHistory]:
+    """
+    Streaming counterpart of get_daily_share_price_history_from_subgraph.
+
+    Responses are parsed while they are received and rows go straight into
+    per-vault compact buffers, bounding peak memory to roughly 16 bytes per row.
+
+    Args:
+        chain: The blockchain chain to query.
+        vault_addresses: A list of vault addresses to query.
+        underlying_asset_decimals: The number of decimals of the underlying asset. e.g. 6 for USDC.
+        length: The number of days to query.
+        api_key: The API key for the subgraph.
+        page_size: Maximum number of rows requested per vault and round trip.
+        vaults_per_query: Maximum number of vaults packed into a single query.
+        client: The SubgraphClient to send queries with. A shared default client is
+            used when omitted.
+        since: Optional mapping of vault address to a timestamp in seconds. Only
+            prices strictly newer than it are fetched for that vault.
+
+    Returns:
+        One CompactSharePriceHistory per vault with data, in the order of vault_addresses.
+    """
+    if not api_key:
+        raise ConfigurationError("SUBGRAPH_API_KEY is required")
+    _require_ijson()
+
+    addresses = list(dict.fromkeys(_format_vault_addresses(vault_addresses)))
+    paginator = _PriceHistoryPaginator(
+        addresses,
+        length,
+        page_size,
+        vaults_per_query,
+        {normalize_address(address): ts for address, ts in (since or {}).items()},
+    )
+    parser = VaultStatsParser(underlying_asset_decimals)
+
+    while (request := paginator.next_query()) is not None:
+        query, variables = request
+        paginator.feed_counts(
+            _stream_graphql_query_to_subgraph(
+                chain, query, variables, api_key, parser, client
+            )
+        )
+
+    return parser.results(addresses)
@@ -1,16 +1,49 @@
-from typing import Any, Dict, List
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from types import TracebackType
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
-from requests import post
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
 
-from .exceptions import ConfigurationError, ConnectionError
+from .cache import QueryCache
+from .exceptions import (
+    CircuitOpenError,
+    ConfigurationError,
+    ConnectionError,
+    RateLimitError,
+)
 from .type import Chain, SharePriceHistory
-from .validators import normalize_address
+from .validators import normalize_address, normalize_addresses
 
-SUBGRAPH_QUERY_URLS = {
-    Chain.BASE: "https://gateway.thegraph.com/api/subgraphs/id/46pQKDXgcredBSK9cbGU8qEaPEpEZgQ72hSAkpWnKinJ",
-    Chain.ARBITRUM: "https://gateway.thegraph.com/api/subgraphs/id/AH842SqnNHmMM54fY6eX9sGSV4BPo8fmeoj5C3qbNsr1",
-}
+T = TypeVar("T")
+
+# Subgraph endpoint of every chain. Chains without a deployed subgraph map to
+# None until one is registered with set_subgraph_url
+SUBGRAPH_QUERY_URLS: Dict[Chain, Optional[str]] = {chain: None for chain in Chain}
+SUBGRAPH_QUERY_URLS.update(
+    {
+        Chain.BASE: "https://gateway.thegraph.com/api/subgraphs/id/46pQKDXgcredBSK9cbGU8qEaPEpEZgQ72hSAkpWnKinJ",
+        Chain.ARBITRUM: "https://gateway.thegraph.com/api/subgraphs/id/AH842SqnNHmMM54fY6eX9sGSV4BPo8fmeoj5C3qbNsr1",
+    }
+)
 
+# Single page query used before pagination. The SDK no longer sends it; it is
+# kept so code importing it from this module keeps working
 daily_share_price_query = """
 query DailyPriceHistory($vault_addresses: [Bytes!], $length: Int!) {
   vaultStats_collection(
@@ -36,25 +69,44 @@ query DailyPriceHistory($vault_addresses: [Bytes!], $length: Int!) {
 """
 
 
-def _format_vault_addresses(addresses: List[str]) -> List[str]:
-    """Format vault addresses to lowercase for GraphQL compatibility"""
-    return [normalize_address(addr) for addr in addresses]
+# The Graph gateway returns at most 1000 rows per collection field
+MAX_PAGE_SIZE = 1000
 
+# Number of per-vault aliased collection fields packed into a single query
+DEFAULT_VAULTS_PER_QUERY = 50
 
-def _send_graphql_query_to_subgraph(
-    chain: Chain,
-    query: str,
-    variables: Dict[str, Any],
-    api_key: str,
-) -> Any:
-    headers = {"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"}
+_VAULT_STATS_FIELDS = """
+    timestamp
+    pricePerShare
+    vault {
+      address
+      name
+      decimals
+    }
+"""
+
+
+def set_subgraph_url(chain: Chain, url: Optional[str]) -> None:
+    """
+    Register the subgraph endpoint queried for a chain.
+
+    Args:
+        chain: The chain to configure.
+        url: The subgraph query URL, or None to mark the chain as unsupported.
+    """
+    SUBGRAPH_QUERY_URLS[chain] = url
 
-    # Prepare the request payload
-    payload = {"query": query, "variables": variables}
 
-    # Send the GraphQL request to the Subgraph
-    response = post(SUBGRAPH_QUERY_URLS[chain], headers=headers, json=payload)
+def _get_subgraph_url(chain: Chain) -> str:
+    """Return the subgraph endpoint of a chain."""
+    url = SUBGRAPH_QUERY_URLS.get(chain)
+    if url is None:
+        raise ConfigurationError(f"No subgraph configured for chain: {chain.value}")
+    return url
 
+
+def _decode_graphql_response(response: Any) -> Any:
+    """Decode a GraphQL HTTP response, raising ConnectionError on any error."""
     # Check if the request was successful
     if response.status_code == 200:
         result = response.json()
@@ -66,6 +118,460 @@ def _send_graphql_query_to_subgraph(
     return result
 
 
+# HTTP statuses that indicate a transient gateway or indexer problem
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the delay in seconds requested by a Retry-After header, if any."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class _KeyState:
+    """Token bucket of one API key."""
+
+    def __init__(self, tokens: float, now: float) -> None:
+        self.tokens = tokens
+        self.updated = now
+        self.blocked_until = 0.0
+
+
+class _EndpointState:
+    """Circuit breaker of one subgraph endpoint."""
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.probe_started = 0.0
+
+
+class RequestScheduler:
+    """
+    Rate limiting, retry and circuit breaking policy for subgraph requests.
+
+    Requests are paced by a token bucket per API key, so bursts never exceed the
+    gateway's allowed rate. A Retry-After from a 429 pauses every request using the
+    same key. Transient failures (transport errors, 429 and 5xx responses) are
+    retried with exponential backoff and full jitter. After `failure_threshold`
+    consecutive failures of an endpoint its circuit opens and requests fail fast
+    with CircuitOpenError until `reset_timeout` has passed; then a single probe
+    request decides whether to close it again. A probe whose outcome is never
+    recorded, e.g. because its task was cancelled, is given up after
+    `probe_timeout` so the endpoint cannot stay blocked forever.
+
+    The scheduler never sleeps itself: acquire() and record_failure() return the
+    delays, so the same instance can pace sync and async clients alike. Share one
+    instance between clients that use the same API keys.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        burst: int = 10,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        probe_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        jitter: Callable[[], float] = random.random,
+    ) -> None:
+        """
+        Args:
+            requests_per_second: Sustained request rate allowed per API key, or None
+                to only slow down when the gateway asks to.
+            burst: Number of requests per API key that may be sent back to back.
+            max_retries: Retries of a failed request before giving up.
+            backoff_base: Backoff ceiling in seconds of the first retry; it doubles
+                with every further retry.
+            backoff_max: Upper bound of the backoff ceiling in seconds.
+            failure_threshold: Consecutive failures that open an endpoint's circuit.
+            reset_timeout: Seconds an open circuit waits before a probe request.
+            probe_timeout: Seconds after which a probe that neither succeeded nor
+                failed no longer blocks the next probe.
+            clock: Monotonic time source, e.g. for testing.
+            jitter: Source of uniform random numbers in [0, 1), e.g. for testing.
+        """
+        if requests_per_second is not None and requests_per_second <= 0:
+            raise ConfigurationError("requests_per_second must be positive")
+        if burst < 1:
+            raise ConfigurationError("burst must be positive")
+        if max_retries < 0:
+            raise ConfigurationError("max_retries must not be negative")
+        if failure_threshold < 1:
+            raise ConfigurationError("failure_threshold must be positive")
+        if probe_timeout <= 0:
+            raise ConfigurationError("probe_timeout must be positive")
+
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe_timeout = probe_timeout
+        self.clock = clock
+        self.jitter = jitter
+        self._keys: Dict[str, _KeyState] = {}
+        self._endpoints: Dict[str, _EndpointState] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, api_key: str, endpoint: str) -> float:
+        """
+        Reserve a request to an endpoint.
+
+        Args:
+            api_key: The API key the request is sent with.
+            endpoint: The subgraph URL the request is sent to.
+
+        Returns:
+            Seconds to wait before sending the request.
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open.
+        """
+        with self._lock:
+            now = self.clock()
+            circuit = self._endpoints.setdefault(endpoint, _EndpointState())
+            if circuit.opened_at is not None:
+                remaining = circuit.opened_at + self.reset_timeout - now
+                if circuit.probing:
+                    remaining = max(
+                        remaining, circuit.probe_started + self.probe_timeout - now
+                    )
+                if remaining > 0:
+                    raise CircuitOpenError(
+                        f"Circuit open for {endpoint} after {circuit.failures} "
+                        f"consecutive failures; retry in {remaining:.1f}s"
+                    )
+                circuit.probing = True
+                circuit.probe_started = now
+
+            key = self._keys.get(api_key)
+            if key is None:
+                key = self._keys[api_key] = _KeyState(self.burst, now)
+            wait = max(key.blocked_until - now, 0.0)
+            if self.requests_per_second is not None:
+                # The bucket may go negative: each reservation queues behind the last
+                key.tokens = min(
+                    self.burst,
+                    key.tokens + (now - key.updated) * self.requests_per_second,
+                )
+                key.updated = now
+                key.tokens -= 1
+                wait = max(wait, -key.tokens / self.requests_per_second)
+            return wait
+
+    def release(self, endpoint: str) -> None:
+        """
+        Give up a reservation whose outcome will never be recorded.
+
+        Call this when a request is abandoned between acquire() and
+        record_success() or record_failure(), e.g. because it was cancelled. A
+        pending probe is released so that the next request can probe again.
+        """
+        with self._lock:
+            circuit = self._endpoints.get(endpoint)
+            if circuit is not None:
+                circuit.probing = False
+
+    def record_success(self, endpoint: str) -> None:
+        """Record that the endpoint answered, closing its circuit."""
+        with self._lock:
+            self._endpoints[endpoint] = _EndpointState()
+
+    def record_failure(
+        self,
+        api_key: str,
+        endpoint: str,
+        attempt: int,
+        rate_limited: bool = False,
+        retry_after: Optional[float] = None,
+    ) -> Optional[float]:
+        """
+        Record a failed attempt and decide whether to retry it.
+
+        Args:
+            api_key: The API key the request was sent with.
+            endpoint: The subgraph URL the request was sent to.
+            attempt: Number of retries already made for this request.
+            rate_limited: Whether the gateway answered 429. Rate limiting pauses the
+                API key instead of counting against the endpoint's circuit.
+            retry_after: Delay in seconds requested by the gateway, if any.
+
+        Returns:
+            Seconds to wait before the next acquire(), or None to give up.
+        """
+        with self._lock:
+            now = self.clock()
+            circuit = self._endpoints.setdefault(endpoint, _EndpointState())
+            if not rate_limited:
+                circuit.failures += 1
+                if circuit.probing or circuit.failures >= self.failure_threshold:
+                    circuit.opened_at = now
+                circuit.probing = False
+            elif circuit.probing:
+                # A rate limited probe says nothing about the endpoint's health
+                circuit.probing = False
+                circuit.opened_at = now - self.reset_timeout
+
+            if retry_after is not None:
+                key = self._keys.setdefault(api_key, _KeyState(self.burst, now))
+                key.blocked_until = max(key.blocked_until, now + retry_after)
+
+            if attempt >= self.max_retries or (
+                not rate_limited and circuit.opened_at is not None
+            ):
+                return None
+            if retry_after is not None:
+                # acquire() already waits for the Retry-After pause
+                return 0.0
+            ceiling = min(self.backoff_max, self.backoff_base * 2.0**attempt)
+            return self.jitter() * ceiling
+
+
+class SubgraphClient:
+    """
+    Reusable HTTP transport for subgraph queries.
+
+    The client owns a pooled keep-alive requests.Session, so consecutive queries
+    reuse TCP and TLS connections instead of opening a new one per request. Create
+    one client per process and share it between calls; it can also be used as a
+    context manager to close the pool when done.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        gzip: bool = True,
+        cache: Optional[QueryCache] = None,
+        scheduler: Optional[RequestScheduler] = None,
+    ) -> None:
+        """
+        Args:
+            pool_connections: Number of per-host connection pools to cache.
+            pool_maxsize: Maximum number of connections kept alive per host.
+            connect_timeout: Seconds to wait for a connection to be established.
+            read_timeout: Seconds to wait for the server to send a response.
+            gzip: Whether to ask the gateway for compressed responses.
+            cache: Optional QueryCache answering repeated queries in-process.
+            scheduler: RequestScheduler pacing and retrying requests. Defaults to a
+                scheduler with default settings owned by this client.
+        """
+        self.cache = cache
+        self.scheduler = scheduler or RequestScheduler()
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(
+            {
+                "Content-Type": "application/json",
+                "Accept-Encoding": "gzip, deflate" if gzip else "identity",
+            }
+        )
+
+    def query(
+        self, chain: Chain, query: str, variables: Dict[str, Any], api_key: str
+    ) -> Any:
+        """Send a GraphQL query to the subgraph of the given chain."""
+        url = _get_subgraph_url(chain)
+        headers = {"Authorization": f"Bearer {api_key}"}
+
+        if self.cache is not None:
+            key = self.cache.make_key(chain, query, variables)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        # Prepare the request payload
+        payload = {"query": query, "variables": variables}
+
+        response = self._post(url, headers, payload, api_key)
+        result = _decode_graphql_response(response)
+        if self.cache is not None:
+            self.cache.put(key, result)
+        return result
+
+    def query_stream(
+        self,
+        chain: Chain,
+        query: str,
+        variables: Dict[str, Any],
+        api_key: str,
+        consume: Callable[[BinaryIO], T],
+    ) -> T:
+        """
+        Send a GraphQL query and hand the response body to `consume` as a stream.
+
+        The body is never loaded as a whole, so `consume` can parse it
+        incrementally. Transient failures are retried like query(), but streamed
+        responses bypass the QueryCache.
+
+        Args:
+            chain: The chain whose subgraph is queried.
+            query: The GraphQL query.
+            variables: The query variables.
+            api_key: The API key for the subgraph.
+            consume: Callable reading the decompressed JSON body.
+
+        Returns:
+            The value returned by `consume`.
+
+        Raises:
+            ConnectionError: If the request fails or the connection breaks while
+                the body is read. A broken body is not retried, since `consume`
+                may already have used part of it.
+        """
+        url = _get_subgraph_url(chain)
+        headers = {"Authorization": f"Bearer {api_key}"}
+        payload = {"query": query, "variables": variables}
+
+        response = self._post(url, headers, payload, api_key, stream=True)
+        try:
+            if response.status_code != 200:
+                raise ConnectionError(
+                    f"HTTP Error {response.status_code}: {response.text}"
+                )
+            response.raw.decode_content = True
+            return consume(response.raw)
+        except (RequestException, Urllib3HTTPError) as e:
+            raise ConnectionError(f"Reading the subgraph response failed: {e}") from e
+        finally:
+            response.close()
+
+    def _post(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        api_key: str,
+        stream: bool = False,
+    ) -> Any:
+        """Send the GraphQL request to the Subgraph, retrying transient failures."""
+        attempt = 0
+        while True:
+            wait = self.scheduler.acquire(api_key, url)
+            try:
+                if wait > 0:
+                    time.sleep(wait)
+                response = self.session.post(
+                    url,
+                    headers=headers,
+                    json=payload,
+                    timeout=self.timeout,
+                    stream=stream,
+                )
+            except RequestException as e:
+                delay = self.scheduler.record_failure(api_key, url, attempt)
+                if delay is None:
+                    raise ConnectionError(f"Request to subgraph failed: {e}") from e
+            except BaseException:
+                # E.g. KeyboardInterrupt: the attempt has no outcome to record
+                self.scheduler.release(url)
+                raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    self.scheduler.record_success(url)
+                    return response
+                delay = _record_failed_response(
+                    self.scheduler, api_key, url, attempt, response
+                )
+
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "SubgraphClient":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def _record_failed_response(
+    scheduler: RequestScheduler, api_key: str, url: str, attempt: int, response: Any
+) -> float:
+    """Record a retryable HTTP response and return the delay before retrying it."""
+    rate_limited = response.status_code == 429
+    delay = scheduler.record_failure(
+        api_key,
+        url,
+        attempt,
+        rate_limited=rate_limited,
+        retry_after=_parse_retry_after(response.headers.get("Retry-After")),
+    )
+    if delay is None:
+        error = RateLimitError if rate_limited else ConnectionError
+        raise error(f"HTTP Error {response.status_code}: {response.text}")
+    return delay
+
+
+_default_client: Optional[SubgraphClient] = None
+
+
+def _get_default_client() -> SubgraphClient:
+    """Return the shared client used when callers do not pass their own."""
+    global _default_client
+    if _default_client is None:
+        _default_client = SubgraphClient()
+    return _default_client
+
+
+def _format_vault_addresses(addresses: List[str]) -> List[str]:
+    """Format vault addresses to lowercase for GraphQL compatibility"""
+    return normalize_addresses(addresses)
+
+
+def _send_graphql_query_to_subgraph(
+    chain: Chain,
+    query: str,
+    variables: Dict[str, Any],
+    api_key: str,
+    client: Optional[SubgraphClient] = None,
+) -> Any:
+    if client is None:
+        client = _get_default_client()
+    return client.query(chain, query, variables, api_key)
+
+
+def _parse_vault_stats_entry(
+    entry: Dict[str, Any], underlying_asset_decimals: int
+) -> Tuple[int, float]:
+    """Convert a vaultStats entry into a (timestamp in seconds, share price) point."""
+    vault_decimals = int(entry["vault"]["decimals"])
+    timestamp = int(entry["timestamp"]) // 1000000  # Convert microseconds to seconds
+    decimals_multiplier: float = 10 ** (vault_decimals - underlying_asset_decimals)
+    price_per_share = float(entry["pricePerShare"]) * decimals_multiplier
+    return timestamp, price_per_share
+
+
 def _format_price_history_response(
     res: dict, underlying_asset_decimals: int
 ) -> List[SharePriceHistory]:
@@ -77,12 +583,9 @@ def _format_price_history_response(
     for entry in res["data"]["vaultStats_collection"]:
         vault_address = entry["vault"]["address"]
         vault_name = entry["vault"]["name"]
-        vault_decimals = int(entry["vault"]["decimals"])
-        timestamp = (
-            int(entry["timestamp"]) // 1000000
-        )  # Convert microseconds to seconds
-        decimals_multiplier: float = 10 ** (vault_decimals - underlying_asset_decimals)
-        price_per_share = float(entry["pricePerShare"]) * decimals_multiplier
+        timestamp, price_per_share = _parse_vault_stats_entry(
+            entry, underlying_asset_decimals
+        )
 
         if vault_address not in history_by_vault:
             history_by_vault[vault_address] = {
@@ -102,7 +605,7 @@ def _format_price_history_response(
     # Convert to SharePriceHistory objects
     result = []
     for vault_data in history_by_vault.values():
-        share_price_history = SharePriceHistory(
+        share_price_history = SharePriceHistory.from_sorted(
             name=vault_data["name"],
             address=vault_data["address"],
             price_history=vault_data["price_history"],
@@ -112,34 +615,220 @@ def _format_price_history_response(
     return result
 
 
+class _VaultPage:
+    """Pagination state of a single vault."""
+
+    def __init__(
+        self,
+        address: str,
+        length: int,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+    ) -> None:
+        self.address = address
+        self.remaining = length
+        self.since = since
+        # Subgraph timestamps are in microseconds
+        self.cursor: Optional[str] = None if until is None else str(until * 1000000)
+        self.entries: List[Dict[str, Any]] = []
+        self.done = length <= 0
+
+    def advance(self, first: int, count: int, cursor: Optional[str]) -> None:
+        """Record a page of `count` entries fetched with a limit of `first`."""
+        self.remaining -= count
+        if count:
+            self.cursor = cursor
+        # A short page means the vault has no older stats
+        self.done = count < first or self.remaining <= 0
+
+
+class _PriceHistoryPaginator:
+    """
+    Cursor based pagination of daily share prices for many vaults.
+
+    Every vault gets its own aliased vaultStats_collection field bounded by the
+    number of days still missing for that vault, so one vault with a long history
+    cannot starve the others. A field that returns a full page continues on the
+    next round trip from the oldest timestamp seen so far. Vaults listed in `since`
+    only fetch stats strictly newer than the given timestamp in seconds, vaults
+    listed in `until` only stats strictly older than it. The
+    paginator does no I/O: callers send the queries from next_query() and pass the
+    decoded responses to feed().
+    """
+
+    def __init__(
+        self,
+        addresses: List[str],
+        length: int,
+        page_size: int = MAX_PAGE_SIZE,
+        vaults_per_query: int = DEFAULT_VAULTS_PER_QUERY,
+        since: Optional[Dict[str, int]] = None,
+        until: Optional[Dict[str, int]] = None,
+    ) -> None:
+        if not 0 < page_size <= MAX_PAGE_SIZE:
+            raise ConfigurationError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+        if vaults_per_query < 1:
+            raise ConfigurationError("vaults_per_query must be positive")
+
+        self.page_size = page_size
+        self.vaults_per_query = vaults_per_query
+        since = since or {}
+        until = until or {}
+        self.vaults = [
+            _VaultPage(address, length, since.get(address), until.get(address))
+            for address in addresses
+        ]
+        self._pending: List[Tuple[_VaultPage, int]] = []
+
+    def next_query(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Return the next (query, variables) to send, or None when finished.
+
+        Until feed() is called the same page is returned again, so a failed
+        request can simply be retried.
+        """
+        if not self._pending:
+            self._pending = [
+                (vault, min(vault.remaining, self.page_size))
+                for vault in self.vaults
+                if not vault.done
+            ][: self.vaults_per_query]
+        if not self._pending:
+            return None
+
+        definitions = []
+        fields = []
+        variables: Dict[str, Any] = {}
+        for index, (vault, first) in enumerate(self._pending):
+            definitions.append(f"$v{index}: Bytes!")
+            variables[f"v{index}"] = vault.address
+            where = f"vault_: {{ address: $v{index} }}"
+            if vault.cursor is not None:
+                definitions.append(f"$c{index}: Timestamp!")
+                variables[f"c{index}"] = vault.cursor
+                where += f", timestamp_lt: $c{index}"
+            if vault.since is not None:
+                definitions.append(f"$s{index}: Timestamp!")
+                # Subgraph timestamps are in microseconds
+                variables[f"s{index}"] = str(vault.since * 1000000)
+                where += f", timestamp_gt: $s{index}"
+            fields.append(
+                f"  v{index}: vaultStats_collection(\n"
+                f"    interval: day\n"
+                f"    orderBy: timestamp\n"
+                f"    orderDirection: desc\n"
+                f"    first: {first}\n"
+                f"    where: {{ {where} }}\n"
+                f"  ) {{{_VAULT_STATS_FIELDS}  }}"
+            )
+
+        query = (
+            f"query PaginatedDailyPriceHistory({', '.join(definitions)}) {{\n"
+            + "\n".join(fields)
+            + "\n}\n"
+        )
+        return query, variables
+
+    def feed(self, res: Dict[str, Any]) -> None:
+        """Consume the decoded response of the query returned by next_query()."""
+        pending, self._pending = self._pending, []
+        data = res.get("data") or {}
+
+        for index, (vault, first) in enumerate(pending):
+            entries = data.get(f"v{index}") or []
+            vault.entries.extend(entries)
+            vault.advance(
+                first, len(entries), entries[-1]["timestamp"] if entries else None
+            )
+
+    def feed_counts(self, counts: Dict[str, Tuple[int, Optional[str]]]) -> None:
+        """
+        Consume a response that was parsed elsewhere, e.g. by a streaming parser.
+
+        Args:
+            counts: Mapping of response field alias to the number of entries it
+                returned and the timestamp of its last (oldest) entry.
+        """
+        pending, self._pending = self._pending, []
+        for index, (vault, first) in enumerate(pending):
+            count, cursor = counts.get(f"v{index}", (0, None))
+            vault.advance(first, count, cursor)
+
+    def results(self, underlying_asset_decimals: int) -> List[SharePriceHistory]:
+        """Stitch the fetched pages into SharePriceHistory objects in input order."""
+        result = []
+        for vault in self.vaults:
+            if not vault.entries:
+                continue
+
+            # Pages are fetched newest first
+            price_history = [
+                _parse_vault_stats_entry(entry, underlying_asset_decimals)
+                for entry in reversed(vault.entries)
+            ]
+            result.append(
+                SharePriceHistory.from_sorted(
+                    name=vault.entries[0]["vault"]["name"],
+                    address=vault.entries[0]["vault"]["address"],
+                    price_history=price_history,
+                )
+            )
+        return result
+
+
 def get_daily_share_price_history_from_subgraph(
     chain: Chain,
     vault_addresses: List[str],
     underlying_asset_decimals: int,
     length: int,
     api_key: str,
+    page_size: int = MAX_PAGE_SIZE,
+    vaults_per_query: int = DEFAULT_VAULTS_PER_QUERY,
+    client: Optional[SubgraphClient] = None,
+    since: Optional[Dict[str, int]] = None,
+    until: Optional[Dict[str, int]] = None,
 ) -> List[SharePriceHistory]:
     """
     Get the daily share price history from the subgraph for a list of vault addresses.
 
+    Rows are fetched page by page with a timestamp cursor per vault, so every vault
+    receives up to `length` days regardless of the gateway's row cap.
+
     Args:
         chain: The blockchain chain to query.
         vault_addresses: A list of vault addresses to query.
         underlying_asset_decimals: The number of decimals of the underlying asset. e.g. 6 for USDC.
         length: The number of days to query.
         api_key: The API key for the subgraph.
+        page_size: Maximum number of rows requested per vault and round trip.
+        vaults_per_query: Maximum number of vaults packed into a single query.
+        client: The SubgraphClient to send queries with. A shared default client is
+            used when omitted.
+        since: Optional mapping of vault address to a timestamp in seconds. Only
+            prices strictly newer than it are fetched for that vault.
+        until: Optional mapping of vault address to a timestamp in seconds. Only
+            prices strictly older than it are fetched for that vault.
+
+    Returns:
+        One SharePriceHistory per vault with data, in the order of vault_addresses.
     """
     if not api_key:
         raise ConfigurationError("SUBGRAPH_API_KEY is required")
 
     formatted_addresses = _format_vault_addresses(vault_addresses)
+    paginator = _PriceHistoryPaginator(
+        list(dict.fromkeys(formatted_addresses)),
+        length,
+        page_size,
+        vaults_per_query,
+        {normalize_address(address): ts for address, ts in (since or {}).items()},
+        {normalize_address(address): ts for address, ts in (until or {}).items()},
+    )
 
-    variables = {
-        "vault_addresses": formatted_addresses,
-        "length": length * len(formatted_addresses),
-    }
+    while (request := paginator.next_query()) is not None:
+        query, variables = request
+        paginator.feed(
+            _send_graphql_query_to_subgraph(chain, query, variables, api_key, client)
+        )
 
-    res: dict = _send_graphql_query_to_subgraph(
-        chain, daily_share_price_query, variables, api_key
-    )
-    return _format_price_history_response(res, underlying_asset_decimals)
+    return paginator.results(underlying_asset_decimals)
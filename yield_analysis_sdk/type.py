@@ -1,9 +1,69 @@
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
-
-from pydantic import BaseModel, Field
-
-from .validators import AddressValidatorMixin
+from itertools import islice
+from operator import itemgetter, le
+from typing import (
+    Annotated,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+import numpy as np
+import numpy.typing as npt
+from pydantic import (
+    BaseModel,
+    Field,
+    PlainSerializer,
+    PlainValidator,
+    PrivateAttr,
+    SerializerFunctionWrapHandler,
+    WithJsonSchema,
+    model_serializer,
+    model_validator,
+)
+
+from .exceptions import ValidationError
+from .validators import AddressValidatorMixin, to_float64_array, to_int64_array
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Slot setters of the per-instance state BaseModel keeps next to __dict__. They are
+# the same throughout pydantic 2, which pyproject.toml pins; tests compare the
+# result with model_construct(), which is used if the slots ever disappear.
+try:
+    _set_fields_set = BaseModel.__dict__["__pydantic_fields_set__"].__set__
+    _set_extra = BaseModel.__dict__["__pydantic_extra__"].__set__
+    _set_private = BaseModel.__dict__["__pydantic_private__"].__set__
+    _HAS_MODEL_SLOTS = True
+except (KeyError, AttributeError):  # pragma: no cover - depends on pydantic
+    _HAS_MODEL_SLOTS = False
+
+
+def _construct_trusted(
+    cls: Type[ModelT], values: Dict[str, Any], fields_set: Iterable[str]
+) -> ModelT:
+    """
+    Create a model instance from complete, already valid field values.
+
+    This is what BaseModel.model_construct() does, minus its per-field Python loop
+    over defaults and aliases, which makes it slower than validation itself. Only
+    for models without private attributes.
+    """
+    if not _HAS_MODEL_SLOTS:  # pragma: no cover - depends on pydantic
+        return cls.model_construct(set(fields_set), **values)
+    instance = object.__new__(cls)
+    object.__setattr__(instance, "__dict__", values)
+    _set_fields_set(instance, set(fields_set))
+    _set_extra(instance, None)
+    _set_private(instance, None)
+    return instance
 
 
 class Chain(str, Enum):
@@ -27,6 +87,23 @@ class Chain(str, Enum):
         return cls.OTHER
 
 
+# EVM chain id of each supported chain
+CHAIN_IDS: Dict[int, Chain] = {
+    1: Chain.ETHEREUM,
+    42161: Chain.ARBITRUM,
+    8453: Chain.BASE,
+    10: Chain.OPTIMISM,
+    137: Chain.POLYGON,
+    56: Chain.BSC,
+    33139: Chain.GNOS,
+    43114: Chain.AVALANCHE,
+    250: Chain.FANTOM,
+    1666600000: Chain.HARMONY,
+    1284: Chain.MOONBEAM,
+    1285: Chain.MOONRIVER,
+}
+
+
 class StrategyType(str, Enum):
     # Core Yield Strategies
     LIQUID_STAKING = "liquid_staking"
@@ -80,6 +157,11 @@ class Strategy(BaseModel):
     chainId: int
     address: str
 
+    @property
+    def chain(self) -> Chain:
+        """The Chain of chainId, or Chain.OTHER for unknown chain ids."""
+        return CHAIN_IDS.get(self.chainId, Chain.OTHER)
+
 
 class AnalysisRequest(BaseModel):
     strategies: List[Strategy]
@@ -116,6 +198,51 @@ class VaultInfo(AddressValidatorMixin, BaseModel):
         ..., description="Last update timestamp in seconds"
     )
 
+    @classmethod
+    def construct_trusted(
+        cls,
+        chain: Chain,
+        address: str,
+        name: str,
+        protocol: str,
+        current_share_price: float,
+        last_updated_timestamp: int,
+        **optional: Any,
+    ) -> "VaultInfo":
+        """
+        Build a VaultInfo from data the SDK already validated, skipping validation.
+
+        The address must already be normalized, e.g. taken from a SharePriceHistory.
+        Optional fields (costs, capacity, risk_free_rate) may be passed as keywords;
+        omitted ones take their defaults.
+        """
+        unknown = optional.keys() - _VAULT_INFO_DEFAULTS.keys()
+        if unknown:
+            raise TypeError(
+                f"Unexpected VaultInfo fields: {', '.join(sorted(unknown))}"
+            )
+        values = {
+            "chain": chain,
+            "address": address,
+            "name": name,
+            "protocol": protocol,
+            **_VAULT_INFO_DEFAULTS,
+            **optional,
+            "current_share_price": current_share_price,
+            "last_updated_timestamp": last_updated_timestamp,
+        }
+        return _construct_trusted(cls, values, _VAULT_INFO_REQUIRED.union(optional))
+
+
+_VAULT_INFO_DEFAULTS = {
+    name: field.default
+    for name, field in VaultInfo.model_fields.items()
+    if not field.is_required()
+}
+_VAULT_INFO_REQUIRED = frozenset(VaultInfo.model_fields).difference(
+    _VAULT_INFO_DEFAULTS
+)
+
 
 class PerformanceAnalysis(BaseModel):
     # Core Performance Metrics (Mandatory for allocation decisions)
@@ -135,6 +262,81 @@ class PerformanceAnalysis(BaseModel):
         ..., description="Number of days in the analysis period"
     )
 
+    # Optional Tail Risk Metrics
+    var_95: Optional[float] = Field(
+        None, description="Daily return percentage at the 95% value at risk"
+    )
+    cvar_95: Optional[float] = Field(
+        None, description="Mean daily return percentage beyond the 95% value at risk"
+    )
+    var_99: Optional[float] = Field(
+        None, description="Daily return percentage at the 99% value at risk"
+    )
+    cvar_99: Optional[float] = Field(
+        None, description="Mean daily return percentage beyond the 99% value at risk"
+    )
+    apy_trend_30d: Optional[float] = Field(
+        None, description="30-day APY minus the APY of the preceding 30 days"
+    )
+
+    @classmethod
+    def construct_trusted(
+        cls,
+        apy_7d: float,
+        apy_30d: float,
+        apy_90d: float,
+        volatility_30d: float,
+        max_drawdown: float,
+        sharpe_ratio: float,
+        analysis_period_days: int,
+        **optional: Optional[float],
+    ) -> "PerformanceAnalysis":
+        """
+        Build a PerformanceAnalysis from metrics the SDK computed, skipping validation.
+
+        Values must already be Python floats and ints. Optional metrics that are
+        not passed default to None.
+        """
+        unknown = optional.keys() - _PERFORMANCE_DEFAULTS.keys()
+        if unknown:
+            raise TypeError(
+                f"Unexpected PerformanceAnalysis fields: {', '.join(sorted(unknown))}"
+            )
+        values = {
+            "apy_7d": apy_7d,
+            "apy_30d": apy_30d,
+            "apy_90d": apy_90d,
+            "volatility_30d": volatility_30d,
+            "max_drawdown": max_drawdown,
+            "sharpe_ratio": sharpe_ratio,
+            "analysis_period_days": analysis_period_days,
+            **_PERFORMANCE_DEFAULTS,
+            **optional,
+        }
+        return _construct_trusted(cls, values, _PERFORMANCE_REQUIRED.union(optional))
+
+    # Without a return annotation the serialization JSON schema stays the model's
+    @model_serializer(mode="wrap")
+    def _omit_missing_optional_metrics(  # type: ignore[no-untyped-def]
+        self, handler: SerializerFunctionWrapHandler
+    ):
+        """Leave optional metrics that were not computed out of the output."""
+        data: Dict[str, Any] = handler(self)
+        for name in _PERFORMANCE_DEFAULTS:
+            if name in data and data[name] is None:
+                del data[name]
+        return data
+
+
+_PERFORMANCE_DEFAULTS = {
+    name: field.default
+    for name, field in PerformanceAnalysis.model_fields.items()
+    if not field.is_required()
+}
+_PERFORMANCE_REQUIRED = frozenset(PerformanceAnalysis.model_fields).difference(
+    _PERFORMANCE_DEFAULTS
+)
+
 
 class AnalysisResult(BaseModel):
     # Combined vault info and performance analysis
@@ -144,12 +346,218 @@ class AnalysisResult(BaseModel):
         default=None, description="Additional information about the vault"
     )
 
+    @classmethod
+    def construct_trusted(
+        cls,
+        vault_info: VaultInfo,
+        performance: PerformanceAnalysis,
+        extra_info: Optional[Dict[str, Any]] = None,
+    ) -> "AnalysisResult":
+        """Combine already built models without validating them again."""
+        values = {
+            "vault_info": vault_info,
+            "performance": performance,
+            "extra_info": extra_info,
+        }
+        return _construct_trusted(cls, values, values)
+
+
+class CorrelationMatrix(BaseModel):
+    """Pairwise statistics of daily vault returns, rows and columns in address order."""
+
+    addresses: List[str] = Field(
+        ..., description="Vault addresses of the matrix rows and columns"
+    )
+    covariance: List[List[Optional[float]]] = Field(
+        ...,
+        description="Covariance of daily returns, None where two vaults overlap too little",
+    )
+    correlation: List[List[Optional[float]]] = Field(
+        ...,
+        description="Correlation of daily returns, None where two vaults overlap too little",
+    )
+    observations: List[List[int]] = Field(
+        ..., description="Number of days on which both vaults have a return"
+    )
+    halflife_days: Optional[float] = Field(
+        None, description="Half-life of the exponential weights, None for equal weights"
+    )
+    shrinkage: float = Field(
+        0.0, description="Weight of the scaled identity target in the covariance"
+    )
+
 
 class AnalysisResponse(BaseModel):
     analyses: List[AnalysisResult] = Field(..., description="List of vault analyses")
+    correlation: Optional[CorrelationMatrix] = Field(
+        None, description="Optional return correlation across the analyzed vaults"
+    )
 
 
 class SharePriceHistory(AddressValidatorMixin, BaseModel):
+    """
+    Share price history as (timestamp, price) tuples.
+
+    Histories are treated as read-only by the SDK: analysis never reorders or
+    otherwise modifies price_history, so one history can be shared between threads.
+    """
+
     name: str
     address: str
     price_history: List[Tuple[int, float]]
+
+    # Set when the creator guarantees timestamp order, see from_sorted()
+    _sorted: bool = PrivateAttr(default=False)
+
+    @classmethod
+    def from_sorted(
+        cls, name: str, address: str, price_history: List[Tuple[int, float]]
+    ) -> "SharePriceHistory":
+        """
+        Create a history whose points are already in ascending timestamp order.
+
+        The order is trusted, not checked, so analysis can skip sorting. Use it for
+        data that comes out of an ordered source, and do not modify price_history
+        in place afterwards. Assigning a new price_history, directly or through
+        model_copy(update=...), drops the trust again.
+        """
+        history = cls(name=name, address=address, price_history=price_history)
+        history._sorted = True
+        return history
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "price_history":
+            self._sorted = False
+        super().__setattr__(name, value)
+
+    def model_copy(
+        self, *, update: Optional[Mapping[str, Any]] = None, deep: bool = False
+    ) -> "SharePriceHistory":
+        copied = super().model_copy(update=update, deep=deep)
+        if update and "price_history" in update:
+            copied._sorted = False
+        return copied
+
+    @property
+    def is_sorted(self) -> bool:
+        """Whether the points are in ascending timestamp order, checked in O(n) unless trusted."""
+        if self._sorted:
+            return True
+        first = itemgetter(0)
+        return all(
+            map(
+                le,
+                map(first, self.price_history),
+                map(first, islice(self.price_history, 1, None)),
+            )
+        )
+
+    def to_arrays(self) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+        """Return the timestamps and prices as NumPy arrays, in stored order."""
+        timestamps = np.fromiter(
+            map(itemgetter(0), self.price_history),
+            dtype=np.int64,
+            count=len(self.price_history),
+        )
+        prices = np.fromiter(
+            map(itemgetter(1), self.price_history),
+            dtype=np.float64,
+            count=len(self.price_history),
+        )
+        return timestamps, prices
+
+    def to_compact(self) -> "CompactSharePriceHistory":
+        """Convert to the array-backed CompactSharePriceHistory."""
+        timestamps, prices = self.to_arrays()
+        return CompactSharePriceHistory(
+            name=self.name, address=self.address, timestamps=timestamps, prices=prices
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        # The trusted order flag is a cache, not part of the value
+        if not isinstance(other, SharePriceHistory):
+            return NotImplemented
+        return (
+            self.name == other.name
+            and self.address == other.address
+            and self.price_history == other.price_history
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+Int64Array = Annotated[
+    npt.NDArray[np.int64],
+    PlainValidator(to_int64_array),
+    PlainSerializer(lambda array: array.tolist()),
+    WithJsonSchema({"type": "array", "items": {"type": "integer"}}),
+]
+
+Float64Array = Annotated[
+    npt.NDArray[np.float64],
+    PlainValidator(to_float64_array),
+    PlainSerializer(lambda array: array.tolist()),
+    WithJsonSchema({"type": "array", "items": {"type": "number"}}),
+]
+
+
+class CompactSharePriceHistory(AddressValidatorMixin, BaseModel):
+    """
+    Share price history stored as parallel int64 timestamp and float64 price arrays.
+
+    Inputs that already are int64/float64 buffers (NumPy arrays, array('q') and
+    array('d')) are wrapped without copying, and the whole buffer is validated at
+    once instead of per tuple. Serializes to plain lists.
+    """
+
+    name: str
+    address: str
+    timestamps: Int64Array
+    prices: Float64Array
+
+    @model_validator(mode="after")
+    def validate_arrays(self) -> "CompactSharePriceHistory":
+        if len(self.timestamps) != len(self.prices):
+            raise ValidationError(
+                "timestamps and prices must have the same length: "
+                f"{len(self.timestamps)} != {len(self.prices)}"
+            )
+        if not np.isfinite(self.prices).all():
+            raise ValidationError("prices must be finite")
+        return self
+
+    @property
+    def price_history(self) -> List[Tuple[int, float]]:
+        """The history as (timestamp, price) tuples, like SharePriceHistory."""
+        return list(zip(self.timestamps.tolist(), self.prices.tolist()))
+
+    @property
+    def is_sorted(self) -> bool:
+        """Whether the timestamps are in ascending order."""
+        return bool((self.timestamps[1:] >= self.timestamps[:-1]).all())
+
+    def to_arrays(self) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+        """Return the timestamps and prices arrays without copying."""
+        return self.timestamps, self.prices
+
+    def to_share_price_history(self) -> SharePriceHistory:
+        """Convert to a list-backed SharePriceHistory."""
+        return SharePriceHistory(
+            name=self.name, address=self.address, price_history=self.price_history
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, CompactSharePriceHistory):
+            return NotImplemented
+        return (
+            self.name == other.name
+            and self.address == other.address
+            and np.array_equal(self.timestamps, other.timestamps)
+            and np.array_equal(self.prices, other.prices)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+# Either representation can be passed to the analysis functions
+AnySharePriceHistory = Union[SharePriceHistory, CompactSharePriceHistory]
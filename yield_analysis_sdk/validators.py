@@ -3,8 +3,11 @@ Common validators and mixins for the yield analysis SDK.
 """
 
 import re
-from typing import TYPE_CHECKING, Any, Union
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Tuple, Union
 
+import numpy as np
+import numpy.typing as npt
 from pydantic import ConfigDict, field_serializer, field_validator
 
 from .exceptions import ValidationError
@@ -12,6 +15,12 @@ from .exceptions import ValidationError
 if TYPE_CHECKING:
     from .type import Chain
 
+# 0x followed by 40 lowercase hex characters
+_ADDRESS_PATTERN = re.compile(r"0x[a-f0-9]{40}")
+
+# Distinct spellings remembered by normalize_addresses
+ADDRESS_CACHE_SIZE = 65536
+
 
 class AddressValidatorMixin:
     """Mixin class that provides address validation functionality."""
@@ -28,6 +37,23 @@ class AddressValidatorMixin:
             return str(v)
 
 
+def _address_candidate(address: str) -> str:
+    """Strip, prefix with 0x and lowercase an address without validating it."""
+    address = address.strip()
+    if not address.startswith("0x"):
+        address = "0x" + address
+    return address.lower()
+
+
+def _normalize_or_none(address: str) -> Optional[str]:
+    """Normalize a non-empty address, returning None when it is malformed."""
+    address = _address_candidate(address)
+    return address if _ADDRESS_PATTERN.fullmatch(address) else None
+
+
+_normalize_cached = lru_cache(maxsize=ADDRESS_CACHE_SIZE)(_normalize_or_none)
+
+
 def normalize_address(address: str) -> str:
     """
     Normalize address format.
@@ -41,18 +67,81 @@ def normalize_address(address: str) -> str:
     if not address:
         raise ValidationError("Address cannot be empty")
 
-    # Remove whitespace
-    address = address.strip()
+    normalized = _normalize_or_none(address)
+    if normalized is None:
+        raise ValidationError(f"Invalid address format: {_address_candidate(address)}")
+    return normalized
 
-    # Ensure it starts with 0x
-    if not address.startswith("0x"):
-        address = "0x" + address
 
-    # Convert to lowercase
-    address = address.lower()
+def normalize_addresses(addresses: Iterable[str]) -> List[str]:
+    """
+    Normalize many addresses, reporting every malformed entry at once.
+
+    Normalized spellings are memoized in a bounded LRU cache, so repeated
+    imports of the same registry only pay for the addresses they have not
+    seen before.
+
+    Args:
+        addresses: The addresses to normalize
+
+    Returns:
+        Normalized addresses (lowercase, with 0x prefix), in input order
+
+    Raises:
+        ValidationError: If any entry is empty or malformed. The message lists
+            the index and value of each invalid entry.
+    """
+    normalized: List[str] = []
+    invalid: List[Tuple[int, Any]] = []
+    for index, address in enumerate(addresses):
+        result = (
+            _normalize_cached(address) if address and isinstance(address, str) else None
+        )
+        if result is None:
+            invalid.append((index, address))
+        else:
+            normalized.append(result)
 
-    # Validate format (0x followed by 40 hex characters)
-    if not re.match(r"^0x[a-f0-9]{40}$", address):
-        raise ValidationError(f"Invalid address format: {address}")
+    if invalid:
+        details = ", ".join(f"[{index}] {address!r}" for index, address in invalid)
+        raise ValidationError(
+            f"Invalid address format in {len(invalid)} entries: {details}"
+        )
+    return normalized
 
-    return address
+
+def to_int64_array(value: Any) -> npt.NDArray[np.int64]:
+    """
+    Convert a one-dimensional buffer or sequence to an int64 array.
+
+    int64 inputs such as NumPy arrays and array('q') are wrapped without copying.
+    Floating point values are accepted only when they are whole numbers, so
+    fractional timestamps are rejected instead of truncated.
+    """
+    try:
+        array = np.asarray(value)
+        if array.dtype.kind == "f" and not (
+            np.isfinite(array).all() and (array == np.trunc(array)).all()
+        ):
+            raise ValidationError("Invalid int64 array: values must be whole numbers")
+        array = array.astype(np.int64, copy=False)
+    except (TypeError, ValueError) as e:
+        raise ValidationError(f"Invalid int64 array: {e}") from e
+    if array.ndim != 1:
+        raise ValidationError("Array must be one-dimensional")
+    return array
+
+
+def to_float64_array(value: Any) -> npt.NDArray[np.float64]:
+    """
+    Convert a one-dimensional buffer or sequence to a float64 array.
+
+    float64 inputs such as NumPy arrays and array('d') are wrapped without copying.
+    """
+    try:
+        array = np.asarray(value, dtype=np.float64)
+    except (TypeError, ValueError) as e:
+        raise ValidationError(f"Invalid float64 array: {e}") from e
+    if array.ndim != 1:
+        raise ValidationError("Array must be one-dimensional")
+    return array